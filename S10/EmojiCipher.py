@@ -10,6 +10,16 @@ import tkinter as tk
 from tkinter import messagebox, scrolledtext
 import random
 import emoji
+import os
+import sys
+
+# Asegurarnos de que la raíz del repositorio está en sys.path para poder
+# importar el paquete compartido `emojicipher`.
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_REPO not in sys.path:
+    sys.path.insert(0, RAIZ_REPO)
+
+from emojicipher import CompiledKey
 
 
 def emoji_translate(text: str) -> str:
@@ -57,10 +67,14 @@ def generar_clave():
 
 
 def codificar(texto, clave):
+    if isinstance(clave, CompiledKey):
+        return clave.codificar(texto)
     return "".join(clave.get(c, c) for c in texto)
 
 
 def decodificar(texto, clave):
+    if isinstance(clave, CompiledKey):
+        return clave.decodificar(texto)
     inversa = {v: k for k, v in clave.items()}
     res = ""
     i = 0
@@ -201,7 +215,7 @@ salida.pack(pady=10, padx=10)
 # ------------------ Acciones Botones ------------------
 def accion_generar_clave():
     global clave_actual
-    clave_actual = generar_clave()
+    clave_actual = CompiledKey(generar_clave())
     messagebox.showinfo("Clave", "Clave generada correctamente.")
 
 def accion_codificar():
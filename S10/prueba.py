@@ -4,54 +4,56 @@
 
 import random
 
-def emoji_translate(text: str) -> str:
-    # Diccionario palabra → emoji
-    mapping = {
-        # Animales
-        "perro": "🐶", "gato": "🐱", "raton": "🐭", "tigre": "🐯",
-        "conejo": "🐰", "oso": "🐻", "panda": "🐼", "koala": "🐨",
-        "mono": "🐵", "cerdo": "🐷", "vaca": "🐮", "pollo": "🐔",
-        "pinguino": "🐧", "pulpo": "🐙", "pez": "🐟", "tortuga": "🐢",
-
-        # Emociones / personas
-        "sonrisa": "😀", "feliz": "😄", "triste": "😢", "llorar": "😭",
-        "enojado": "😡", "amor": "❤️", "beso": "😘", "risa": "😂",
-        "miedo": "😱", "pensando": "🤔", "cool": "😎", "ok": "👌",
-        "fuerza": "💪", "aplauso": "👏", "hola": "👋",
-
-        # Tecnología
-        "python": "🐍", "computadora": "💻", "telefono": "📱",
-        "libro": "📚", "bombilla": "💡", "cafe": "☕",
-        "dinero": "💸", "cohete": "🚀", "robot": "🤖",
-
-        # Naturaleza
-        "fuego": "🔥", "arbol": "🌳", "flor": "🌸", "estrella": "🌟",
-        "sol": "☀️", "luna": "🌙", "nube": "☁️", "lluvia": "🌧️",
-        "arcoiris": "🌈", "montaña": "⛰️", "mar": "🌊",
-
-        # Comida
-        "pizza": "🍕", "hamburguesa": "🍔", "banana": "🍌",
-        "manzana": "🍎", "uvas": "🍇", "taco": "🌮",
-        "pastel": "🎂", "helado": "🍦", "pan": "🍞",
-
-        # Actividades
-        "musica": "🎧", "pelicula": "🎬", "juego": "🎮",
-        "deporte": "⚽", "baloncesto": "🏀", "tenis": "🎾",
-        "viaje": "✈️", "regalo": "🎁", "fiesta": "🎉",
-    }
-
-    # Crear diccionario inverso emoji → palabra
-    reverse_mapping = {emoji: word for word, emoji in mapping.items()}
+# Diccionario palabra → emoji (se crea una vez al importar, no en cada llamada).
+# `python -m emojicipher indice` también incluye estos alias en el índice de nombres.
+MAPPING = {
+    # Animales
+    "perro": "🐶", "gato": "🐱", "raton": "🐭", "tigre": "🐯",
+    "conejo": "🐰", "oso": "🐻", "panda": "🐼", "koala": "🐨",
+    "mono": "🐵", "cerdo": "🐷", "vaca": "🐮", "pollo": "🐔",
+    "pinguino": "🐧", "pulpo": "🐙", "pez": "🐟", "tortuga": "🐢",
+
+    # Emociones / personas
+    "sonrisa": "😀", "feliz": "😄", "triste": "😢", "llorar": "😭",
+    "enojado": "😡", "amor": "❤️", "beso": "😘", "risa": "😂",
+    "miedo": "😱", "pensando": "🤔", "cool": "😎", "ok": "👌",
+    "fuerza": "💪", "aplauso": "👏", "hola": "👋",
+
+    # Tecnología
+    "python": "🐍", "computadora": "💻", "telefono": "📱",
+    "libro": "📚", "bombilla": "💡", "cafe": "☕",
+    "dinero": "💸", "cohete": "🚀", "robot": "🤖",
+
+    # Naturaleza
+    "fuego": "🔥", "arbol": "🌳", "flor": "🌸", "estrella": "🌟",
+    "sol": "☀️", "luna": "🌙", "nube": "☁️", "lluvia": "🌧️",
+    "arcoiris": "🌈", "montaña": "⛰️", "mar": "🌊",
+
+    # Comida
+    "pizza": "🍕", "hamburguesa": "🍔", "banana": "🍌",
+    "manzana": "🍎", "uvas": "🍇", "taco": "🌮",
+    "pastel": "🎂", "helado": "🍦", "pan": "🍞",
+
+    # Actividades
+    "musica": "🎧", "pelicula": "🎬", "juego": "🎮",
+    "deporte": "⚽", "baloncesto": "🏀", "tenis": "🎾",
+    "viaje": "✈️", "regalo": "🎁", "fiesta": "🎉",
+}
+
+# Crear diccionario inverso emoji → palabra
+REVERSE_MAPPING = {emoji: word for word, emoji in MAPPING.items()}
+
 
+def emoji_translate(text: str) -> str:
     text = text.strip().lower()
 
     # Si es palabra → emoji
-    if text in mapping:
-        return mapping[text]
+    if text in MAPPING:
+        return MAPPING[text]
 
     # Si es emoji → palabra
-    if text in reverse_mapping:
-        return reverse_mapping[text]
+    if text in REVERSE_MAPPING:
+        return REVERSE_MAPPING[text]
 
     return "❓"  # Por defecto si no encuentra nada
 
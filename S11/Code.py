@@ -20,6 +20,16 @@ import random
 import emoji
 import json
 import unicodedata
+import os
+import sys
+
+# Asegurarnos de que la raíz del repositorio está en sys.path para poder
+# importar el paquete compartido `emojicipher`.
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_REPO not in sys.path:
+    sys.path.insert(0, RAIZ_REPO)
+
+from emojicipher import CompiledKey
 
 # ---------------------- Configuración global ----------------------
 clave_actual = None
@@ -67,9 +77,13 @@ def generar_clave():
     return {caracteres[i]: lista_emojis[i] for i in range(len(caracteres))}
 
 def codificar(texto, clave):
+    if isinstance(clave, CompiledKey):
+        return clave.codificar(texto)
     return "".join(clave.get(c, c) for c in texto)
 
 def decodificar(texto, clave):
+    if isinstance(clave, CompiledKey):
+        return clave.decodificar(texto)
     inversa = {v: k for k, v in clave.items()}
     claves_ordenadas = sorted(inversa.keys(), key=len, reverse=True)
     res = ""
@@ -199,7 +213,7 @@ def guardar_clave():
                                            title="Guardar clave")
     if archivo:
         with open(archivo, "w", encoding="utf-8") as f:
-            json.dump(clave_actual, f, ensure_ascii=False, indent=4)
+            json.dump(dict(clave_actual), f, ensure_ascii=False, indent=4)
         messagebox.showinfo("Éxito", "Clave guardada correctamente.")
 
 def cargar_clave():
@@ -208,7 +222,7 @@ def cargar_clave():
                                          title="Cargar clave")
     if archivo:
         with open(archivo, "r", encoding="utf-8") as f:
-            clave_actual = json.load(f)
+            clave_actual = CompiledKey(json.load(f))
         actualizar_estado_clave("Clave cargada ✔")
         messagebox.showinfo("Éxito", "Clave cargada correctamente.")
         mostrar_main_ui()
@@ -233,7 +247,7 @@ lbl_info.pack(pady=20)
 
 def generar_y_cargar_clave():
     global clave_actual
-    clave_actual = generar_clave()
+    clave_actual = CompiledKey(generar_clave())
     actualizar_estado_clave("Clave generada ✔")
     messagebox.showinfo("Clave", "Clave generada correctamente.")
     mostrar_main_ui()
@@ -280,7 +294,7 @@ def mostrar_main_ui():
     btn1 = add_button(frame_cod_btn, "Codificar", lambda: codificar_wrapper(entrada_cod, salida_cod), BTN_MAIN)
     btn2 = add_button(frame_cod_btn, "Decodificar", lambda: decodificar_wrapper(salida_cod), BTN_ALT)
     btn3 = add_button(frame_cod_btn, "Traducir emoji/palabra", lambda: traducir_wrapper(entrada_cod, salida_cod), BTN_GAME)
-    btn4 = add_button(frame_cod_btn, "Ver clave", lambda: messagebox.showinfo("Clave actual", str(clave_actual)), BTN_MAIN)
+    btn4 = add_button(frame_cod_btn, "Ver clave", lambda: messagebox.showinfo("Clave actual", str(dict(clave_actual))), BTN_MAIN)
     btn1.grid(row=0, column=0, padx=10, pady=5)
     btn2.grid(row=0, column=1, padx=10, pady=5)
     btn3.grid(row=1, column=0, padx=10, pady=5)
@@ -20,10 +20,26 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import random
 import emoji
-import json
-import unicodedata
-
-from datetime import datetime
+import os
+import sys
+
+# Asegurarnos de que la raíz del repositorio está en sys.path para poder
+# importar el paquete compartido `emojicipher`.
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_REPO not in sys.path:
+    sys.path.insert(0, RAIZ_REPO)
+
+from emojicipher import cargar_clave as cargar_clave_archivo, guardar_clave as guardar_clave_archivo
+from emojicipher.core import (CompiledKey, formato_clave_legible,
+                              generar_clave, codificar, decodificar, normalize_text,
+                              traducir_texto)
+from emojicipher.generador import reparar_clave
+from emojicipher.historial import AlmacenHistorial, HistorialEnUso, carpeta_historial
+from emojicipher.indice_historial import IndiceHistorial
+from emojicipher.flujo import CodificadorIncremental, DecodificadorIncremental, guardar_texto, procesar_texto
+from emojicipher.tareas import DialogoProgreso, Tarea, TareaCancelada
+from emojicipher.vista_salida import panel_de
+from emojicipher.vista_historial import VisorHistorial
 
 # Mejoras de limpieza de código:
 # - Nombres de variables y funciones claros
@@ -36,6 +52,9 @@ from datetime import datetime
 # - Mejorar la función de mostrar clave, ahora se muestra ordenada.
 # Además, ahora se muestran correctamente todos los emojis, antes había algunos que no se detectaban correctamente. 
 # - Nuevo minijuego añadido (Adivinar nombre de emoji por cantidad de letras)
+# - La clave se compila una sola vez (CompiledKey) al generarla o cargarla.
+# - La lógica sin interfaz (clave, código, traducción e historial) está en emojicipher.core,
+#   este archivo solo contiene la interfaz gráfica.
 
 
 
@@ -54,8 +73,6 @@ BTN_ALT = "#22C55E"
 BTN_GAME = "#F59E0B"
 INPUT_BG = "#0B1220"
 
-historial = []
-
 # ==================================================================
 # ---------------------- Funciones auxiliares ----------------------
 # ==================================================================
@@ -74,155 +91,29 @@ def actualizar_estado_clave(texto: str):
         estado_clave_label.config(text=f"🔐 {texto}")
 
 
-def normalize_text(s: str) -> str:
-    """
-    Limpia un texto eliminando acentos y convirtiéndolo a minúsculas.
-
-    Parámetros:
-        s (str): Texto de entrada que se desea normalizar.
-
-    Retorna:
-        str: Texto normalizado sin acentos, en minúsculas y sin espacios externos.
-    """
-    s = s.strip().lower()
-    nfkd = unicodedata.normalize('NFD', s)
-    return "".join(ch for ch in nfkd if not unicodedata.combining(ch))
+# `normalize_text` vive en emojicipher.core (lógica sin interfaz gráfica)
 
 # ==================================================================
 # ---------------------- Traducción emoji --------------------------
 # ==================================================================
 
-def emoji_translate(text: str) -> str:
-    """
-    Traduce palabra → emoji o emoji → palabra.
-    Maneja errores en caso de textos no reconocidos.
-    Parámetros:
-        text (str): Texto o emoji a traducir.
-
-    Retorna:
-        str: Emoji correspondiente o palabra; si no se reconoce, devuelve un mensaje de error.
-    """
-    try:
-        text = text.strip()
-
-        # Intento de traducción palabra → emoji
-        for lang in ["es", "alias"]:
-            em = emoji.emojize(f":{text}:", language=lang)
-            if em != f":{text}:":
-                return em
-
-        # Intento emoji → palabra (español o inglés)
-        dem_es = emoji.demojize(text, language='es')
-        dem_en = emoji.demojize(text, language='alias')
-
-        if dem_es != text:
-            return dem_es.strip(":")
-        if dem_en != text:
-            return dem_en.strip(":")
-
-        return "Emoji desconocido"
-
-    except Exception:
-        return "Error al traducir"
-
-def formato_clave_legible(clave: dict) -> str:
-    """
-    Convierte una clave de codificación en un texto legible para mostrar.
-
-    Parámetros:
-        clave (dict): Diccionario con caracteres y sus emojis correspondientes.
-
-    Retorna:
-        str: Texto formateado mostrando cada par de carácter → emoji.
-    """
-    texto = "Clave actual:\n\n"
-    for k, v in clave.items():
-        texto += f"{k} → {v}\n"
-    return texto
+# `emoji_translate` y `formato_clave_legible` viven en emojicipher.core
 
 
 # ==================================================================
 # ---------------------- Generar clave -----------------------------
 # ==================================================================
 
-def generar_clave() -> dict:
-    """Genera una clave aleatoria asignando un emoji a cada carácter.
-    Parámetros:
-        Ninguno
-
-    Retorna:
-        dict: Diccionario con caracteres como claves y emojis como valores.
-              Si ocurre un error, retorna un diccionario vacío.
-    """
-    try:
-        lista_emojis = list(emoji.EMOJI_DATA.keys())
-        caracteres = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ,.!?-"
-
-        random.shuffle(lista_emojis)
-        lista_emojis = lista_emojis[:len(caracteres)]
-        random.shuffle(lista_emojis)
-
-        return {caracteres[i]: lista_emojis[i] for i in range(len(caracteres))}
-    except Exception:
-        messagebox.showerror("Error", "No se pudo generar la clave")
-        return {}
+# `generar_clave` vive en emojicipher.core; aquí solo se avisa si falla
+# (ver `generar_y_cargar_clave`).
 
 
 # ================================================================
 # ----------------------------- Cödigo ---------------------------
 # ================================================================
 
-def codificar(texto: str, clave: dict) -> str:
-    """Codifica un texto usando la clave actual.
-    
-    Parámetros:
-        texto (str): Texto a codificar.
-        clave (dict): Diccionario que mapea caracteres a emojis.
-
-    Retorna:
-        str: Texto codificado; si ocurre un error, devuelve un mensaje de error.
-    """
-    try:
-        return "".join(clave.get(c, c) for c in texto)
-    except Exception:
-        return "Error al codificar"
-
-
-def decodificar(texto: str, clave: dict) -> str:
-    """Decodifica texto en emojis usando la clave inversa.
-    
-    Parámetros:
-        texto (str): Texto codificado con emojis.
-        clave (dict): Diccionario que mapea caracteres a emojis.
-
-    Retorna:
-        str: Texto decodificado; si ocurre un error, devuelve un mensaje de error.
-    """
-    try:
-        inversa = {v: k for k, v in clave.items()}
-        claves_ordenadas = sorted(inversa.keys(), key=len, reverse=True)
-
-        resultado = ""
-        i = 0
-
-        while i < len(texto):
-            match = None
-            for em in claves_ordenadas:
-                if texto.startswith(em, i):
-                    match = em
-                    break
-            if match:
-                resultado += inversa[match]
-                i += len(match)
-            else:
-                resultado += texto[i]
-                i += 1
-
-        return resultado
+# `codificar` y `decodificar` viven en emojicipher.core
 
-    except Exception:
-        return "Error al decodificar"
-    
 # =========================================================
 # ---------------------- Historial ------------------------
 # =========================================================    
@@ -239,51 +130,34 @@ def registrar_historial(tipo, original, resultado):
     Retorna:
         None
     """
-    registro = {
-        "fecha": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        "tipo": tipo,
-        "original": original,
-        "resultado": resultado
-    }
-    historial.append(registro)
-
-def mostrar_historial(text_widget):
+    historial.registrar(tipo, original, resultado)
+
+def mostrar_historial(visor):
     """
-    Muestra el historial de codificación y decodificación en un widget de texto.
+    Muestra los registros más recientes del historial en el visor.
 
     Parámetros:
-        text_widget (tk.Text o scrolledtext.ScrolledText): Widget donde se mostrará el historial.
+        visor (VisorHistorial): Visor del historial (solo dibuja los registros visibles).
 
     Retorna:
         None
     """
-    text_widget.delete("1.0", tk.END)
-    
-    if not historial:
-        text_widget.insert(tk.END, "No hay registros aún.")
-        return
-
-    for i, reg in enumerate(historial, start=1):
-        bloque = (
-            f"#{i}\n"
-            f"Fecha: {reg['fecha']}\n"
-            f"Tipo: {reg['tipo']}\n"
-            f"Original: {reg['original']}\n"
-            f"Resultado: {reg['resultado']}\n"
-            f"{'-'*50}\n"
-        )
-        text_widget.insert(tk.END, bloque)
+    visor.refrescar()
 
 def limpiar_historial():
     """
     Limpia todos los registros del historial de codificación y decodificación.
     """
-    historial.clear()
+    historial.limpiar()
     messagebox.showinfo("Historial", "Historial eliminado correctamente.")
 
 def exportar_historial_txt():
     """
-    Exporta el historial de codificación y decodificación a un archivo TXT.
+    Exporta el historial de codificación y decodificación a TXT, CSV o JSON Lines.
+
+    El formato se elige por la extensión (añadiendo ".gz" se comprime). La
+    exportación se hace en un hilo aparte, con una ventana de progreso que
+    permite cancelarla, para que la interfaz no se quede congelada.
     """
     if not historial:
         messagebox.showwarning("Aviso", "No hay historial para exportar.")
@@ -291,21 +165,34 @@ def exportar_historial_txt():
 
     archivo = filedialog.asksaveasfilename(
         defaultextension=".txt",
-        filetypes=[("Archivos TXT", "*.txt")],
+        filetypes=[
+            ("Archivos TXT", "*.txt"),
+            ("Archivos CSV", "*.csv"),
+            ("JSON Lines", "*.jsonl"),
+            ("Comprimidos (gzip)", "*.txt.gz *.csv.gz *.jsonl.gz")
+        ],
         title="Exportar historial"
     )
 
-    if archivo:
-        with open(archivo, "w", encoding="utf-8") as f:
-            for reg in historial:
-                f.write(
-                    f"Fecha: {reg['fecha']}\n"
-                    f"Tipo: {reg['tipo']}\n"
-                    f"Original: {reg['original']}\n"
-                    f"Resultado: {reg['resultado']}\n"
-                    f"{'-'*50}\n"
-                )
-        messagebox.showinfo("Éxito", "Historial exportado correctamente.")
+    if not archivo:
+        return
+
+    def terminar(total):
+        dialogo.destroy()
+        messagebox.showinfo("Éxito", f"Historial exportado correctamente ({total} registros).")
+
+    def fallar(error):
+        dialogo.destroy()
+        if not isinstance(error, TareaCancelada):
+            messagebox.showerror("Error", f"No se pudo exportar el historial:\n{error}")
+
+    tarea = Tarea(ventana, lambda progreso: historial.exportar(archivo, progreso=progreso),
+                  al_terminar=terminar, al_fallar=fallar)
+    dialogo = DialogoProgreso(ventana, "Exportar historial", "Exportando historial...",
+                              cancelar=tarea.cancelar,
+                              colores={"fondo": BG_SECONDARY, "texto": TXT_PRIMARY})
+    tarea.al_progresar = dialogo.actualizar
+    tarea.iniciar()
 
 # =========================================================
 # ---------------------- Juegos ---------------------------
@@ -563,7 +450,7 @@ def jugar_identifica_emoji():
 # ================================================================
 
 def guardar_clave():
-    """Guarda la clave actual en un archivo JSON."""
+    """Guarda la clave actual en un archivo JSON o binario (.emk)."""
     global clave_actual
     if not clave_actual:
         messagebox.showwarning("Aviso", "No hay clave para guardar")
@@ -571,38 +458,56 @@ def guardar_clave():
 
     archivo = filedialog.asksaveasfilename(
         defaultextension=".json",
-        filetypes=[("Archivos JSON", "*.json")],
+        filetypes=[("Archivos JSON", "*.json"), ("Clave binaria", "*.emk")],
         title="Guardar clave"
     )
 
     if archivo:
         try:
-            with open(archivo, "w", encoding="utf-8") as f:
-                json.dump(clave_actual, f, ensure_ascii=False, indent=4)
+            guardar_clave_archivo(clave_actual, archivo)
             messagebox.showinfo("Éxito", "Clave guardada correctamente.")
         except Exception:
             messagebox.showerror("Error", "No se pudo guardar la clave")
 
 
 def cargar_clave():
-    """Carga una clave desde archivo JSON."""
+    """Carga una clave desde archivo JSON o binario (.emk)."""
     global clave_actual
     archivo = filedialog.askopenfilename(
-        filetypes=[("Archivos JSON", "*.json")],
+        filetypes=[("Claves", "*.json *.emk"), ("Archivos JSON", "*.json"), ("Clave binaria", "*.emk")],
         title="Cargar clave"
     )
 
     if archivo:
         try:
-            with open(archivo, "r", encoding="utf-8") as f:
-                clave_actual = json.load(f)
-
-            actualizar_estado_clave("Clave cargada ✔")
-            messagebox.showinfo("Éxito", "Clave cargada correctamente.")
-            mostrar_main_ui()
-
+            clave = cargar_clave_archivo(archivo)
         except Exception:
             messagebox.showerror("Error", "Archivo de clave inválido o corrupto")
+            return
+
+        if clave.ambigua:
+            # Sí = reparar, No = usar tal cual, Cancelar = no cargarla
+            respuesta = messagebox.askyesnocancel(
+                "Clave ambigua",
+                "La clave es ambigua y puede decodificar mal:\n\n" + "\n".join(clave.problemas)
+                + "\n\n¿Quieres repararla cambiando los emojis afectados?"
+            )
+            if respuesta is None:
+                return
+            if respuesta:
+                try:
+                    clave = CompiledKey(reparar_clave(clave))
+                except Exception:
+                    messagebox.showerror("Error", "No se pudo reparar la clave")
+                    return
+
+        clave_actual = clave
+        actualizar_estado_clave("Clave cargada ✔")
+        if clave_actual.es_valida:
+            messagebox.showinfo("Éxito", "Clave cargada correctamente.")
+        else:
+            messagebox.showwarning("Aviso", "Clave cargada con problemas:\n\n" + "\n".join(clave_actual.problemas))
+        mostrar_main_ui()
 
 # ==================================================================
 # ------------------------- Interfaz UI ----------------------------
@@ -613,6 +518,17 @@ ventana.geometry("1200x800")
 ventana.configure(bg=BG_PRIMARY)
 ventana.resizable(False, False)
 
+# Registros de codificación/decodificación (en disco, en una carpeta solo de
+# esta aplicación). Se abre con la ventana ya creada para poder avisar sobre ella
+try:
+    historial = AlmacenHistorial(carpeta_historial("S12"))
+except HistorialEnUso:
+    ventana.withdraw()
+    messagebox.showerror("EmojiCipher", "La aplicación ya está abierta en otra ventana.", parent=ventana)
+    ventana.destroy()
+    sys.exit(1)
+indice_historial = IndiceHistorial(historial)  # búsqueda por palabras, tipo y fecha
+
 # Pantalla inicial
 pantalla_inicio = tk.Frame(ventana, bg=BG_PRIMARY)
 pantalla_inicio.pack(expand=True, fill="both")
@@ -632,7 +548,11 @@ tk.Label(
 def generar_y_cargar_clave():
     """Genera una clave y entra a la app."""
     global clave_actual
-    clave_actual = generar_clave()
+    try:
+        clave_actual = CompiledKey(generar_clave())
+    except Exception:
+        messagebox.showerror("Error", "No se pudo generar la clave")
+        return
     actualizar_estado_clave("Clave generada ✔")
     messagebox.showinfo("Clave", "Clave generada correctamente.")
     mostrar_main_ui()
@@ -700,6 +620,7 @@ def mostrar_main_ui():
     add_btn(frame_cod_btn, "Decodificar", lambda: decodificar_wrapper(salida_cod), BTN_ALT).grid(row=0, column=1, padx=10, pady=5)
     add_btn(frame_cod_btn, "Traducir emoji/palabra", lambda: traducir_wrapper(entrada_cod, salida_cod), BTN_GAME).grid(row=1, column=0, padx=10, pady=5)
     add_btn(frame_cod_btn, "Ver clave", lambda: messagebox.showinfo("Clave actual", formato_clave_legible(clave_actual)), BTN_MAIN).grid(row=1, column=1, padx=10, pady=5)
+    add_btn(frame_cod_btn, "Guardar resultado", lambda: guardar_resultado(salida_cod), BTN_ALT).grid(row=2, column=0, columnspan=2, padx=10, pady=5)
 
     # ---------------------- PESTAÑA JUEGOS ----------------------
     tab_juegos = tk.Frame(notebook, bg=BG_SECONDARY)
@@ -731,16 +652,17 @@ def mostrar_main_ui():
     frame_hist = tk.Frame(tab_historial, bg=BG_SECONDARY)
     frame_hist.pack(pady=10)
 
-    historial_text = scrolledtext.ScrolledText(
+    # Solo dibuja los registros visibles; los demás se leen de disco al desplazarse
+    historial_visor = VisorHistorial(
         tab_historial,
+        historial,
+        indice_historial,
+        colores={"fondo": BG_SECONDARY, "entrada": INPUT_BG, "texto": TXT_PRIMARY},
         width=110,
         height=25,
-        font=("Consolas", 11),
-        bg=INPUT_BG,
-        fg=TXT_PRIMARY,
-        insertbackground=TXT_PRIMARY
+        font=("Consolas", 11)
     )
-    historial_text.pack(padx=10, pady=10)
+    historial_visor.pack(fill="both", expand=True)
 
 # Botones del historial
     btn_ver_hist = tk.Button(
@@ -750,7 +672,7 @@ def mostrar_main_ui():
         bg=BTN_MAIN,
         fg="white",
         width=22,
-        command=lambda: mostrar_historial(historial_text)
+        command=lambda: mostrar_historial(historial_visor)
     )
 
     btn_limpiar_hist = tk.Button(
@@ -782,10 +704,19 @@ def mostrar_main_ui():
 # ---------------------- WRAPPERS DE BOTONES ----------------------
 # ================================================================
 
+# Textos a partir de este tamaño se procesan en un hilo aparte, con ventana de progreso
+UMBRAL_SEGUNDO_PLANO = 200_000
+
+ocupado = False  # hay una codificación o decodificación en curso
+
+
 def codificar_wrapper(entrada_widget, salida_widget):
     """
     Obtiene texto de un widget, lo codifica usando la clave actual y muestra el resultado.
 
+    El texto se lee y se escribe a trozos y, si es grande, se codifica en un
+    hilo aparte con una ventana de progreso, para que la interfaz no se congele.
+
     Parámetros:
         entrada_widget (tk.Text o scrolledtext.ScrolledText): Widget de entrada con el texto a codificar.
         salida_widget (tk.Text o scrolledtext.ScrolledText): Widget donde se mostrará el texto codificado.
@@ -793,54 +724,157 @@ def codificar_wrapper(entrada_widget, salida_widget):
     Retorna:
         None
     """
-    global clave_actual
-    texto = entrada_widget.get("1.0", tk.END).strip()
-    
-    if not texto:
-        messagebox.showwarning("Aviso", "Escribe algo para codificar")
-        return
-
-    resultado = codificar(texto, clave_actual)
-    salida_widget.delete("1.0", tk.END)
-    salida_widget.insert(tk.END, resultado)
-
-    registrar_historial("Codificado", texto, resultado)
+    iniciar_cifrado("Codificado", entrada_widget, salida_widget)
 
 
 def decodificar_wrapper(salida_widget):
     """
     Obtiene texto de un widget, lo decodifica usando la clave actual y muestra el resultado.
 
+    Igual que `codificar_wrapper`, no bloquea la interfaz con textos grandes.
+
     Parámetros:
         salida_widget (tk.Text o scrolledtext.ScrolledText): Widget que contiene el texto a decodificar y donde se mostrará el resultado.
 
     Retorna:
         None
     """
-    global clave_actual
-    texto = salida_widget.get("1.0", tk.END).strip()
+    iniciar_cifrado("Decodificado", salida_widget, salida_widget)
+
+
+def iniciar_cifrado(tipo, entrada_widget, salida_widget):
+    """
+    Lee el texto de `entrada_widget` a trozos y lo codifica o decodifica.
 
+    Si el widget solo muestra la vista previa de un resultado anterior, se
+    usa el texto completo.
+
+    Parámetros:
+        tipo (str): 'Codificado' o 'Decodificado'.
+        entrada_widget (tk.Text): Widget con el texto de entrada.
+        salida_widget (tk.Text): Widget donde se escribirá el resultado.
+    """
+    global ocupado
+    if ocupado:
+        messagebox.showwarning("Aviso", "Espera a que termine la operación en curso")
+        return
+    ocupado = True
+    panel_de(entrada_widget).leer(lambda texto: ejecutar_cifrado(tipo, texto.strip(), salida_widget))
+
+
+def ejecutar_cifrado(tipo, texto, salida_widget):
+    """
+    Codifica o decodifica un texto y escribe el resultado a trozos en `salida_widget`.
+
+    Parámetros:
+        tipo (str): 'Codificado' o 'Decodificado'.
+        texto (str): Texto de entrada.
+        salida_widget (tk.Text): Widget donde se escribirá el resultado.
+    """
+    global ocupado
     if not texto:
-        messagebox.showwarning("Aviso", "No hay texto para decodificar")
+        ocupado = False
+        if tipo == "Codificado":
+            messagebox.showwarning("Aviso", "Escribe algo para codificar")
+        else:
+            messagebox.showwarning("Aviso", "No hay texto para decodificar")
         return
 
-    resultado = decodificar(texto, clave_actual)
-    salida_widget.delete("1.0", tk.END)
-    salida_widget.insert(tk.END, resultado)
+    def mostrar(resultado):
+        def terminar():
+            global ocupado
+            ocupado = False
+            registrar_historial(tipo, texto, resultado)
+        # Si el resultado es enorme solo se dibuja una vista previa (ver `guardar_resultado`)
+        panel_de(salida_widget).mostrar(resultado, al_terminar=terminar)
 
-    registrar_historial("Decodificado", texto, resultado)
+    if len(texto) < UMBRAL_SEGUNDO_PLANO:
+        mostrar(codificar(texto, clave_actual) if tipo == "Codificado" else decodificar(texto, clave_actual))
+        return
 
+    # Texto grande: en un hilo aparte, por bloques, para poder ver el avance y cancelar
+    if tipo == "Codificado":
+        procesador = CodificadorIncremental(clave_actual).codificar
+    else:
+        procesador = DecodificadorIncremental(clave_actual).decodificar
+
+    def terminar(resultado):
+        dialogo.destroy()
+        mostrar(resultado)
+
+    def fallar(error):
+        global ocupado
+        ocupado = False
+        dialogo.destroy()
+        if not isinstance(error, TareaCancelada):
+            messagebox.showerror("Error", f"No se pudo completar la operación:\n{error}")
+
+    tarea = Tarea(ventana, lambda progreso: procesar_texto(texto, procesador, 64 * 1024, progreso),
+                  al_terminar=terminar, al_fallar=fallar)
+    accion = "Codificando" if tipo == "Codificado" else "Decodificando"
+    dialogo = DialogoProgreso(ventana, accion, f"{accion} {len(texto)} caracteres...",
+                              cancelar=tarea.cancelar,
+                              colores={"fondo": BG_SECONDARY, "texto": TXT_PRIMARY})
+    tarea.al_progresar = dialogo.actualizar
+    tarea.iniciar()
+
+
+def guardar_resultado(salida_widget):
+    """
+    Guarda en un archivo el texto completo del widget de salida.
+
+    Es la forma de obtener los resultados demasiado grandes para mostrarlos
+    enteros. El archivo se escribe en un hilo aparte con ventana de progreso.
+
+    Parámetros:
+        salida_widget (tk.Text o scrolledtext.ScrolledText): Widget de salida.
+    """
+    def guardar(texto):
+        if not texto.strip():
+            messagebox.showwarning("Aviso", "No hay resultado para guardar")
+            return
+
+        archivo = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Archivos TXT", "*.txt"), ("Todos los archivos", "*.*")],
+            title="Guardar resultado"
+        )
+        if not archivo:
+            return
+
+        def terminar(total):
+            dialogo.destroy()
+            messagebox.showinfo("Éxito", f"Resultado guardado correctamente ({total} caracteres).")
+
+        def fallar(error):
+            dialogo.destroy()
+            if not isinstance(error, TareaCancelada):
+                messagebox.showerror("Error", f"No se pudo guardar el resultado:\n{error}")
+
+        tarea = Tarea(ventana, lambda progreso: guardar_texto(texto, archivo, progreso=progreso),
+                      al_terminar=terminar, al_fallar=fallar)
+        dialogo = DialogoProgreso(ventana, "Guardar resultado", "Guardando resultado...",
+                                  cancelar=tarea.cancelar,
+                                  colores={"fondo": BG_SECONDARY, "texto": TXT_PRIMARY})
+        tarea.al_progresar = dialogo.actualizar
+        tarea.iniciar()
+
+    panel_de(salida_widget).leer(guardar)
 
 
 def traducir_wrapper(entrada, salida):
-    """Traduce palabra ↔ emoji."""
+    """Traduce palabra ↔ emoji, o un texto completo si tiene varias palabras."""
     texto = entrada.get("1.0", tk.END).strip()
     if not texto:
         messagebox.showwarning("Aviso", "Escribe algo para traducir")
         return
     salida.delete("1.0", tk.END)
-    salida.insert(tk.END, emoji_translate(texto))
+    salida.insert(tk.END, traducir_texto(texto))
 
 
 # Lanzar aplicación
 ventana.mainloop()
+
+# Al cerrar la ventana: guardar el índice para no reconstruirlo al volver a abrir
+indice_historial.guardar()
+historial.cerrar()
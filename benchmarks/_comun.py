@@ -0,0 +1,81 @@
+"""
+Utilidades comunes para los benchmarks de EmojiCipher.
+
+Los benchmarks no importan las aplicaciones de S10-S13 (crean la ventana de
+tkinter al importarse), sino el paquete `emojicipher`. Todos los datos se
+generan con una semilla fija para que los resultados sean reproducibles.
+"""
+
+import os
+import random
+import sys
+import time
+
+# Asegurarnos de que la raíz del repositorio está en sys.path para poder
+# importar el paquete compartido `emojicipher`.
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_REPO not in sys.path:
+    sys.path.insert(0, RAIZ_REPO)
+
+CARACTERES = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ,.!?-"
+
+PALABRAS = (
+    "hola mundo el pedido llega mañana con tres cajas y un sobre "
+    "la reunion es a las 10 en la sala grande no olvides el informe "
+    "gracias por todo hasta luego"
+).split()
+
+UNIDADES = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def leer_tamano(texto: str) -> int:
+    """Convierte un tamaño como '1KB' o '100MB' a número de bytes."""
+    texto = texto.strip().upper()
+    for sufijo, factor in UNIDADES.items():
+        if texto.endswith(sufijo):
+            return int(float(texto[:-len(sufijo)]) * factor)
+    return int(texto)
+
+
+def formatear_tamano(n: int) -> str:
+    """Convierte un número de bytes en un texto corto ('1KB', '100MB', ...)."""
+    for sufijo, factor in reversed(list(UNIDADES.items())):
+        if n >= factor and n % factor == 0:
+            return f"{n // factor}{sufijo}"
+    return f"{n}B"
+
+
+def clave_de_prueba(semilla: int = 1234) -> dict:
+    """Genera una clave reproducible con el mismo alfabeto que `generar_clave`."""
+    import emoji
+
+    azar = random.Random(semilla)
+    emojis = azar.sample(sorted(emoji.EMOJI_DATA), len(CARACTERES))
+    return dict(zip(CARACTERES, emojis))
+
+
+def texto_de_prueba(tamano: int, semilla: int = 1234) -> str:
+    """Genera un texto ASCII de `tamano` caracteres a partir de frases en español."""
+    azar = random.Random(semilla)
+    bloque = " ".join(azar.choice(PALABRAS) for _ in range(2000)).replace("ñ", "n") + ". "
+    repeticiones = tamano // len(bloque) + 1
+    return (bloque * repeticiones)[:tamano]
+
+
+def medir(funcion, repeticiones: int = 3) -> float:
+    """Ejecuta `funcion` varias veces y devuelve el mejor tiempo en segundos."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def repeticiones_para(tamano: int) -> int:
+    """Número de repeticiones razonable según el tamaño de la entrada."""
+    if tamano <= 64 * 1024:
+        return 200
+    if tamano <= 8 * 1024 ** 2:
+        return 5
+    return 1
@@ -0,0 +1,55 @@
+"""
+Benchmark de generación de claves.
+
+Compara la versión original de `generar_clave` (convierte `EMOJI_DATA` en
+lista y la baraja entera dos veces) con `emojicipher.generador`: una clave
+cada vez con `secrets` y el modo por lotes `generar_claves`. Muestra claves
+por segundo.
+
+Ejecutar: `python benchmarks/bench_claves.py`
+"""
+
+import argparse
+import random
+import time
+
+from _comun import CARACTERES
+
+from emojicipher.generador import alfabeto_emojis, generar_clave, generar_claves
+
+
+def generar_clave_original() -> dict:
+    """Copia de `generar_clave` tal y como estaba en S12/Codigo.py."""
+    import emoji
+
+    lista_emojis = list(emoji.EMOJI_DATA.keys())
+    random.shuffle(lista_emojis)
+    lista_emojis = lista_emojis[:len(CARACTERES)]
+    random.shuffle(lista_emojis)
+    return {CARACTERES[i]: lista_emojis[i] for i in range(len(CARACTERES))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--claves", type=int, default=5000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    alfabeto = alfabeto_emojis()
+    print(f"alfabeto: {len(alfabeto)} emojis en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    pruebas = (
+        ("original (random)", lambda n: [generar_clave_original() for _ in range(n)]),
+        ("secrets, una a una", lambda n: [generar_clave() for _ in range(n)]),
+        ("secrets, por lotes", lambda n: list(generar_claves(n))),
+    )
+    print(f"{'método':<20} | {'claves/s':>10}")
+    for nombre, funcion in pruebas:
+        inicio = time.perf_counter()
+        funcion(args.claves)
+        segundos = time.perf_counter() - inicio
+        print(f"{nombre:<20} | {args.claves / segundos:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark de `codificar`: tabla de `str.translate` frente al generador.
+
+Compara el motor por defecto (la tabla de `str.maketrans` de `CompiledKey`)
+con la versión anterior de S12/Codigo.py, que hacía un `clave.get(c, c)` por
+carácter dentro de un generador. Muestra el rendimiento en MB/s de texto de
+entrada.
+
+Ejecutar: `python benchmarks/bench_codificar.py`
+       `python benchmarks/bench_codificar.py --tamanos 1KB 1MB` (más rápido)
+"""
+
+import argparse
+
+from _comun import (clave_de_prueba, formatear_tamano, leer_tamano, medir,
+                    repeticiones_para, texto_de_prueba)
+
+from emojicipher import CompiledKey
+
+
+def codificar_generador(texto: str, clave: dict) -> str:
+    """Versión anterior de `codificar` en S12/Codigo.py."""
+    return "".join(clave.get(c, c) for c in texto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", nargs="+", default=["1KB", "1MB", "100MB"],
+                        help="tamaños de entrada a probar (por defecto: 1KB 1MB 100MB)")
+    args = parser.parse_args()
+
+    clave = clave_de_prueba()
+    compilada = CompiledKey(clave)
+
+    print(f"{'tamaño':>8} | {'generador MB/s':>15} | {'tabla MB/s':>11} | {'mejora':>7}")
+    print("-" * 52)
+    for tamano in map(leer_tamano, args.tamanos):
+        texto = texto_de_prueba(tamano)
+        megas = len(texto.encode("utf-8")) / 1024 ** 2
+        repeticiones = repeticiones_para(tamano)
+
+        # Comprobamos antes que los dos motores dan el mismo resultado
+        if compilada.codificar(texto) != codificar_generador(texto, clave):
+            raise SystemExit("Los dos motores no coinciden")
+
+        t_generador = medir(lambda: codificar_generador(texto, clave), repeticiones)
+        t_tabla = medir(lambda: compilada.codificar(texto), repeticiones)
+        print(f"{formatear_tamano(tamano):>8} | {megas / t_generador:>15.1f} | "
+              f"{megas / t_tabla:>11.1f} | {t_generador / t_tabla:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark del formato de las claves: JSON (indent=4) frente a binario (.emk).
+
+Guarda miles de claves en cada formato y compara el tamaño en disco y el
+tiempo de carga: convertir los bytes ya leídos en diccionario, leer el
+archivo y convertirlo, y además compilarlo (`CompiledKey`) como hace la
+aplicación.
+
+Ejecutar: `python benchmarks/bench_formato_clave.py --claves 5000`
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import _comun  # noqa: F401  (añade la raíz del repositorio a sys.path)
+
+from emojicipher.clave import CompiledKey, guardar_clave_json
+from emojicipher.formato import clave_de_bytes, guardar_clave_binaria
+from emojicipher.generador import generar_claves
+
+
+def convertir_json(datos: bytes) -> dict:
+    return json.loads(datos.decode("utf-8"))
+
+
+def medir_por_clave(funcion, argumentos: list) -> float:
+    """Microsegundos por clave de aplicar `funcion` a cada argumento."""
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcion(argumento)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--claves", type=int, default=5000)
+    args = parser.parse_args()
+
+    claves = list(generar_claves(args.claves))
+    with tempfile.TemporaryDirectory() as carpeta:
+        formatos = (
+            ("JSON", ".json", guardar_clave_json, convertir_json),
+            ("binario", ".emk", guardar_clave_binaria, clave_de_bytes),
+        )
+        print(f"{args.claves} claves (tiempos en µs por clave)")
+        print(f"{'formato':<8} | {'tamaño total':>12} | {'bytes/clave':>11} | "
+              f"{'convertir':>9} | {'leer+convertir':>14} | {'+compilar':>9}")
+        for nombre, extension, guardar, convertir in formatos:
+            rutas = [os.path.join(carpeta, f"clave{i}{extension}") for i in range(len(claves))]
+            for clave, ruta in zip(claves, rutas):
+                guardar(clave, ruta)
+            total = sum(os.path.getsize(ruta) for ruta in rutas)
+
+            def leer(ruta):
+                with open(ruta, "rb") as f:
+                    return convertir(f.read())
+
+            contenidos = []
+            for ruta in rutas:
+                with open(ruta, "rb") as f:
+                    contenidos.append(f.read())
+            assert [convertir(datos) for datos in contenidos] == claves
+
+            solo_convertir = medir_por_clave(convertir, contenidos)
+            con_lectura = medir_por_clave(leer, rutas)
+            con_compilar = medir_por_clave(lambda ruta: CompiledKey(leer(ruta)), rutas)
+
+            print(f"{nombre:<8} | {total / 1024:>9.0f} KB | {total / len(rutas):>11.0f} | "
+                  f"{solo_convertir:>9.1f} | {con_lectura:>14.1f} | {con_compilar:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
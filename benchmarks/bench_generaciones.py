@@ -0,0 +1,352 @@
+"""
+Benchmark de todas las generaciones de EmojiCipher.
+
+Mide `codificar` y `decodificar` de cada versión del repositorio con la misma
+clave y los mismos textos:
+
+- S10/prueba.py y S10/emojiprueba.py (primeras pruebas).
+- S10/EmojiCipher.py y S11/Code.py (búsqueda con `startswith` por emoji).
+- S13 (Práctica final)/EmojiCipherOriginal.py (emojis ordenados por longitud).
+- S12/Codigo.py y S13 (Práctica final)/EmojiCipherActualizado.py, que usan
+  `emojicipher.core`.
+
+Las aplicaciones crean la ventana de tkinter al importarse, así que no se
+importan: se lee su código con `ast` y solo se ejecutan sus importaciones
+(menos tkinter), sus funciones y las variables globales que usan
+`codificar` y `decodificar`. Se les pasa la clave como `dict`, igual que en
+su momento.
+
+Hay tres corpus reproducibles: ASCII, español con tildes y eñes (caracteres
+que no están en la clave) y texto que ya lleva emojis. Para cada medida se
+muestra el tiempo (mín, máx, media, desviación, mediana y rondas, como
+pytest-benchmark), el rendimiento en MB/s, el pico de memoria (con
+`tracemalloc`) y si el resultado coincide con el de referencia
+(`CompiledKey`, la búsqueda voraz de S12).
+
+Cada ejecución se añade a un historial en JSON Lines (por defecto en la
+carpeta de datos de EmojiCipher) y con `--comparar` se muestra la diferencia
+con la ejecución anterior. Las generaciones que tardan más de
+`--max-segundos` en un tamaño no se miden en los siguientes.
+
+Ejecutar: `python benchmarks/bench_generaciones.py`
+       `python benchmarks/bench_generaciones.py --tamanos 1KB 1MB 100MB --comparar`
+       `python benchmarks/bench_generaciones.py --generaciones S11 S12 --corpus ascii`
+"""
+
+import argparse
+import ast
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from _comun import (CARACTERES, PALABRAS, RAIZ_REPO, clave_de_prueba, formatear_tamano,
+                    leer_tamano, repeticiones_para, texto_de_prueba)
+
+import emoji
+
+from emojicipher import CompiledKey
+from emojicipher.datos import carpeta_datos
+
+CARPETA_S13 = "S13 (Práctica final)"
+
+# Nombre corto → archivo de cada generación, de la más antigua a la más nueva
+GENERACIONES = {
+    "S10 prueba": os.path.join("S10", "prueba.py"),
+    "S10 emojiprueba": os.path.join("S10", "emojiprueba.py"),
+    "S10 EmojiCipher": os.path.join("S10", "EmojiCipher.py"),
+    "S11 Code": os.path.join("S11", "Code.py"),
+    "S12 Codigo": os.path.join("S12", "Codigo.py"),
+    "S13 Original": os.path.join(CARPETA_S13, "EmojiCipherOriginal.py"),
+    "S13 Actualizado": os.path.join(CARPETA_S13, "EmojiCipherActualizado.py"),
+}
+
+FUNCIONES = ("codificar", "decodificar")
+
+PALABRAS_ACENTOS = (
+    "mañana camión niño pingüino acción corazón está también árbol fácil "
+    "últimos reunión canción papá jamás ¿qué ¿cómo ¡hola! ¡adiós! señal año "
+    "Ángel Óscar Íñigo Úrsula Éxito"
+).split()
+
+# Segundos por medida a partir de los que se deja de subir de tamaño
+MAX_SEGUNDOS = 10.0
+
+# Segundos que se dedican como mucho a repetir cada medida
+PRESUPUESTO_RONDAS = 2.0
+
+
+# ================================================================
+# ------------------------ Carga de código -----------------------
+# ================================================================
+
+def _nombres_usados(nodo) -> set:
+    """Nombres que lee el código de un nodo."""
+    return {n.id for n in ast.walk(nodo) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+
+
+def _es_de_tkinter(nodo) -> bool:
+    """Indica si una importación es de tkinter (crearía dependencias de la ventana)."""
+    if isinstance(nodo, ast.Import):
+        return any(alias.name.split(".")[0] == "tkinter" for alias in nodo.names)
+    return (nodo.module or "").split(".")[0] == "tkinter"
+
+
+def cargar_generacion(ruta: str) -> dict:
+    """
+    Carga `codificar` y `decodificar` de una aplicación sin ejecutarla entera.
+
+    Parámetros:
+        ruta (str): Ruta del archivo de la aplicación.
+
+    Retorna:
+        dict: {"codificar": función, "decodificar": función}.
+
+    Lanza:
+        LookupError: Si el archivo no define ni importa alguna de las funciones.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        modulo = ast.parse(f.read(), filename=ruta)
+
+    importaciones = [n for n in modulo.body if isinstance(n, (ast.Import, ast.ImportFrom)) and not _es_de_tkinter(n)]
+    funciones = {n.name: n for n in modulo.body if isinstance(n, ast.FunctionDef)}
+    asignaciones = [n for n in modulo.body if isinstance(n, ast.Assign)]
+
+    # Variables globales que necesitan las funciones (y las que necesitan estas)
+    pendientes = set()
+    for nombre in FUNCIONES:
+        if nombre in funciones:
+            pendientes |= _nombres_usados(funciones[nombre])
+    necesarias = []
+    for nodo in reversed(asignaciones):
+        destinos = {t.id for t in nodo.targets if isinstance(t, ast.Name)}
+        if destinos & pendientes:
+            necesarias.insert(0, nodo)
+            pendientes |= _nombres_usados(nodo.value)
+
+    cuerpo = importaciones + list(funciones.values()) + necesarias
+    espacio = {"__name__": "generacion", "__file__": ruta}
+    exec(compile(ast.Module(body=cuerpo, type_ignores=[]), ruta, "exec"), espacio)
+
+    resultado = {}
+    for nombre in FUNCIONES:
+        if not callable(espacio.get(nombre)):
+            raise LookupError(f"{ruta} no define '{nombre}'")
+        resultado[nombre] = espacio[nombre]
+    return resultado
+
+
+# ================================================================
+# ---------------------------- Corpus ----------------------------
+# ================================================================
+
+def texto_acentos(tamano: int, semilla: int = 1234) -> str:
+    """Texto en español con tildes, eñes y signos de apertura."""
+    azar = random.Random(semilla)
+    palabras = PALABRAS + PALABRAS_ACENTOS
+    bloque = " ".join(azar.choice(palabras) for _ in range(2000)) + ". "
+    return (bloque * (tamano // len(bloque) + 1))[:tamano]
+
+
+def texto_emojis(tamano: int, semilla: int = 1234) -> str:
+    """Texto que ya lleva emojis (de varios puntos de código) entre las palabras."""
+    azar = random.Random(semilla)
+    emojis = azar.sample(sorted(emoji.EMOJI_DATA), 200)
+    partes = [azar.choice(emojis) if azar.random() < 0.3 else azar.choice(PALABRAS) for _ in range(2000)]
+    bloque = " ".join(partes) + " "
+    return (bloque * (tamano // len(bloque) + 1))[:tamano]
+
+
+CORPUS = {
+    "ascii": texto_de_prueba,
+    "acentos": texto_acentos,
+    "emojis": texto_emojis,
+}
+
+
+# ================================================================
+# ---------------------------- Medidas ---------------------------
+# ================================================================
+
+def medir_rondas(funcion, maximo: int) -> list:
+    """Ejecuta `funcion` varias veces (al menos una) y devuelve los tiempos."""
+    tiempos = []
+    inicio_total = time.perf_counter()
+    while len(tiempos) < maximo:
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+        if time.perf_counter() - inicio_total > PRESUPUESTO_RONDAS:
+            break
+    return tiempos
+
+
+def pico_memoria(funcion) -> tuple:
+    """Ejecuta `funcion` una vez y devuelve (resultado, pico de memoria en bytes)."""
+    tracemalloc.start()
+    try:
+        resultado = funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, pico
+
+
+def medir_caso(funcion, entrada: str, esperado: str, tamano: int) -> dict:
+    """Mide una función con una entrada: correcto, memoria y tiempos."""
+    resultado, pico = pico_memoria(lambda: funcion(entrada))
+    tiempos = medir_rondas(lambda: funcion(entrada), repeticiones_para(tamano))
+    return {
+        "correcto": resultado == esperado,
+        "pico_bytes": pico,
+        "min": min(tiempos),
+        "max": max(tiempos),
+        "media": statistics.fmean(tiempos),
+        "desviacion": statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+        "mediana": statistics.median(tiempos),
+        "rondas": len(tiempos),
+        "mb_s": len(entrada.encode("utf-8")) / 1024 ** 2 / min(tiempos),
+    }
+
+
+# ================================================================
+# --------------------------- Historial --------------------------
+# ================================================================
+
+def ruta_historial() -> str:
+    """Archivo por defecto con los resultados de ejecuciones anteriores."""
+    return os.path.join(carpeta_datos(), "benchmarks", "generaciones.jsonl")
+
+
+def version_repositorio() -> str:
+    """Commit actual del repositorio, si se puede averiguar."""
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ_REPO,
+                                capture_output=True, text=True, check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def ultima_ejecucion(ruta: str) -> dict:
+    """Resultados de la última ejecución guardada, por (generación, corpus, tamaño, operación)."""
+    ultima = None
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip():
+                    ultima = json.loads(linea)
+    except FileNotFoundError:
+        return {}
+    if ultima is None:
+        return {}
+    return {(r["generacion"], r["corpus"], r["tamano"], r["operacion"]): r for r in ultima["resultados"]}
+
+
+def guardar_ejecucion(ruta: str, resultados: list):
+    """Añade una ejecución al historial."""
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    ejecucion = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": version_repositorio(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write(json.dumps(ejecucion, ensure_ascii=False) + "\n")
+
+
+# ================================================================
+# ---------------------------- Informe ---------------------------
+# ================================================================
+
+def formatear_bytes(n: int) -> str:
+    """Convierte un número de bytes en un texto corto ('1.5MB', '12.0KB', ...)."""
+    for sufijo, factor in (("MB", 1024 ** 2), ("KB", 1024)):
+        if n >= factor:
+            return f"{n / factor:.1f}{sufijo}"
+    return f"{n}B"
+
+
+def imprimir_grupo(titulo: str, filas: list, anteriores: dict):
+    """Tabla de un grupo (corpus, tamaño, operación), de la más rápida a la más lenta."""
+    print(f"\n{'-' * 20} {titulo} {'-' * 20}")
+    cabecera = (f"{'generación':<16} | {'mín ms':>9} | {'máx ms':>9} | {'media ms':>9} | {'desv ms':>8} | "
+                f"{'mediana ms':>10} | {'rondas':>6} | {'MB/s':>8} | {'pico mem':>9} | {'correcto':>8}")
+    if anteriores:
+        cabecera += f" | {'vs. anterior':>12}"
+    print(cabecera)
+    for fila in sorted(filas, key=lambda r: r["media"]):
+        linea = (f"{fila['generacion']:<16} | {fila['min'] * 1000:>9.3f} | {fila['max'] * 1000:>9.3f} | "
+                 f"{fila['media'] * 1000:>9.3f} | {fila['desviacion'] * 1000:>8.3f} | "
+                 f"{fila['mediana'] * 1000:>10.3f} | {fila['rondas']:>6} | {fila['mb_s']:>8.2f} | "
+                 f"{formatear_bytes(fila['pico_bytes']):>9} | {'sí' if fila['correcto'] else 'NO':>8}")
+        if anteriores:
+            anterior = anteriores.get((fila["generacion"], fila["corpus"], fila["tamano"], fila["operacion"]))
+            cambio = f"{(fila['min'] / anterior['min'] - 1) * 100:+.1f}%" if anterior else "nuevo"
+            linea += f" | {cambio:>12}"
+        print(linea)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", nargs="+", default=["1KB", "64KB", "1MB"],
+                        help="tamaños de texto (por defecto: 1KB 64KB 1MB; hasta 100MB)")
+    parser.add_argument("--corpus", nargs="+", choices=sorted(CORPUS), default=list(CORPUS))
+    parser.add_argument("--generaciones", nargs="+", default=None,
+                        help="prefijos de las generaciones a medir (p. ej. S10 S13)")
+    parser.add_argument("--max-segundos", type=float, default=MAX_SEGUNDOS,
+                        help="no seguir subiendo de tamaño una generación más lenta que esto")
+    parser.add_argument("--historial", default=ruta_historial(), help="archivo JSON Lines de resultados")
+    parser.add_argument("--no-guardar", action="store_true", help="no añadir esta ejecución al historial")
+    parser.add_argument("--comparar", action="store_true", help="comparar con la ejecución anterior")
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+
+    generaciones = {}
+    for nombre, ruta in GENERACIONES.items():
+        if args.generaciones and not any(nombre.startswith(p) for p in args.generaciones):
+            continue
+        generaciones[nombre] = cargar_generacion(os.path.join(RAIZ_REPO, ruta))
+
+    clave = clave_de_prueba(args.semilla)
+    referencia = CompiledKey(clave)
+    anteriores = ultima_ejecucion(args.historial) if args.comparar else {}
+    print(f"clave de {len(clave)} caracteres ({CARACTERES[:10]}...), referencia: CompiledKey")
+
+    resultados = []
+    for corpus in args.corpus:
+        lentas = set()  # (generación, operación) que ya superaron el límite
+        for tamano in map(leer_tamano, args.tamanos):
+            texto = CORPUS[corpus](tamano, args.semilla)
+            cifrado = referencia.codificar(texto)
+            casos = {"codificar": (texto, cifrado), "decodificar": (cifrado, referencia.decodificar(cifrado))}
+            for operacion, (entrada, esperado) in casos.items():
+                filas = []
+                for nombre, funciones in generaciones.items():
+                    if (nombre, operacion) in lentas:
+                        continue
+                    medida = medir_caso(lambda t: funciones[operacion](t, clave), entrada, esperado, tamano)
+                    medida.update(generacion=nombre, corpus=corpus, tamano=formatear_tamano(tamano),
+                                  operacion=operacion)
+                    filas.append(medida)
+                    if medida["min"] > args.max_segundos:
+                        lentas.add((nombre, operacion))
+                        print(f"{nombre} tarda más de {args.max_segundos:g} s en {operacion}: "
+                              f"no se mide con textos más grandes")
+                resultados.extend(filas)
+                imprimir_grupo(f"{operacion} {corpus} {formatear_tamano(tamano)}", filas, anteriores)
+
+    if not args.no_guardar:
+        guardar_ejecucion(args.historial, resultados)
+        print(f"\nresultados añadidos a {args.historial}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark del decodificador por grafemas con claves ambiguas.
+
+Una clave es ambigua cuando un emoji es el principio de otro ("👍" y "👍🏻").
+Compara tres formas de decodificar el mismo texto:
+
+- carácter a carácter, como `S10/prueba.py` (`if ch in inversa`) y
+  `S10/emojiprueba.py` (`if ch in TODOS_EMOJIS`, una búsqueda en una lista
+  por carácter, solo hasta 64KB), que no saben leer emojis de varios puntos
+  de código (se muestra cuántos caracteres del resultado no coinciden);
+- la búsqueda voraz en el trie de `CompiledKey.decodificar_bloque` (S12);
+- `DecodificadorGrafemas`, que segmenta en grafemas y usa un diccionario.
+
+Con `--comprobar` recorre todo el alfabeto de la librería `emoji` en claves
+sucesivas y comprueba que el decodificador por grafemas da exactamente lo
+mismo que la búsqueda voraz, también con trozos sueltos (ZWJ, tonos de piel,
+indicadores regionales) y emojis que no son de la clave.
+
+Ejecutar: `python benchmarks/bench_grafemas.py --tamanos 1KB 1MB`
+"""
+
+import argparse
+import random
+
+from _comun import CARACTERES, clave_de_prueba, formatear_tamano, leer_tamano, medir, repeticiones_para, texto_de_prueba
+
+import emoji
+
+from emojicipher.clave import CompiledKey
+from emojicipher.grafemas import DecodificadorGrafemas
+
+# Trozos que no forman un emoji completo por sí solos
+FRAGMENTOS = ["\u200d", "\U0001f3fb", "\U0001f3ff", "\ufe0f", "\U0001f1ea", "\U0001f1f8", "\r\n", "x"]
+
+
+def clave_ambigua(semilla: int = 1234) -> dict:
+    """Clave como las de S10 y S11 (emojis de toda la librería) con algunos
+    emojis que son el principio de otros ("👍" y "👍🏻")."""
+    clave = clave_de_prueba(semilla)
+    todos = set(emoji.EMOJI_DATA)
+    con_tono = sorted(em for em in todos if em + "\U0001f3fb" in todos)
+    bases = random.Random(semilla).sample(con_tono, 4)
+    for caracter, em in zip("aeos", bases):
+        clave[caracter] = em
+    for caracter, em in zip("ntri", bases):
+        clave[caracter] = em + "\U0001f3fb"
+    return clave
+
+
+# Tamaño máximo para el decodificador de S10/emojiprueba.py, que es O(n·m)
+MAX_LISTA = 64 * 1024
+
+
+def decodificar_por_caracter(texto: str, inversa: dict) -> str:
+    """Decodificador de S10/prueba.py: un punto de código cada vez."""
+    return "".join(inversa.get(ch, ch) for ch in texto)
+
+
+def decodificar_con_lista(texto: str, inversa: dict, todos: list) -> str:
+    """Decodificador de S10/emojiprueba.py: cada carácter se busca en la lista de emojis."""
+    return "".join(inversa.get(ch, ch) if ch in todos else ch for ch in texto)
+
+
+def comprobar(semilla: int = 1234, textos: int = 50) -> int:
+    """Compara grafemas y búsqueda voraz con claves que cubren todo el alfabeto."""
+    azar = random.Random(semilla)
+    todos = sorted(emoji.EMOJI_DATA)
+    comprobados = 0
+    claves = [clave_ambigua(semilla)]
+    for inicio in range(0, len(todos), len(CARACTERES)):
+        # Emojis consecutivos al ordenarlos: muchos son prefijo de otros
+        claves.append(dict(zip(CARACTERES, todos[inicio:inicio + len(CARACTERES)])))
+    for clave in claves:
+        compilada = CompiledKey(clave)
+        grafemas = DecodificadorGrafemas(compilada)
+        emojis = list(clave.values())
+        muestras = [compilada.codificar(CARACTERES)]
+        for _ in range(textos):
+            partes = []
+            for _ in range(azar.randint(0, 80)):
+                r = azar.random()
+                if r < 0.6:
+                    partes.append(azar.choice(emojis))
+                elif r < 0.8:
+                    partes.append(azar.choice(FRAGMENTOS))
+                else:
+                    partes.append(azar.choice(todos))
+            muestras.append("".join(partes))
+        for texto in muestras:
+            esperado = compilada.decodificar_bloque(texto)[0]
+            obtenido = grafemas.decodificar(texto)
+            if obtenido != esperado:
+                raise AssertionError(f"Diferencia con la clave {sorted(emojis)[:3]}...: {texto!r}")
+            comprobados += 1
+    return comprobados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", nargs="+", default=["1KB", "64KB", "1MB"])
+    parser.add_argument("--comprobar", action="store_true", help="comprobar la equivalencia en todo el alfabeto")
+    args = parser.parse_args()
+
+    if args.comprobar:
+        print(f"{comprobar()} textos iguales a la búsqueda voraz")
+        return
+
+    clave = CompiledKey(clave_ambigua())
+    grafemas = DecodificadorGrafemas(clave)
+    todos = list(emoji.EMOJI_DATA)
+    print(f"{'tamaño':>8} | {'método':<20} | {'MB/s':>8} | {'distintos':>9}")
+    for tamano in map(leer_tamano, args.tamanos):
+        cifrado = clave.codificar(texto_de_prueba(tamano))
+        esperado = clave.decodificar_bloque(cifrado)[0]
+        repeticiones = min(repeticiones_para(tamano), 20)
+        metodos = [
+            ("S10 prueba", lambda: decodificar_por_caracter(cifrado, clave.inversa)),
+            ("trie voraz (S12)", lambda: clave.decodificar_bloque(cifrado)[0]),
+            ("grafemas", lambda: grafemas.decodificar(cifrado)),
+        ]
+        if tamano <= MAX_LISTA:
+            metodos.insert(1, ("S10 emojiprueba", lambda: decodificar_con_lista(cifrado, clave.inversa, todos)))
+        for nombre, funcion in metodos:
+            resultado = funcion()
+            distintos = sum(a != b for a, b in zip(resultado, esperado)) + abs(len(resultado) - len(esperado))
+            segundos = medir(funcion, 1 if nombre == "S10 emojiprueba" else repeticiones)
+            print(f"{formatear_tamano(tamano):>8} | {nombre:<20} | "
+                  f"{tamano / segundos / 1024 ** 2:>8.2f} | {distintos:>9}")
+
+
+if __name__ == "__main__":
+    main()
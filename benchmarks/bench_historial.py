@@ -0,0 +1,98 @@
+"""
+Benchmark del historial: lista en memoria con los registros completos (como
+la que usaban antes las aplicaciones) frente al historial en disco
+(`historial.AlmacenHistorial`).
+
+Registra muchas operaciones con textos grandes y compara la memoria que
+ocupa cada uno (con `tracemalloc`), el tiempo por registro y lo que cuesta
+leer una página de registros antiguos. Después compara buscar una palabra
+recorriendo los registros con buscarla en el índice invertido.
+
+Ejecutar: `python benchmarks/bench_historial.py --registros 2000 --tamano 100KB`
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from _comun import formatear_tamano, leer_tamano, texto_de_prueba
+
+from emojicipher.historial import AlmacenHistorial
+from emojicipher.indice_historial import IndiceHistorial, palabras
+
+
+class _HistorialLista:
+    """Historial que guarda todos los registros completos en una lista."""
+
+    def __init__(self):
+        self._registros = []
+
+    def registrar(self, tipo: str, original: str, resultado: str) -> dict:
+        registro = {
+            "fecha": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            "tipo": tipo,
+            "original": original,
+            "resultado": resultado
+        }
+        self._registros.append(registro)
+        return registro
+
+    def __len__(self):
+        return len(self._registros)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--registros", type=int, default=2000)
+    parser.add_argument("--tamano", default="100KB", help="tamaño de cada texto")
+    args = parser.parse_args()
+
+    texto = texto_de_prueba(leer_tamano(args.tamano))
+    print(f"{args.registros} registros de {formatear_tamano(len(texto))}")
+    print(f"{'historial':<10} | {'memoria':>10} | {'µs/registro':>11} | {'página antigua':>14}")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for nombre, crear in (("lista", _HistorialLista), ("disco", lambda: AlmacenHistorial(carpeta))):
+            tracemalloc.start()
+            historial = crear()
+            inicio = time.perf_counter()
+            for i in range(args.registros):
+                # Textos distintos para que no se compartan entre registros
+                historial.registrar("Codificado", texto + str(i), str(i) + texto)
+            segundos = time.perf_counter() - inicio
+            memoria = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            pagina = "-"
+            if hasattr(historial, "pagina"):
+                inicio = time.perf_counter()
+                historial.pagina(len(historial) // 50 - 1, 50)
+                pagina = f"{(time.perf_counter() - inicio) * 1e3:.2f} ms"
+
+            print(f"{nombre:<10} | {memoria / 1024 ** 2:>7.1f} MB | "
+                  f"{segundos / args.registros * 1e6:>11.1f} | {pagina:>14}")
+
+        # Búsqueda: recorrer el historial en disco frente al índice
+        consulta = "pedido"
+        inicio = time.perf_counter()
+        recorrido = [n for n, r in historial.numerados()
+                     if consulta in palabras(f"{r['tipo']} {r['original']} {r['resultado']}")]
+        lineal = time.perf_counter() - inicio
+
+        indice = IndiceHistorial(historial)
+        inicio = time.perf_counter()
+        indice.buscar(consulta)
+        construir = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        encontrados = indice.buscar(consulta, prefijo=False)
+        consulta_indice = time.perf_counter() - inicio
+        assert encontrados == recorrido
+        print(f"buscar '{consulta}': recorriendo {lineal * 1e3:.1f} ms, "
+              f"índice {consulta_indice * 1e3:.3f} ms (construirlo: {construir * 1e3:.1f} ms)")
+        historial.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark del tiempo de importación en frío de EmojiCipher.
+
+Cada medida se hace en un proceso de Python nuevo, así que no hay módulos en
+caché. Compara:
+- `emojicipher.core`: el núcleo sin interfaz gráfica.
+- `tkinter` + `emoji`: lo que cargaban S12/Codigo.py y
+  S13 (Práctica final)/EmojiCipherActualizado.py antes de crear la ventana.
+
+Ejecutar: `python benchmarks/bench_importacion.py`
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from _comun import RAIZ_REPO
+
+CASOS = {
+    "python vacío": "pass",
+    "emojicipher.core": "import emojicipher.core",
+    "emojicipher.core + generar_clave": "import emojicipher.core as c; c.generar_clave()",
+    "tkinter + emoji (aplicación)": "import tkinter, tkinter.ttk, tkinter.scrolledtext, emoji",
+}
+
+
+def medir_importacion(codigo: str, repeticiones: int) -> list:
+    """Lanza `repeticiones` procesos nuevos y devuelve sus tiempos en ms."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ_REPO, check=True)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    # El núcleo no debe cargar tkinter (ni siquiera de forma indirecta)
+    comprobacion = subprocess.run(
+        [sys.executable, "-c", "import sys, emojicipher.core; print('tkinter' in sys.modules)"],
+        cwd=RAIZ_REPO, capture_output=True, text=True, check=True,
+    )
+    if comprobacion.stdout.strip() != "False":
+        raise SystemExit("emojicipher.core importa tkinter")
+
+    print(f"{'caso':<34} | {'mediana ms':>10} | {'mín ms':>8}")
+    print("-" * 58)
+    for nombre, codigo in CASOS.items():
+        tiempos = medir_importacion(codigo, args.repeticiones)
+        print(f"{nombre:<34} | {statistics.median(tiempos):>10.1f} | {min(tiempos):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark del llavero de claves (`emojicipher.llavero`).
+
+Guarda miles de claves y mide cuánto cuesta resolver `id → clave compilada`:
+sin caché (lectura de SQLite y compilación) y con la caché LRU, y con varios
+hilos lectores a la vez.
+
+Ejecutar: `python benchmarks/bench_llavero.py --claves 5000`
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+import _comun  # noqa: F401  (añade la raíz del repositorio a sys.path)
+
+from emojicipher.generador import generar_claves
+from emojicipher.llavero import Llavero
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--claves", type=int, default=5000)
+    parser.add_argument("--consultas", type=int, default=20000)
+    parser.add_argument("--hilos", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        llavero = Llavero(os.path.join(carpeta, "llavero.sqlite3"), capacidad_cache=args.claves)
+
+        inicio = time.perf_counter()
+        ids = llavero.anadir_varias((clave, None) for clave in generar_claves(args.claves))
+        segundos = time.perf_counter() - inicio
+        print(f"alta de {len(ids)} claves: {segundos:.2f} s ({len(ids) / segundos:.0f} claves/s)")
+
+        azar = random.Random(1234)
+        consultas = [azar.choice(ids) for _ in range(args.consultas)]
+
+        def medir(nombre: str, funcion, lista: list):
+            inicio = time.perf_counter()
+            for id_clave in lista:
+                funcion(id_clave)
+            segundos = time.perf_counter() - inicio
+            print(f"{nombre:<28} | {segundos / len(lista) * 1e6:>10.2f} µs/consulta")
+
+        def sin_cache(id_clave):
+            llavero.cache.descartar(id_clave)
+            llavero.obtener(id_clave)
+
+        print(f"{'consulta':<28} | {'tiempo':>21}")
+        medir("sin caché (SQLite+compilar)", sin_cache, consultas[:2000])
+        for id_clave in ids:
+            llavero.obtener(id_clave)
+        medir("con caché LRU", llavero.obtener, consultas)
+        medir("por huella (SQLite)", llavero.buscar_huella, [i[:8] for i in consultas[:2000]])
+
+        # Varios hilos leyendo a la vez, cada uno con su conexión (las cierra
+        # todas el `cerrar()` del final)
+        def lector():
+            for id_clave in consultas:
+                llavero.obtener(id_clave)
+
+        hilos = [threading.Thread(target=lector) for _ in range(args.hilos)]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        segundos = time.perf_counter() - inicio
+        print(f"{args.hilos} hilos lectores: {args.hilos * len(consultas) / segundos:.0f} consultas/s")
+        llavero.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark de escalado de `emojicipher.lotes` con el número de procesos.
+
+Crea un lote de archivos de prueba en una carpeta temporal y lo codifica con
+1, 2, 4, ... procesos (hasta el número de núcleos), mostrando el rendimiento
+agregado y la aceleración respecto a un solo proceso.
+
+Ejecutar: `python benchmarks/bench_lotes.py`
+       `python benchmarks/bench_lotes.py --archivos 2000 --tamano 64KB`
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from _comun import clave_de_prueba, leer_tamano, texto_de_prueba
+
+from emojicipher.lotes import procesar_lote
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--archivos", type=int, default=500)
+    parser.add_argument("--tamano", default="64KB", help="tamaño de cada archivo")
+    args = parser.parse_args()
+
+    clave = clave_de_prueba()
+    texto = texto_de_prueba(leer_tamano(args.tamano))
+    nucleos = os.cpu_count() or 1
+    niveles = sorted({1, nucleos} | {2 ** i for i in range(1, 8) if 2 ** i < nucleos})
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        entrada = os.path.join(carpeta, "entrada")
+        os.makedirs(entrada)
+        archivos = []
+        for i in range(args.archivos):
+            ruta = os.path.join(entrada, f"archivo_{i:05d}.txt")
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(texto)
+            archivos.append(ruta)
+        megas = len(texto.encode("utf-8")) * len(archivos) / 1024 ** 2
+
+        print(f"{args.archivos} archivos de {args.tamano} ({megas:.1f} MB), {nucleos} núcleos")
+        print(f"{'procesos':>8} | {'MB/s':>8} | {'archivos/s':>10} | {'aceleración':>11}")
+        print("-" * 47)
+        base = None
+        for procesos in niveles:
+            salida = os.path.join(carpeta, f"salida_{procesos}")
+            inicio = time.perf_counter()
+            for resultado in procesar_lote(archivos, clave, salida, "codificar", procesos):
+                if resultado["error"]:
+                    raise SystemExit(resultado["error"])
+            segundos = time.perf_counter() - inicio
+            base = base or segundos
+            print(f"{procesos:>8} | {megas / segundos:>8.1f} | {len(archivos) / segundos:>10.1f} | "
+                  f"{base / segundos:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark de la decodificación de archivos: bloques de texto frente a `mmap`.
+
+Crea un archivo cifrado en una carpeta temporal y lo decodifica con
+`flujo.decodificar_archivo` (lee bloques de texto, convertidos a `str`) y con
+`mapeado.decodificar_archivo_mmap` (recorre los bytes del archivo mapeado en
+memoria). Comprueba que los dos archivos de salida son idénticos y muestra
+MB/s de texto cifrado y el pico de memoria de Python (`tracemalloc`, en una
+ejecución aparte porque ralentiza mucho cada asignación de memoria).
+
+Con `--ambigua` se usa una clave en la que un emoji es prefijo de otro, para
+medir también el caso sin vía rápida.
+
+Ejecutar: `python benchmarks/bench_mmap.py`
+       `python benchmarks/bench_mmap.py --tamanos 1MB 100MB --ambigua`
+"""
+
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+import tracemalloc
+
+from _comun import clave_de_prueba, formatear_tamano, leer_tamano, texto_de_prueba
+
+from emojicipher import CompiledKey
+from emojicipher.flujo import decodificar_archivo
+from emojicipher.mapeado import decodificar_archivo_mmap
+
+
+def medir(funcion) -> tuple:
+    """Ejecuta `funcion` dos veces y devuelve (segundos, pico de memoria en bytes)."""
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", nargs="+", default=["1MB", "8MB"],
+                        help="tamaños del texto original (el cifrado ocupa varias veces más)")
+    parser.add_argument("--ambigua", action="store_true", help="usar una clave con un emoji prefijo de otro")
+    args = parser.parse_args()
+
+    clave = clave_de_prueba()
+    if args.ambigua:
+        clave["a"], clave["b"] = "👍", "👍🏻"
+    compilada = CompiledKey(clave)
+
+    print(f"{'original':>8} | {'cifrado':>9} | {'método':<8} | {'MB/s':>8} | {'pico memoria':>12}")
+    print("-" * 59)
+    with tempfile.TemporaryDirectory() as carpeta:
+        cifrado = os.path.join(carpeta, "cifrado.txt")
+        for tamano in map(leer_tamano, args.tamanos):
+            with open(cifrado, "w", encoding="utf-8", newline="") as f:
+                f.write(compilada.codificar(texto_de_prueba(tamano)))
+            megas = os.path.getsize(cifrado) / 1024 ** 2
+
+            salidas = {}
+            for metodo, funcion in (("bloques", decodificar_archivo), ("mmap", decodificar_archivo_mmap)):
+                salidas[metodo] = os.path.join(carpeta, f"{metodo}.txt")
+                segundos, pico = medir(lambda: funcion(cifrado, salidas[metodo], compilada))
+                print(f"{formatear_tamano(tamano):>8} | {megas:>7.1f}MB | {metodo:<8} | "
+                      f"{megas / segundos:>8.1f} | {pico / 1024 ** 2:>10.1f}MB")
+            if not filecmp.cmp(salidas["bloques"], salidas["mmap"], shallow=False):
+                raise SystemExit("Los dos métodos no dan el mismo resultado")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark del índice compacto de nombres (`emojicipher.nombres`).
+
+Compara el tiempo de carga del archivo binario (con `mmap`) con el del índice
+JSON de `emojicipher.traduccion` y el de S10/emojis.json, y mide búsquedas
+exactas, por prefijo y aproximadas por segundo.
+
+Ejecutar: `python benchmarks/bench_nombres.py`
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import _comun  # noqa: F401  (añade la raíz del repositorio a sys.path)
+
+from emojicipher.nombres import ALIAS_S10_JSON, IndiceNombres, construir_indice_nombres
+from emojicipher.traduccion import IndiceEmoji, obtener_indice, ruta_indice
+
+
+def medir_carga(funcion, repeticiones: int = 20) -> float:
+    """Mejor tiempo (en ms) de `repeticiones` cargas."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+        if hasattr(resultado, "cerrar"):
+            resultado.cerrar()
+    return mejor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--consultas", type=int, default=20000)
+    parser.add_argument("--difusas", type=int, default=50)
+    args = parser.parse_args()
+
+    obtener_indice()  # Asegura que el índice JSON existe en la caché
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "nombres.idx")
+        inicio = time.perf_counter()
+        entradas = construir_indice_nombres(ruta)
+        print(f"construcción: {entradas} nombres en {(time.perf_counter() - inicio) * 1000:.0f} ms, "
+              f"{os.path.getsize(ruta) / 1024:.0f} KB")
+
+        def cargar_emojis_json():
+            with open(ALIAS_S10_JSON, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        print(f"{'carga':<25} | {'ms':>8}")
+        for nombre, funcion in (("índice binario (mmap)", lambda: IndiceNombres(ruta)),
+                                ("índice JSON traducción", lambda: IndiceEmoji.cargar(ruta_indice())),
+                                ("S10/emojis.json", cargar_emojis_json)):
+            print(f"{nombre:<25} | {medir_carga(funcion):>8.2f}")
+
+        with IndiceNombres(ruta) as indice:
+            azar = random.Random(1234)
+            nombres = [indice.nombre(azar.randrange(len(indice))) for _ in range(args.consultas)]
+            prefijos = [n[:3] for n in nombres]
+            difusas = [n[:-1] + "x" for n in nombres[:args.difusas]]
+
+            print(f"\n{'búsqueda':<25} | {'consultas/s':>12}")
+            for nombre, funcion, consultas in (
+                    ("exacta", indice.emoji_de, nombres),
+                    ("prefijo (20 resultados)", indice.buscar_prefijo, prefijos),
+                    ("difusa (distancia 2)", indice.buscar_difuso, difusas)):
+                inicio = time.perf_counter()
+                for consulta in consultas:
+                    funcion(consulta)
+                segundos = time.perf_counter() - inicio
+                print(f"{nombre:<25} | {len(consultas) / segundos:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
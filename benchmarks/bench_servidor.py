@@ -0,0 +1,149 @@
+"""
+Prueba de carga del servidor HTTP de EmojiCipher en local.
+
+Arranca `python -m emojicipher servir` en otro proceso (con un llavero
+temporal que contiene la clave de prueba), abre varias conexiones
+persistentes con `ClienteEmojiCipher` y envía peticiones con pipelining:
+cada conexión mantiene hasta `--profundidad` peticiones en vuelo. Comprueba
+que las respuestas son correctas y muestra peticiones por segundo y la
+latencia (p50, p99 y máxima) de cada ruta.
+
+La latencia se mide desde que se escribe la petición hasta que se lee su
+respuesta, así que con más profundidad sube la latencia y también el
+rendimiento. El cliente y el servidor comparten la máquina: con pocos
+núcleos los números son una cota inferior.
+
+Ejecutar: `python benchmarks/bench_servidor.py`
+       `python benchmarks/bench_servidor.py --conexiones 16 --profundidad 8 --tamano 4KB`
+       `python benchmarks/bench_servidor.py --unix --rutas encode decode`
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+
+from _comun import RAIZ_REPO, clave_de_prueba, formatear_tamano, leer_tamano, texto_de_prueba
+
+from emojicipher.clave import CompiledKey
+from emojicipher.core import traducir_texto
+from emojicipher.llavero import Llavero
+from emojicipher.servidor import ClienteEmojiCipher
+
+ID_CLAVE = "bench"
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil `p` (0-100) de una lista ya ordenada, por el método del rango más cercano."""
+    indice = max(0, min(len(valores) - 1, round(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+def arrancar_servidor(ruta_llavero: str, unix: str = None) -> tuple:
+    """Arranca el servidor en otro proceso y espera a que escuche.
+
+    Retorna:
+        tuple: (proceso, dirección para `ClienteEmojiCipher.conectar` como dict).
+    """
+    orden = [sys.executable, "-m", "emojicipher", "servir", "--llavero", ruta_llavero]
+    orden += ["--unix", unix] if unix else ["--puerto", "0"]
+    entorno = dict(os.environ, PYTHONPATH=RAIZ_REPO)
+    proceso = subprocess.Popen(orden, cwd=RAIZ_REPO, env=entorno, stderr=subprocess.PIPE, text=True)
+    linea = proceso.stderr.readline()
+    if not linea.startswith("Escuchando en "):
+        proceso.kill()
+        raise SystemExit(f"El servidor no ha arrancado: {linea}{proceso.stderr.read()}")
+    if unix:
+        return proceso, {"unix": unix}
+    return proceso, {"puerto": int(linea.rsplit(":", 1)[1])}
+
+
+async def conexion(direccion: dict, peticiones: list, profundidad: int, latencias: list):
+    """Envía las peticiones por una conexión con hasta `profundidad` en vuelo.
+
+    Parámetros:
+        peticiones (list): Tuplas (ruta, datos, resultado esperado).
+        latencias (list): Se le añade la latencia de cada petición, en segundos.
+    """
+    cliente = await ClienteEmojiCipher.conectar(**direccion)
+    enviadas = deque()
+    siguiente = 0
+    try:
+        while siguiente < len(peticiones) or enviadas:
+            while siguiente < len(peticiones) and len(enviadas) < profundidad:
+                ruta, datos, esperado = peticiones[siguiente]
+                cliente.enviar(ruta, datos)
+                enviadas.append((time.perf_counter(), esperado))
+                siguiente += 1
+            estado, respuesta = await cliente.recibir()
+            inicio, esperado = enviadas.popleft()
+            latencias.append(time.perf_counter() - inicio)
+            if estado != 200 or respuesta["resultado"] != esperado:
+                raise SystemExit(f"Respuesta incorrecta ({estado}): {str(respuesta)[:200]}")
+    finally:
+        await cliente.cerrar()
+
+
+async def medir_ruta(direccion: dict, peticion: tuple, total: int, conexiones: int, profundidad: int) -> tuple:
+    """Lanza `total` peticiones iguales repartidas entre las conexiones.
+
+    Retorna:
+        tuple: (segundos, latencias ordenadas).
+    """
+    latencias = []
+    reparto = [total // conexiones + (i < total % conexiones) for i in range(conexiones)]
+    inicio = time.perf_counter()
+    await asyncio.gather(*(conexion(direccion, [peticion] * n, profundidad, latencias)
+                           for n in reparto if n))
+    return time.perf_counter() - inicio, sorted(latencias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--peticiones", type=int, default=2000, help="peticiones por ruta")
+    parser.add_argument("--conexiones", type=int, default=8)
+    parser.add_argument("--profundidad", type=int, default=4, help="peticiones en vuelo por conexión")
+    parser.add_argument("--tamano", default="256", help="caracteres del texto de cada petición")
+    parser.add_argument("--rutas", nargs="+", choices=["encode", "decode", "translate"],
+                        default=["encode", "decode", "translate"])
+    parser.add_argument("--unix", action="store_true", help="usar un socket Unix en lugar de TCP")
+    args = parser.parse_args()
+
+    clave = CompiledKey(clave_de_prueba())
+    texto = texto_de_prueba(leer_tamano(args.tamano))
+    peticiones = {
+        "encode": ("/encode", {"texto": texto, "clave": ID_CLAVE}, clave.codificar(texto)),
+        "decode": ("/decode", {"texto": clave.codificar(texto), "clave": ID_CLAVE}, texto),
+        "translate": ("/translate", {"texto": texto}, traducir_texto(texto)),
+    }
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_llavero = os.path.join(carpeta, "llavero.sqlite3")
+        with Llavero(ruta_llavero) as llavero:
+            llavero.anadir(clave, ID_CLAVE)
+        unix = os.path.join(carpeta, "emojicipher.sock") if args.unix else None
+        proceso, direccion = arrancar_servidor(ruta_llavero, unix)
+        try:
+            print(f"{args.conexiones} conexiones × {args.profundidad} en vuelo, textos de "
+                  f"{formatear_tamano(len(texto))}, {'socket Unix' if unix else 'TCP'}")
+            print(f"{'ruta':<10} | {'peticiones':>10} | {'pet/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'máx ms':>8}")
+            print("-" * 67)
+            for ruta in args.rutas:
+                # Calentamiento: compila la clave y carga el índice de traducción
+                asyncio.run(medir_ruta(direccion, peticiones[ruta], args.conexiones, args.conexiones, 1))
+                segundos, latencias = asyncio.run(medir_ruta(
+                    direccion, peticiones[ruta], args.peticiones, args.conexiones, args.profundidad))
+                print(f"/{ruta:<9} | {len(latencias):>10} | {len(latencias) / segundos:>8.0f} | "
+                      f"{percentil(latencias, 50) * 1000:>8.2f} | {percentil(latencias, 99) * 1000:>8.2f} | "
+                      f"{latencias[-1] * 1000:>8.2f}")
+        finally:
+            proceso.terminate()
+            proceso.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
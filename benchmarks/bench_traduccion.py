@@ -0,0 +1,54 @@
+"""
+Benchmark de `emoji_translate`: librería `emoji` frente al índice precalculado.
+
+Compara la versión original (dos `emojize` y dos `demojize` por consulta) con
+`emojicipher.traduccion.traducir`, con la caché LRU vaciada para medir el
+índice y no la caché. Muestra consultas por segundo.
+
+Ejecutar: `python benchmarks/bench_traduccion.py`
+"""
+
+import argparse
+import random
+import time
+
+import _comun  # noqa: F401  (añade la raíz del repositorio a sys.path)
+
+from emojicipher.traduccion import _traducir_con_libreria, obtener_indice, traducir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--consultas", type=int, default=2000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    indice = obtener_indice()
+    print(f"índice listo en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    azar = random.Random(1234)
+    nombres = [n[1:-1] for n in indice.por_nombre["es"]]
+    emojis = list(indice.nombres["es"])
+    consultas = [azar.choice(nombres) for _ in range(args.consultas // 2)]
+    consultas += [azar.choice(emojis) for _ in range(args.consultas // 4)]
+    consultas += [f"palabra{i}" for i in range(args.consultas // 4)]
+    azar.shuffle(consultas)
+
+    def con_libreria():
+        for texto in consultas:
+            _traducir_con_libreria(texto.strip())
+
+    def con_indice():
+        traducir.cache_clear()
+        for texto in consultas:
+            traducir(texto)
+
+    for nombre, funcion in (("librería emoji", con_libreria), ("índice", con_indice)):
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        print(f"{nombre:<15} | {len(consultas) / segundos:>12.0f} consultas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Pruebas diferenciales (fuzzing) de los decodificadores de EmojiCipher.
+
+Genera claves con `generar_clave` (y variantes con emojis de varios puntos
+de código, emojis que son prefijo de otros, emojis repetidos como en las
+claves de S10 y S11, emojis con un ZWJ seguido de un salto de línea y
+emojis que empiezan por un fragmento suelto) y textos aleatorios que mezclan caracteres normales,
+emojis de la clave, otros emojis y trozos de secuencias (ZWJ, tonos de piel,
+selectores de variación, indicadores regionales, emojis cortados...).
+
+Cada texto se decodifica con la referencia (la búsqueda voraz de
+S12/Codigo.py: emojis ordenados de más largo a más corto y `startswith` en
+cada posición) y con cada motor candidato. Las búsquedas se reparten entre
+varios procesos; en cuanto uno encuentra una diferencia se reduce el caso
+(quitando trozos del texto y entradas de la clave mientras la diferencia se
+mantenga) y se muestra un ejemplo mínimo en JSON para reproducirla.
+
+Ejecutar: `python benchmarks/fuzz_decodificadores.py --segundos 60`
+       `python benchmarks/fuzz_decodificadores.py --motores grafemas --procesos 8`
+       `python benchmarks/fuzz_decodificadores.py --reproducir caso.json`
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import deque
+
+from _comun import CARACTERES
+
+import emoji
+
+from emojicipher.clave import CompiledKey
+from emojicipher.codec import crear_codec
+from emojicipher.core import decodificar as decodificar_core
+from emojicipher.flujo import DecodificadorIncremental, procesar_texto
+from emojicipher.generador import generar_clave
+from emojicipher.grafemas import DecodificadorGrafemas
+from emojicipher.mapeado import TrieBytes, decodificar_mmap
+
+# Caracteres del texto claro que no están en las claves generadas
+OTROS_CARACTERES = "áéíóúñÑ¿¡ü€\t\n"
+
+# Trozos sueltos de secuencias de emojis
+FRAGMENTOS = (
+    "\u200d",  # ZWJ
+    "\ufe0f",  # selector de variación 16
+    "\u20e3",  # tecla (keycap)
+    "\u0301",  # tilde combinante
+    "\U0001f3fb", "\U0001f3fd", "\U0001f3ff",  # tonos de piel
+    "\U0001f1ea", "\U0001f1f8", "\U0001f1fa",  # indicadores regionales
+    "\U000e0067", "\U000e007f",  # etiquetas
+    "\r", "\n", "\r\n",
+)
+
+# Iteraciones que hace cada proceso antes de informar
+ITERACIONES_POR_LOTE = 500
+
+
+# ================================================================
+# -------------------------- Referencia --------------------------
+# ================================================================
+
+def decodificar_referencia(texto: str, clave: dict) -> str:
+    """Decodificador original de S12/Codigo.py (búsqueda voraz con `startswith`)."""
+    inversa = {v: k for k, v in clave.items()}
+    claves_ordenadas = sorted(inversa.keys(), key=len, reverse=True)
+
+    resultado = ""
+    i = 0
+    while i < len(texto):
+        match = None
+        for em in claves_ordenadas:
+            if texto.startswith(em, i):
+                match = em
+                break
+        if match:
+            resultado += inversa[match]
+            i += len(match)
+        else:
+            resultado += texto[i]
+            i += 1
+    return resultado
+
+
+# ================================================================
+# --------------------------- Motores ----------------------------
+# ================================================================
+
+def _incremental(texto: str, clave: CompiledKey, trozo: int) -> str:
+    decodificador = DecodificadorIncremental(clave)
+    partes = [decodificador.decodificar(texto[i:i + trozo]) for i in range(0, len(texto), trozo)]
+    partes.append(decodificador.decodificar("", final=True))
+    return "".join(partes)
+
+
+def _procesar_texto(texto: str, clave: CompiledKey, trozo: int) -> str:
+    return procesar_texto(texto, DecodificadorIncremental(clave).decodificar, trozo)
+
+
+def _mmap(texto: str, clave: CompiledKey, trozo: int) -> str:
+    # Los mismos bytes que se leerían del archivo mapeado en memoria
+    partes = []
+    decodificar_mmap(texto.encode("utf-8"), TrieBytes(clave), partes.append, tamano_buffer=trozo)
+    return b"".join(partes).decode("utf-8")
+
+
+def _codec(texto: str, clave: CompiledKey, trozo: int) -> str:
+    # Como lo lee TextIOWrapper: bloques de bytes que pueden cortar un carácter UTF-8
+    decodificador = crear_codec(clave, "emojicipher-fuzz").incrementaldecoder()
+    datos = texto.encode("utf-8")
+    partes = [decodificador.decode(datos[i:i + trozo]) for i in range(0, len(datos), trozo)]
+    partes.append(decodificador.decode(b"", final=True))
+    return "".join(partes)
+
+
+# Nombre → función (texto, clave compilada, tamaño de trozo) → texto decodificado
+MOTORES = {
+    "CompiledKey.decodificar": lambda texto, clave, trozo: clave.decodificar(texto),
+    "trie": lambda texto, clave, trozo: clave.decodificar_bloque(texto)[0],
+    "grafemas": lambda texto, clave, trozo: DecodificadorGrafemas(clave).decodificar(texto),
+    "core.decodificar": lambda texto, clave, trozo: decodificar_core(texto, clave.clave),
+    "incremental": _incremental,
+    "procesar_texto": _procesar_texto,
+    "mmap": _mmap,
+    "codec": _codec,
+}
+
+
+def ejecutar_motor(motor: str, caso: dict) -> str:
+    """Decodifica el texto de un caso con un motor (los errores se devuelven como texto)."""
+    try:
+        return MOTORES[motor](caso["texto"], CompiledKey(caso["clave"]), caso["trozo"])
+    except Exception as e:
+        return f"<{type(e).__name__}: {e}>"
+
+
+def diverge(motor: str, caso: dict) -> bool:
+    """Indica si un motor da un resultado distinto del de la referencia."""
+    return ejecutar_motor(motor, caso) != decodificar_referencia(caso["texto"], caso["clave"])
+
+
+# ================================================================
+# ---------------------- Generación de casos ---------------------
+# ================================================================
+
+def _emojis_libreria() -> list:
+    return sorted(emoji.EMOJI_DATA)
+
+
+def generar_caso(azar: random.Random, todos: list) -> dict:
+    """Genera una clave y un texto aleatorios."""
+    caracteres = "".join(azar.sample(CARACTERES, azar.randint(1, len(CARACTERES))))
+    clave = generar_clave(caracteres)
+    tipo = azar.choice(("generada", "libreria", "ambigua"))
+    if tipo != "generada":
+        # Emojis de toda la librería, como las claves de S10 y S11
+        for c in azar.sample(caracteres, len(caracteres) // 3):
+            clave[c] = azar.choice(todos)
+    if tipo == "ambigua":
+        for _ in range(azar.randint(1, 4)):
+            c, otro = azar.choice(caracteres), azar.choice(caracteres)
+            em = clave[otro]
+            opcion = azar.random()
+            if opcion < 0.2 and len(em) > 1:
+                clave[c] = em[:azar.randint(1, len(em) - 1)]  # prefijo de otro emoji
+            elif opcion < 0.4:
+                clave[c] = em + azar.choice(FRAGMENTOS[:7])  # otro emoji que empieza igual
+            elif opcion < 0.55:
+                clave[c] = em  # emoji compartido
+            elif opcion < 0.7:
+                clave[c] = em + "\u200d" + azar.choice(todos)  # secuencia ZWJ
+            elif opcion < 0.85:
+                clave[c] = em + "\u200d" + azar.choice(("\r", "\n", "\r\n"))  # ZWJ y salto de línea
+            else:
+                clave[c] = azar.choice(FRAGMENTOS) + em  # empieza por un fragmento suelto
+
+    emojis = list(clave.values())
+    claros = caracteres + OTROS_CARACTERES
+    partes = []
+    for _ in range(azar.randint(0, 40)):
+        r = azar.random()
+        if r < 0.45:
+            partes.append(azar.choice(emojis))
+        elif r < 0.6:
+            partes.append(azar.choice(claros))
+        elif r < 0.7:
+            partes.append(azar.choice(todos))
+        elif r < 0.85:
+            partes.append(azar.choice(FRAGMENTOS))
+        else:
+            em = azar.choice(emojis + [azar.choice(todos)])
+            partes.append(em[:azar.randint(1, len(em))])  # secuencia cortada
+    return {"clave": clave, "texto": "".join(partes), "trozo": azar.randint(1, 8)}
+
+
+def buscar(parametros: tuple) -> tuple:
+    """Prueba casos aleatorios en un proceso.
+
+    Parámetros:
+        parametros (tuple): (semilla, iteraciones, motores).
+
+    Retorna:
+        tuple: (iteraciones hechas, fallo o None); el fallo es (motor, caso).
+    """
+    semilla, iteraciones, motores = parametros
+    azar = random.Random(semilla)
+    todos = _emojis_libreria()
+    for hechas in range(1, iteraciones + 1):
+        caso = generar_caso(azar, todos)
+        esperado = decodificar_referencia(caso["texto"], caso["clave"])
+        compilada = CompiledKey(caso["clave"])
+        for motor in motores:
+            try:
+                obtenido = MOTORES[motor](caso["texto"], compilada, caso["trozo"])
+            except Exception:
+                obtenido = None
+            if obtenido != esperado:
+                return hechas, (motor, caso)
+    return iteraciones, None
+
+
+# ================================================================
+# --------------------------- Reducción --------------------------
+# ================================================================
+
+def _reducir_lista(elementos: list, sigue_fallando) -> list:
+    """Quita trozos de una lista (cada vez más pequeños) mientras siga fallando."""
+    tamano = max(1, len(elementos) // 2)
+    while elementos:
+        inicio = 0
+        quitado = False
+        while inicio < len(elementos):
+            prueba = elementos[:inicio] + elementos[inicio + tamano:]
+            if sigue_fallando(prueba):
+                elementos = prueba
+                quitado = True
+            else:
+                inicio += tamano
+        if tamano == 1 and not quitado:
+            break
+        tamano = max(1, tamano // 2)
+    return elementos
+
+
+def reducir(motor: str, caso: dict) -> dict:
+    """
+    Reduce un caso que falla a uno mínimo que sigue fallando.
+
+    Se quitan caracteres del texto, entradas de la clave y, al final, se
+    busca el tamaño de trozo más grande que mantiene el fallo.
+
+    Parámetros:
+        motor (str): Motor que da un resultado distinto.
+        caso (dict): Caso con "clave", "texto" y "trozo".
+
+    Retorna:
+        dict: Caso reducido.
+    """
+    caso = dict(caso)
+    for _ in range(3):  # reducir el texto puede permitir reducir la clave y viceversa
+        antes = (len(caso["texto"]), len(caso["clave"]))
+        texto = _reducir_lista(list(caso["texto"]), lambda t: diverge(motor, {**caso, "texto": "".join(t)}))
+        caso["texto"] = "".join(texto)
+        pares = _reducir_lista(list(caso["clave"].items()), lambda p: diverge(motor, {**caso, "clave": dict(p)}))
+        caso["clave"] = dict(pares)
+        if (len(caso["texto"]), len(caso["clave"])) == antes:
+            break
+    for trozo in range(len(caso["texto"]) or 1, 0, -1):
+        if diverge(motor, {**caso, "trozo": trozo}):
+            caso["trozo"] = trozo
+            break
+    return caso
+
+
+def informe(motor: str, caso: dict) -> dict:
+    """Ejemplo para reproducir un fallo: caso, resultado esperado y obtenido."""
+    return {
+        "motor": motor,
+        **caso,
+        "esperado": decodificar_referencia(caso["texto"], caso["clave"]),
+        "obtenido": ejecutar_motor(motor, caso),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--motores", nargs="+", choices=sorted(MOTORES), default=list(MOTORES))
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--segundos", type=float, default=30.0, help="tiempo máximo de búsqueda")
+    parser.add_argument("--iteraciones", type=int, default=None, help="casos máximos (por defecto, sin límite)")
+    parser.add_argument("--semilla", type=int, default=None, help="semilla inicial (por defecto, aleatoria)")
+    parser.add_argument("--guardar", default=None, help="archivo JSON donde guardar el caso reducido")
+    parser.add_argument("--reproducir", default=None, help="archivo JSON con un caso guardado")
+    args = parser.parse_args()
+
+    if args.reproducir:
+        with open(args.reproducir, encoding="utf-8") as f:
+            caso = json.load(f)
+        resultado = informe(caso["motor"], {k: caso[k] for k in ("clave", "texto", "trozo")})
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        raise SystemExit(1 if resultado["esperado"] != resultado["obtenido"] else 0)
+
+    semilla = args.semilla if args.semilla is not None else random.randrange(2 ** 32)
+    print(f"semilla {semilla}, {args.procesos} procesos, motores: {', '.join(args.motores)}")
+
+    def quedan(lotes: int) -> bool:
+        if args.iteraciones is not None and lotes * ITERACIONES_POR_LOTE >= args.iteraciones:
+            return False
+        return time.perf_counter() - inicio < args.segundos
+
+    hechas = 0
+    enviados = 0
+    fallo = None
+    inicio = time.perf_counter()
+    with multiprocessing.Pool(args.procesos) as pool:
+        # Dos lotes en marcha por proceso para que ninguno se quede esperando
+        en_marcha = deque()
+        while fallo is None and (en_marcha or quedan(enviados)):
+            while len(en_marcha) < 2 * args.procesos and quedan(enviados):
+                en_marcha.append(pool.apply_async(buscar, ((semilla + enviados, ITERACIONES_POR_LOTE, args.motores),)))
+                enviados += 1
+            iteraciones, fallo = en_marcha.popleft().get()
+            hechas += iteraciones
+        pool.terminate()
+    segundos = time.perf_counter() - inicio
+    print(f"{hechas} casos en {segundos:.1f} s ({hechas / segundos:.0f} casos/s, "
+          f"{hechas * len(args.motores) / segundos:.0f} decodificaciones/s)")
+
+    if fallo is None:
+        print("ninguna diferencia con la referencia")
+        return
+
+    motor, caso = fallo
+    print(f"\n{motor} no coincide con la referencia; reduciendo el caso...")
+    resultado = informe(motor, reducir(motor, caso))
+    print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"caso guardado en {args.guardar}")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
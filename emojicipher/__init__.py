@@ -0,0 +1,68 @@
+"""
+Paquete compartido de EmojiCipher.
+
+Reúne la lógica común a las distintas versiones de la aplicación (S10, S11,
+S12 y S13) para que no tenga que repetirse en cada interfaz gráfica.
+
+Contiene:
+- `clave`: clase `CompiledKey`, que compila una clave una sola vez
+  (tabla de traducción, trie de decodificación, huella y validación).
+- `grafemas`: decodificación por grafemas (una expresión regular y un
+  diccionario) para las claves en las que un emoji es prefijo de otro.
+- `formato`: formato binario compacto de las claves (".emk"); el JSON se
+  sigue pudiendo importar y exportar.
+- `flujo`: codificación y decodificación de archivos por bloques.
+- `mapeado`: decodificación de archivos grandes con `mmap`, recorriendo sus
+  bytes con un trie de bytes de la clave sin convertirlos en texto.
+- `generador`: generación de claves con `secrets` a partir de un alfabeto de
+  emojis filtrado una sola vez.
+- `llavero`: almacén SQLite de muchas claves, por identificador o huella,
+  con caché LRU de claves compiladas.
+- `codec`: codec estándar de Python para las claves del llavero, de modo que
+  `open(ruta, encoding="emojicipher-<id>")` cifra y descifra al escribir y
+  leer (después de llamar a `registrar_codec()`).
+- `datos`: carpeta de datos del usuario (llavero e historial).
+- `historial`: historial en disco (JSON Lines con rotación), con los últimos
+  registros en memoria, lectura por páginas y exportación a TXT, CSV o
+  JSON Lines (con gzip opcional).
+- `indice_historial`: índice invertido del historial por palabras, tipo y
+  fecha, guardado junto al historial.
+- `vista_historial`: visor de tkinter que solo dibuja los registros visibles.
+- `vista_salida`: panel de salida de tkinter que escribe a trozos y solo muestra
+  una vista previa de los resultados enormes.
+- `lotes`: codificación de muchos archivos repartidos entre varios procesos.
+- `tareas`: tareas largas en un hilo aparte vigiladas desde tkinter, con
+  ventana de progreso y cancelación.
+- `traduccion`: índice precalculado para traducir palabra ↔ emoji.
+- `nombres`: índice binario de nombres de emoji (con los alias de S10) que se
+  abre con `mmap`, con búsqueda exacta, por prefijo y aproximada.
+- `servidor`: servidor HTTP asyncio (TCP o socket Unix) con /encode, /decode
+  y /translate, pipelining y procesos aparte para los textos grandes, y un
+  cliente asyncio para usarlo.
+- `core`: núcleo sin interfaz gráfica (clave, código, traducción, historial).
+
+También puede usarse desde la línea de comandos: `python -m emojicipher`.
+"""
+
+from .clave import (CompiledKey, cargar_clave_json, compilar_clave, construir_trie,
+                    guardar_clave_json, validar_clave)
+from .flujo import (CodificadorIncremental, DecodificadorIncremental, codificar_archivo,
+                    decodificar_archivo)
+from .formato import cargar_clave, guardar_clave
+
+__all__ = [
+    "CompiledKey", "cargar_clave_json", "compilar_clave", "construir_trie",
+    "guardar_clave_json", "validar_clave",
+    "CodificadorIncremental", "DecodificadorIncremental", "codificar_archivo",
+    "decodificar_archivo", "cargar_clave", "guardar_clave", "registrar_codec",
+]
+
+
+def registrar_codec(llavero=None):
+    """Registra el codec "emojicipher-<id>" para las claves de un llavero.
+
+    `codec` (y con él sqlite3 y el llavero) solo se importa al llamarla, no
+    al importar el paquete. Ver `codec.registrar`.
+    """
+    from .codec import registrar
+    registrar(llavero)
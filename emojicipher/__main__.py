@@ -0,0 +1,358 @@
+"""
+Línea de comandos de EmojiCipher (sin interfaz gráfica).
+
+No importa tkinter, así que puede usarse en servidores y procesos por lotes.
+
+Ejecutar desde la raíz del repositorio:
+    python -m emojicipher codificar --clave clave.json entrada.txt salida.txt
+    python -m emojicipher decodificar --clave clave.json salida.txt original.txt
+    python -m emojicipher decodificar --mmap --clave clave.emk enorme.txt original.txt
+    python -m emojicipher lote codificar --clave clave.json --salida cifrados/ logs/*.txt
+    python -m emojicipher traducir documento.txt traducido.txt
+    python -m emojicipher indice
+    python -m emojicipher convertir clave.json clave.emk
+    python -m emojicipher llavero generar 1000
+    python -m emojicipher codificar --id-clave 3f2a... entrada.txt salida.txt
+    python -m emojicipher buscar --prefijo cara_de
+    python -m emojicipher historial buscar "tipo:dec pedido fecha:semana"
+    python -m emojicipher historial exportar historial.csv.gz
+    python -m emojicipher servir --puerto 8765
+
+Usa '-' como archivo para leer de la entrada estándar o escribir en la salida
+estándar.
+"""
+
+import argparse
+import sqlite3
+import sys
+
+from .flujo import TAMANO_BLOQUE, codificar_archivo, decodificar_archivo
+from .formato import cargar_clave, guardar_clave
+
+
+def anadir_argumentos_clave(sub: argparse.ArgumentParser):
+    """Opciones para elegir la clave: un archivo o un identificador del llavero."""
+    origen = sub.add_mutually_exclusive_group(required=True)
+    origen.add_argument("--clave", help="archivo con la clave (JSON o binario .emk)")
+    origen.add_argument("--id-clave", help="identificador de la clave en el llavero")
+    sub.add_argument("--llavero", default=None, help="base de datos del llavero (por defecto, la del usuario)")
+    sub.add_argument("--estricta", action="store_true",
+                     help="rechazar claves ambiguas (un emoji prefijo de otro o compartido)")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Crea el analizador de argumentos con todos los subcomandos."""
+    parser = argparse.ArgumentParser(prog="python -m emojicipher", description="EmojiCipher sin interfaz gráfica")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    for nombre, ayuda in (("codificar", "codifica un archivo por bloques"),
+                          ("decodificar", "decodifica un archivo por bloques")):
+        sub = subcomandos.add_parser(nombre, help=ayuda)
+        sub.add_argument("entrada", help="archivo de entrada ('-' para la entrada estándar)")
+        sub.add_argument("salida", help="archivo de salida ('-' para la salida estándar)")
+        anadir_argumentos_clave(sub)
+        sub.add_argument("--bloque", type=int, default=TAMANO_BLOQUE,
+                         help=f"caracteres por bloque (por defecto {TAMANO_BLOQUE})")
+        if nombre == "decodificar":
+            sub.add_argument("--mmap", action="store_true",
+                             help="leer el archivo con mmap, byte a byte, sin convertirlo en texto")
+
+    sub = subcomandos.add_parser("lote", help="codifica o decodifica muchos archivos en paralelo")
+    sub.add_argument("operacion", choices=["codificar", "decodificar"])
+    sub.add_argument("archivos", nargs="+", help="archivos de entrada")
+    anadir_argumentos_clave(sub)
+    sub.add_argument("--salida", required=True, help="carpeta donde se escriben los resultados")
+    sub.add_argument("--procesos", type=int, default=None, help="procesos trabajadores (por defecto, uno por núcleo)")
+    sub.add_argument("--sin-orden", action="store_true", help="mostrar cada archivo en cuanto termine")
+    sub.add_argument("--bloque", type=int, default=TAMANO_BLOQUE,
+                     help=f"caracteres por bloque (por defecto {TAMANO_BLOQUE})")
+
+    sub = subcomandos.add_parser("traducir", help="traduce un documento palabra ↔ emoji línea a línea")
+    sub.add_argument("entrada", help="archivo de entrada ('-' para la entrada estándar)")
+    sub.add_argument("salida", help="archivo de salida ('-' para la salida estándar)")
+    sub.add_argument("--alias", action="store_true", help="buscar también palabras en los alias en inglés")
+
+    sub = subcomandos.add_parser("convertir", help="convierte una clave entre JSON y binario (.emk)")
+    sub.add_argument("entrada", help="clave de origen (JSON o binario)")
+    sub.add_argument("salida", help="clave de destino (JSON si acaba en .json, binario si no)")
+
+    sub = subcomandos.add_parser("llavero", help="gestiona el llavero de claves")
+    sub.add_argument("--llavero", default=None, help="base de datos del llavero (por defecto, la del usuario)")
+    acciones = sub.add_subparsers(dest="accion", required=True)
+    accion = acciones.add_parser("anadir", help="guarda claves de archivos en el llavero")
+    accion.add_argument("archivos", nargs="+", help="archivos de clave (JSON o binario)")
+    accion.add_argument("--id", default=None, help="identificador (solo con un archivo)")
+    accion = acciones.add_parser("generar", help="genera claves nuevas y las guarda")
+    accion.add_argument("cantidad", type=int)
+    acciones.add_parser("listar", help="muestra las claves guardadas")
+    accion = acciones.add_parser("exportar", help="copia una clave del llavero a un archivo")
+    accion.add_argument("id", help="identificador de la clave")
+    accion.add_argument("salida", help="archivo de destino (JSON si acaba en .json, binario si no)")
+    accion = acciones.add_parser("eliminar", help="borra una clave del llavero")
+    accion.add_argument("id", help="identificador de la clave")
+
+    sub = subcomandos.add_parser("indice", help="construye el índice compacto de nombres de emoji")
+    sub.add_argument("--salida", default=None, help="archivo del índice (por defecto, el de la caché)")
+
+    sub = subcomandos.add_parser("buscar", help="busca emojis por nombre en el índice compacto")
+    sub.add_argument("texto", help="nombre, prefijo o emoji")
+    modo = sub.add_mutually_exclusive_group()
+    modo.add_argument("--prefijo", action="store_true", help="nombres que empiezan por el texto")
+    modo.add_argument("--difuso", type=int, metavar="N", default=None,
+                      help="nombres a N ediciones o menos del texto")
+    sub.add_argument("--limite", type=int, default=20, help="número máximo de resultados")
+
+    sub = subcomandos.add_parser("historial", help="busca o exporta el historial de las aplicaciones")
+    sub.add_argument("--carpeta", default=None, help="carpeta del historial (por defecto, la de la aplicación)")
+    sub.add_argument("--aplicacion", choices=["S12", "S13"], default="S13",
+                     help="aplicación cuyo historial se usa si no se da --carpeta (por defecto S13)")
+    acciones = sub.add_subparsers(dest="accion", required=True)
+    accion = acciones.add_parser("buscar", help="busca por palabras, tipo:, desde:, hasta: y fecha:")
+    accion.add_argument("consulta", help='por ejemplo "tipo:dec pedido fecha:semana"')
+    accion.add_argument("--limite", type=int, default=20, help="número máximo de resultados (los más recientes)")
+    accion = acciones.add_parser("exportar", help="exporta el historial a TXT, CSV o JSON Lines")
+    accion.add_argument("salida", help="archivo de destino (el formato sale de la extensión; .gz para comprimir)")
+
+    sub = subcomandos.add_parser("servir", help="servidor HTTP con /encode, /decode y /translate")
+    sub.add_argument("--host", default="127.0.0.1", help="dirección en la que escuchar (por defecto 127.0.0.1)")
+    sub.add_argument("--puerto", type=int, default=8765, help="puerto TCP (por defecto 8765; 0 para uno libre)")
+    sub.add_argument("--unix", default=None, help="escuchar en un socket Unix en lugar de TCP")
+    sub.add_argument("--llavero", default=None, help="base de datos del llavero (por defecto, la del usuario)")
+    sub.add_argument("--procesos", type=int, default=None,
+                     help="procesos para los trabajos grandes (por defecto, uno por núcleo)")
+    sub.add_argument("--umbral", type=int, default=None,
+                     help="caracteres a partir de los cuales un trabajo va a otro proceso")
+    return parser
+
+
+def ejecutar_archivo(args, clave) -> int:
+    """Subcomandos `codificar` y `decodificar`: un único archivo."""
+    procesar = codificar_archivo if args.comando == "codificar" else decodificar_archivo
+    usar_mmap = getattr(args, "mmap", False)
+    if usar_mmap and args.entrada == "-":
+        print("Error: --mmap necesita un archivo de entrada, no la entrada estándar", file=sys.stderr)
+        return 1
+    try:
+        if usar_mmap:
+            from .mapeado import decodificar_archivo_mmap
+
+            decodificar_archivo_mmap(args.entrada, args.salida, clave)
+        else:
+            procesar(args.entrada, args.salida, clave, args.bloque)
+    except (OSError, ValueError) as e:
+        # ValueError: la entrada no es UTF-8 o la salida es el propio archivo de entrada
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def ejecutar_lote(args, clave) -> int:
+    """Subcomando `lote`: muchos archivos repartidos entre varios procesos."""
+    from .lotes import ResumenLote, procesar_lote
+
+    resumen = ResumenLote()
+    try:
+        for resultado in procesar_lote(args.archivos, clave, args.salida, args.operacion,
+                                       args.procesos, not args.sin_orden, args.bloque):
+            resumen.anadir(resultado)
+            if resultado["error"]:
+                print(f"ERROR {resultado['origen']}: {resultado['error']}", file=sys.stderr)
+            else:
+                print(f"{resultado['origen']} → {resultado['destino']}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(resumen.mostrar_info(), file=sys.stderr)
+    return 1 if resumen.errores else 0
+
+
+def ejecutar_traduccion(args) -> int:
+    """Subcomando `traducir`: documento completo, línea a línea."""
+    from .flujo import abrir_texto
+    from .traduccion import traducir_lineas
+
+    idiomas = ("es", "alias") if args.alias else ("es",)
+    try:
+        with abrir_texto(args.entrada, "r") as entrada, abrir_texto(args.salida, "w") as salida:
+            salida.writelines(traducir_lineas(entrada, idiomas))
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def ejecutar_conversion(args) -> int:
+    """Subcomando `convertir`: importa o exporta una clave entre JSON y binario."""
+    try:
+        guardar_clave(cargar_clave(args.entrada), args.salida)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def ejecutar_llavero(args) -> int:
+    """Subcomando `llavero`: añadir, generar, listar, exportar o eliminar claves."""
+    from .llavero import Llavero
+
+    try:
+        with Llavero(args.llavero) as llavero:
+            if args.accion == "anadir":
+                if args.id and len(args.archivos) > 1:
+                    print("Error: --id solo se puede usar con un archivo", file=sys.stderr)
+                    return 1
+                ids = llavero.anadir_varias((cargar_clave(ruta), args.id) for ruta in args.archivos)
+                print("\n".join(ids))
+            elif args.accion == "generar":
+                from .generador import generar_claves
+
+                ids = llavero.anadir_varias((clave, None) for clave in generar_claves(args.cantidad))
+                print("\n".join(ids))
+            elif args.accion == "listar":
+                for id_clave, huella, creada in llavero.listar():
+                    print(f"{id_clave}  {creada}  {huella}")
+            elif args.accion == "exportar":
+                guardar_clave(llavero.obtener(args.id), args.salida)
+            elif not llavero.eliminar(args.id):
+                print(f"Error: no existe la clave {args.id}", file=sys.stderr)
+                return 1
+    except KeyError as e:
+        print(f"Error: no existe la clave {e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cargar_clave_args(args):
+    """Carga la clave indicada con --clave o --id-clave."""
+    if args.id_clave is None:
+        return cargar_clave(args.clave, "rechazar" if args.estricta else "aceptar")
+
+    from .clave import aplicar_politica
+    from .llavero import Llavero
+
+    with Llavero(args.llavero) as llavero:
+        return aplicar_politica(llavero.obtener(args.id_clave), "rechazar" if args.estricta else "aceptar")
+
+
+def ejecutar_indice(args) -> int:
+    """Subcomando `indice`: construye el índice compacto de nombres."""
+    from .nombres import construir_indice_nombres, ruta_indice_nombres
+
+    ruta = args.salida or ruta_indice_nombres()
+    try:
+        entradas = construir_indice_nombres(ruta)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{entradas} nombres → {ruta}")
+    return 0
+
+
+def ejecutar_busqueda(args) -> int:
+    """Subcomando `buscar`: exacta, por prefijo o aproximada."""
+    from .nombres import obtener_indice_nombres
+
+    indice = obtener_indice_nombres()
+    if args.prefijo:
+        resultados = indice.buscar_prefijo(args.texto, args.limite)
+    elif args.difuso is not None:
+        resultados = [(nombre, em) for nombre, em, _ in indice.buscar_difuso(args.texto, args.difuso, args.limite)]
+    else:
+        em = indice.emoji_de(args.texto)
+        nombre = indice.nombre_de(args.texto)
+        resultados = [(args.texto, em)] if em else [(nombre, args.texto)] if nombre else []
+
+    for nombre, em in resultados:
+        print(f"{em}  {nombre}")
+    return 0 if resultados else 1
+
+
+def ejecutar_historial(args) -> int:
+    """Subcomando `historial`: buscar o exportar."""
+    from .core import formatear_registro
+    from .historial import AlmacenHistorial, carpeta_historial
+    from .indice_historial import IndiceHistorial
+
+    try:
+        almacen = AlmacenHistorial(args.carpeta or carpeta_historial(args.aplicacion), en_memoria=0)
+        if args.accion == "exportar":
+            total = almacen.exportar(args.salida)
+            print(f"{total} registros → {args.salida}", file=sys.stderr)
+            return 0
+
+        indice = IndiceHistorial(almacen)
+        numeros = indice.buscar(args.consulta, prefijo=False)
+        indice.guardar()
+        for numero in reversed(numeros[-args.limite:]):
+            print(formatear_registro(almacen.leer(numero, numero + 1)[0], numero + 1), end="")
+        print(f"{len(numeros)} resultados", file=sys.stderr)
+        return 0 if numeros else 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def ejecutar_servidor(args) -> int:
+    """Subcomando `servir`: atiende peticiones hasta que se pulse Ctrl+C."""
+    import asyncio
+
+    from .llavero import Llavero
+    from .servidor import UMBRAL_PROCESOS, Servidor
+
+    def al_iniciar(servidor):
+        direccion = servidor.sockets[0].getsockname()
+        if not isinstance(direccion, str):
+            direccion = "http://%s:%d" % direccion[:2]
+        print(f"Escuchando en {direccion}", file=sys.stderr, flush=True)
+
+    try:
+        with Llavero(args.llavero) as llavero:
+            servidor = Servidor(llavero, args.procesos, args.umbral or UMBRAL_PROCESOS)
+            asyncio.run(servidor.servir(args.host, args.puerto, args.unix, al_iniciar))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    if args.comando == "traducir":
+        return ejecutar_traduccion(args)
+    if args.comando == "convertir":
+        return ejecutar_conversion(args)
+    if args.comando == "llavero":
+        return ejecutar_llavero(args)
+    if args.comando == "indice":
+        return ejecutar_indice(args)
+    if args.comando == "buscar":
+        return ejecutar_busqueda(args)
+    if args.comando == "historial":
+        return ejecutar_historial(args)
+    if args.comando == "servir":
+        return ejecutar_servidor(args)
+
+    try:
+        clave = cargar_clave_args(args)
+    except KeyError as e:
+        print(f"Error: no existe la clave {e} en el llavero", file=sys.stderr)
+        return 1
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: no se pudo cargar la clave ({e})", file=sys.stderr)
+        return 1
+
+    for problema in clave.problemas:
+        print(f"Aviso: {problema}", file=sys.stderr)
+
+    if args.comando == "lote":
+        return ejecutar_lote(args, clave)
+    return ejecutar_archivo(args, clave)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
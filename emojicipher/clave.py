@@ -0,0 +1,414 @@
+"""
+Claves compiladas de EmojiCipher.
+
+Una clave es un diccionario que asigna a cada carácter un emoji. Antes, cada
+llamada a `codificar`/`decodificar` volvía a calcular todo a partir de ese
+diccionario (clave inversa, orden por longitud, ...). `CompiledKey` hace ese
+trabajo una sola vez, normalmente al generar o cargar la clave, y lo guarda:
+
+- `tabla`: tabla de `str.maketrans` para codificar con `str.translate`.
+- `trie`: árbol de prefijos con los emojis para decodificar en una pasada.
+- `huella`: hash SHA-256 que identifica la clave.
+- `problemas`: lista con los avisos encontrados al validar la clave.
+- `prefijos`: pares de caracteres cuyo emoji es prefijo del emoji de otro.
+  Si no hay ninguno la clave es "libre de prefijos" y se decodifica por una
+  vía rápida (`str.translate` si todos los emojis son de un único punto de
+  código, o una expresión regular y una consulta al diccionario por emoji).
+"""
+
+import hashlib
+import json
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+
+
+# Marca usada en los nodos del trie para guardar el carácter original
+FIN_TRIE = None
+
+
+def construir_trie(clave: dict) -> dict:
+    """Construye un trie (árbol de prefijos) con los emojis de la clave.
+
+    Cada nodo es un diccionario que va de un punto de código al siguiente
+    nodo. Cuando un emoji termina en un nodo, ese nodo guarda en `FIN_TRIE`
+    el carácter original al que corresponde.
+
+    Parámetros:
+        clave (dict): Diccionario que mapea caracteres a emojis.
+
+    Retorna:
+        dict: Nodo raíz del trie.
+    """
+    raiz = {}
+    for caracter, em in clave.items():
+        if not em:
+            continue
+        nodo = raiz
+        for punto in em:
+            nodo = nodo.setdefault(punto, {})
+        # Igual que con la clave inversa, si dos caracteres comparten emoji gana el último
+        nodo[FIN_TRIE] = caracter
+    return raiz
+
+
+def buscar_prefijos(inversa: dict) -> list:
+    """Busca emojis de la clave que son prefijo de otro emoji de la clave.
+
+    Con una clave así la decodificación voraz puede equivocarse: si 'a' es
+    X y 'b' es XY, un texto con 'a' seguido de Y se decodifica como 'b'.
+
+    Al ordenar los emojis, cada uno queda justo detrás de sus prefijos, así
+    que basta con una pila de los prefijos del emoji actual.
+
+    Parámetros:
+        inversa (dict): Diccionario emoji → carácter.
+
+    Retorna:
+        list: Pares (carácter del emoji corto, carácter del emoji largo).
+    """
+    pares = []
+    if all(len(em) == 1 for em in inversa):
+        return pares  # Emojis distintos de un punto de código: ninguno es prefijo de otro
+
+    pila = []  # (emoji, carácter) de los prefijos del emoji actual
+    for em in sorted(inversa):
+        while pila and not em.startswith(pila[-1][0]):
+            pila.pop()
+        caracter = inversa[em]
+        if pila:
+            pares.extend((corto, caracter) for _, corto in pila)
+        pila.append((em, caracter))
+    return pares
+
+
+def analizar_clave(clave: dict) -> tuple:
+    """Valida una clave y construye su trie en una sola pasada.
+
+    Parámetros:
+        clave (dict): Diccionario que mapea caracteres a emojis.
+
+    Retorna:
+        tuple: (problemas, trie, prefijos, compartidos). `problemas` es la
+            lista de avisos, `prefijos` los pares de `buscar_prefijos` y
+            `compartidos` el número de emojis usados por más de un carácter.
+
+    Lanza:
+        ValueError: Si la clave no es un diccionario de cadenas.
+    """
+    if not isinstance(clave, Mapping):
+        raise ValueError("La clave debe ser un diccionario carácter → emoji")
+
+    problemas = []
+    usados = {}
+    compartidos = 0
+    for caracter, em in clave.items():
+        if not isinstance(caracter, str) or not isinstance(em, str):
+            raise ValueError(f"Entrada de clave no válida: {caracter!r} → {em!r}")
+        if len(caracter) != 1:
+            problemas.append(f"'{caracter}' no es un único carácter y nunca se codificará")
+        if not em:
+            problemas.append(f"'{caracter}' no tiene emoji asignado")
+            continue
+        if em in usados:
+            problemas.append(f"'{usados[em]}' y '{caracter}' comparten el emoji {em}")
+            compartidos += 1
+        usados[em] = caracter
+
+    trie = construir_trie(clave)
+    prefijos = buscar_prefijos(usados)
+    for corto, largo in prefijos:
+        problemas.append(f"El emoji de '{corto}' ({clave[corto]}) es prefijo del de "
+                         f"'{largo}' ({clave[largo]}): la decodificación puede ser ambigua")
+    return problemas, trie, prefijos, compartidos
+
+
+def validar_clave(clave: dict) -> list:
+    """Revisa una clave y devuelve los problemas encontrados.
+
+    Los problemas no impiden usar la clave, pero avisan de que el resultado
+    puede no ser el esperado (por ejemplo, dos caracteres con el mismo emoji
+    no se pueden distinguir al decodificar, y si un emoji es prefijo de otro
+    la decodificación puede ser ambigua).
+
+    Parámetros:
+        clave (dict): Diccionario que mapea caracteres a emojis.
+
+    Retorna:
+        list: Lista de mensajes (str); vacía si la clave es correcta.
+
+    Lanza:
+        ValueError: Si la clave no es un diccionario de cadenas.
+    """
+    return analizar_clave(clave)[0]
+
+
+def calcular_huella(clave: dict) -> str:
+    """Calcula una huella (hash SHA-256) que identifica la clave.
+
+    Dos claves con los mismos pares carácter → emoji tienen la misma huella,
+    aunque se hayan guardado en distinto orden.
+
+    Parámetros:
+        clave (dict): Diccionario que mapea caracteres a emojis.
+
+    Retorna:
+        str: Huella en hexadecimal.
+    """
+    canonica = json.dumps(clave, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonica.encode("utf-8")).hexdigest()
+
+
+class CompiledKey(Mapping):
+    """Clave de EmojiCipher compilada una sola vez.
+
+    Se comporta como un diccionario de solo lectura (carácter → emoji), así
+    que puede usarse en cualquier sitio donde antes se usaba la clave en
+    forma de `dict`.
+
+    Atributos:
+        clave (dict): Copia de la clave original.
+        tabla (dict): Tabla de `str.maketrans` para codificar.
+        inversa (dict): Diccionario emoji → carácter.
+        trie (dict): Nodo raíz del trie de decodificación.
+        huella (str): Hash SHA-256 de la clave.
+        problemas (list): Avisos encontrados al validar la clave.
+        prefijos (list): Pares de caracteres cuyo emoji es prefijo de otro.
+        ambigua (bool): Si hay prefijos o emojis compartidos por varios caracteres.
+    """
+
+    def __init__(self, clave: dict):
+        self.problemas, self.trie, self.prefijos, compartidos = analizar_clave(clave)
+        self.clave = dict(clave)
+        self.ambigua = bool(self.prefijos or compartidos)
+        # Solo los caracteres sueltos pueden codificarse, igual que con clave.get(c, c)
+        self.tabla = str.maketrans({c: em for c, em in self.clave.items() if len(c) == 1})
+        self.inversa = {em: c for c, em in self.clave.items() if em}
+        self.huella = calcular_huella(self.clave)
+
+        # Vía rápida de decodificación para claves libres de prefijos
+        self._tabla_inversa = None
+        self._patron_inverso = None
+        self._grafemas = None
+        if self.prefijo_libre and self.inversa:
+            if all(len(em) == 1 for em in self.inversa):
+                self._tabla_inversa = str.maketrans(self.inversa)
+            else:
+                # Sin prefijos, en cada posición encaja como mucho un emoji: el orden da igual
+                self._patron_inverso = re.compile("(" + "|".join(map(re.escape, self.inversa)) + ")")
+
+    @property
+    def es_valida(self) -> bool:
+        """Indica si la clave ha pasado la validación sin problemas."""
+        return not self.problemas
+
+    @property
+    def prefijo_libre(self) -> bool:
+        """Indica si ningún emoji de la clave es prefijo de otro."""
+        return not self.prefijos
+
+    @property
+    def grafemas(self):
+        """Decodificador por grafemas de esta clave (se crea la primera vez)."""
+        if self._grafemas is None:
+            from .grafemas import DecodificadorGrafemas
+
+            self._grafemas = DecodificadorGrafemas(self)
+        return self._grafemas
+
+    # --- Interfaz de diccionario de solo lectura ---
+    def __getitem__(self, caracter):
+        return self.clave[caracter]
+
+    def __iter__(self):
+        return iter(self.clave)
+
+    def __len__(self):
+        return len(self.clave)
+
+    def __repr__(self):
+        return f"CompiledKey({self.clave!r})"
+
+    # --- Codificación y decodificación ---
+    def codificar(self, texto: str) -> str:
+        """Codifica un texto con la tabla de traducción precalculada.
+
+        Parámetros:
+            texto (str): Texto a codificar.
+
+        Retorna:
+            str: Texto codificado.
+        """
+        return texto.translate(self.tabla)
+
+    def decodificar(self, texto: str) -> str:
+        """Decodifica un texto recorriendo el trie de la clave.
+
+        Recorre el texto una sola vez y en cada posición se queda con el emoji
+        más largo que encaja (búsqueda voraz). Si la clave es libre de
+        prefijos se usa la vía rápida, y si no, el decodificador por grafemas
+        (ver `grafemas`); los dos dan el mismo resultado.
+
+        Parámetros:
+            texto (str): Texto codificado con emojis.
+
+        Retorna:
+            str: Texto decodificado.
+        """
+        if self._tabla_inversa is not None:
+            return texto.translate(self._tabla_inversa)
+        if self._patron_inverso is not None:
+            # split() alterna texto sin emojis y emojis; estos se cambian con una consulta cada uno
+            partes = self._patron_inverso.split(texto)
+            partes[1::2] = map(self.inversa.__getitem__, partes[1::2])
+            return "".join(partes)
+        return self.grafemas.decodificar(texto)
+
+    def decodificar_bloque(self, texto: str, final: bool = True) -> tuple:
+        """Decodifica un fragmento de un texto más largo.
+
+        Si `final` es False, el fragmento puede no ser el último: cuando un
+        emoji empieza al final del fragmento y podría continuar en el
+        siguiente (secuencias ZWJ, selectores de variación, tonos de piel...),
+        se deja sin decodificar para que se procese junto al siguiente
+        fragmento.
+
+        Parámetros:
+            texto (str): Fragmento codificado con emojis.
+            final (bool): Indica si es el último fragmento.
+
+        Retorna:
+            tuple: (texto decodificado, número de caracteres consumidos).
+        """
+        if self._tabla_inversa is not None:
+            # Emojis de un solo punto de código: nunca quedan partidos
+            return texto.translate(self._tabla_inversa), len(texto)
+
+        raiz = self.trie
+        partes = []
+        i = 0
+        n = len(texto)
+
+        while i < n:
+            nodo = raiz.get(texto[i])
+            if nodo is None:
+                partes.append(texto[i])
+                i += 1
+                continue
+
+            # Avanzamos por el trie recordando el último emoji completo encontrado
+            coincidencia = None
+            fin = i
+            j = i + 1
+            while True:
+                if FIN_TRIE in nodo:
+                    coincidencia = nodo[FIN_TRIE]
+                    fin = j
+                if j >= n:
+                    break
+                nodo = nodo.get(texto[j])
+                if nodo is None:
+                    break
+                j += 1
+
+            if j >= n and not final and nodo is not None and len(nodo) > (FIN_TRIE in nodo):
+                # El emoji podría seguir en el siguiente fragmento
+                break
+
+            if coincidencia is None:
+                partes.append(texto[i])
+                i += 1
+            else:
+                partes.append(coincidencia)
+                i = fin
+
+        return "".join(partes), i
+
+
+@lru_cache(maxsize=32)
+def _compilar_cacheado(pares: tuple) -> CompiledKey:
+    """Compila una clave a partir de sus pares, reutilizando el resultado.
+
+    Parámetros:
+        pares (tuple): Pares (carácter, emoji) de la clave, en su orden original.
+
+    Retorna:
+        CompiledKey: Clave compilada.
+    """
+    return CompiledKey(dict(pares))
+
+
+def compilar_clave(clave) -> CompiledKey:
+    """Devuelve la versión compilada de una clave.
+
+    Si ya está compilada se devuelve tal cual; si es un diccionario, se
+    compila (y se guarda en caché para las siguientes llamadas con la misma
+    clave).
+
+    Parámetros:
+        clave (dict o CompiledKey): Clave a compilar.
+
+    Retorna:
+        CompiledKey: Clave compilada.
+    """
+    if isinstance(clave, CompiledKey):
+        return clave
+    if not isinstance(clave, Mapping):
+        raise ValueError("La clave debe ser un diccionario carácter → emoji")
+    return _compilar_cacheado(tuple(clave.items()))
+
+
+def aplicar_politica(clave: CompiledKey, ambigua: str = "aceptar") -> CompiledKey:
+    """Decide qué hacer con una clave recién cargada si es ambigua.
+
+    Parámetros:
+        clave (CompiledKey): Clave cargada.
+        ambigua (str): "aceptar" (se usa tal cual, con la búsqueda voraz),
+            "rechazar" o "reparar" (ver `generador.reparar_clave`).
+
+    Retorna:
+        CompiledKey: La misma clave, o la reparada.
+
+    Lanza:
+        ValueError: Si la opción no existe, o si la clave es ambigua y
+            `ambigua` es "rechazar".
+    """
+    if ambigua not in ("aceptar", "rechazar", "reparar"):
+        raise ValueError(f"Opción no válida para claves ambiguas: {ambigua}")
+    if clave.ambigua and ambigua == "rechazar":
+        raise ValueError("La clave es ambigua:\n" + "\n".join(clave.problemas))
+    if clave.ambigua and ambigua == "reparar":
+        from .generador import reparar_clave
+
+        clave = CompiledKey(reparar_clave(clave))
+    return clave
+
+
+def cargar_clave_json(ruta: str, ambigua: str = "aceptar") -> CompiledKey:
+    """Carga una clave guardada en JSON y la compila.
+
+    Parámetros:
+        ruta (str): Ruta del archivo JSON.
+        ambigua (str): Qué hacer si la clave es ambigua (un emoji es prefijo
+            de otro o lo comparten varios caracteres). Ver `aplicar_politica`.
+
+    Retorna:
+        CompiledKey: Clave compilada.
+
+    Lanza:
+        ValueError: Si el archivo no contiene una clave, o si es ambigua y
+            `ambigua` es "rechazar".
+    """
+    with open(ruta, "r", encoding="utf-8") as f:
+        return aplicar_politica(CompiledKey(json.load(f)), ambigua)
+
+
+def guardar_clave_json(clave, ruta: str):
+    """Guarda una clave (dict o CompiledKey) en un archivo JSON.
+
+    Parámetros:
+        clave (dict o CompiledKey): Clave a guardar.
+        ruta (str): Ruta del archivo JSON.
+    """
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(dict(clave), f, ensure_ascii=False, indent=4)
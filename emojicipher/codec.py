@@ -0,0 +1,194 @@
+"""
+EmojiCipher como codec estándar de Python (`codecs`).
+
+Al registrar el codec, cualquier clave del llavero se puede usar como
+codificación de texto con el nombre "emojicipher-<id de la clave>":
+
+    import emojicipher
+    emojicipher.registrar_codec()
+
+    with open("secreto.txt", "w", encoding="emojicipher-cliente42") as f:
+        f.write("hola")            # en el archivo se guardan los emojis en UTF-8
+    with open("secreto.txt", encoding="emojicipher-cliente42") as f:
+        f.read()                   # 'hola'
+
+Codificar convierte el texto claro en emojis y los escribe en UTF-8;
+decodificar lee los bytes UTF-8 de los emojis y devuelve el texto claro.
+`open`, `io.TextIOWrapper`, `str.encode` y `bytes.decode` usan el codec sin
+más código.
+
+`io.TextIOWrapper` lee el archivo por bloques de bytes, que pueden cortar un
+carácter UTF-8 o un emoji de varios puntos de código. `DecodificadorEmoji`
+encadena el decodificador incremental de UTF-8 (que guarda los bytes de un
+carácter a medias) con `DecodificadorIncremental` (que guarda el emoji que
+podría continuar en el bloque siguiente), así que el resultado es el mismo
+que decodificando el archivo entero.
+
+Python normaliza el nombre de la codificación (minúsculas, y '-' y espacios
+pasan a '_'), así que el identificador se busca primero tal cual y después
+comparándolo normalizado con los del llavero. Python guarda el codec en caché
+la primera vez que se usa: si después se borra la clave del llavero, el
+codec sigue funcionando hasta que termine el programa.
+"""
+
+import codecs
+import os
+
+from .clave import CompiledKey
+from .flujo import DecodificadorIncremental
+from .llavero import Llavero, ruta_llavero
+
+
+# Prefijo de los nombres de codificación (ya normalizado por `codecs`)
+PREFIJO = "emojicipher_"
+
+# Llaveros en los que se buscan las claves (None: el llavero por defecto)
+_llaveros = []
+
+# Llavero por defecto, abierto la primera vez que hace falta
+_llavero_defecto = None
+
+
+def _normalizar(nombre: str) -> str:
+    """Normaliza un nombre de codificación igual que `codecs.lookup`."""
+    return nombre.lower().replace("-", "_").replace(" ", "_")
+
+
+# ================================================================
+# ---------------------- Clases del codec ------------------------
+# ================================================================
+
+class CodificadorEmoji(codecs.IncrementalEncoder):
+    """Codificador incremental: texto claro → emojis en UTF-8.
+
+    Cada carácter se codifica por separado, así que no guarda estado.
+    """
+
+    clave: CompiledKey = None
+
+    def encode(self, texto: str, final: bool = False) -> bytes:
+        return self.clave.codificar(texto).encode("utf-8", self.errors)
+
+
+class DecodificadorEmoji(codecs.IncrementalDecoder):
+    """Decodificador incremental: emojis en UTF-8 → texto claro.
+
+    Guarda entre llamadas los bytes de un carácter UTF-8 incompleto y el
+    final del texto que aún puede ser el principio de un emoji.
+    """
+
+    clave: CompiledKey = None
+
+    def __init__(self, errors: str = "strict"):
+        super().__init__(errors)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors)
+        self._emojis = DecodificadorIncremental(self.clave)
+
+    def decode(self, datos, final: bool = False) -> str:
+        return self._emojis.decodificar(self._utf8.decode(datos, final), final)
+
+    def reset(self):
+        self._utf8.reset()
+        self._emojis.reiniciar()
+
+    def getstate(self) -> tuple:
+        # Lo pendiente se devuelve como bytes: volver a decodificarlos deja
+        # el decodificador igual (lo usa TextIOWrapper.tell)
+        bytes_utf8, _ = self._utf8.getstate()
+        return self._emojis.pendiente.encode("utf-8", "surrogatepass") + bytes_utf8, 0
+
+    def setstate(self, estado: tuple):
+        self.reset()
+        self.decode(estado[0])
+
+
+def crear_codec(clave: CompiledKey, nombre: str) -> codecs.CodecInfo:
+    """
+    Crea la información de codec de una clave.
+
+    Parámetros:
+        clave (CompiledKey): Clave compilada.
+        nombre (str): Nombre de la codificación.
+
+    Retorna:
+        codecs.CodecInfo: Codec con codificador y decodificador incrementales.
+    """
+
+    def codificar(texto: str, errors: str = "strict") -> tuple:
+        return clave.codificar(texto).encode("utf-8", errors), len(texto)
+
+    def decodificar(datos, errors: str = "strict") -> tuple:
+        return clave.decodificar(bytes(datos).decode("utf-8", errors)), len(datos)
+
+    atributos = {"clave": clave}
+    return codecs.CodecInfo(
+        name=nombre,
+        encode=codificar,
+        decode=decodificar,
+        incrementalencoder=type("CodificadorEmoji", (CodificadorEmoji,), atributos),
+        incrementaldecoder=type("DecodificadorEmoji", (DecodificadorEmoji,), atributos),
+    )
+
+
+# ================================================================
+# -------------------------- Registro ----------------------------
+# ================================================================
+
+def _buscar_clave(llavero: Llavero, id_clave: str) -> CompiledKey:
+    """Clave del llavero con ese identificador normalizado (o None)."""
+    try:
+        return llavero.obtener(id_clave)
+    except KeyError:
+        pass
+    for id_guardado, _, _ in llavero.listar():
+        if _normalizar(id_guardado) == id_clave:
+            return llavero.obtener(id_guardado)
+    return None
+
+
+def buscar_codec(nombre: str) -> codecs.CodecInfo:
+    """Función de búsqueda para `codecs.register`.
+
+    Parámetros:
+        nombre (str): Nombre de la codificación, ya normalizado.
+
+    Retorna:
+        codecs.CodecInfo: Codec de la clave, o None si el nombre no es de
+        EmojiCipher o la clave no está en ningún llavero registrado.
+    """
+    global _llavero_defecto
+    nombre = _normalizar(nombre)
+    if not nombre.startswith(PREFIJO) or len(nombre) == len(PREFIJO):
+        return None
+    id_clave = nombre[len(PREFIJO):]
+
+    for llavero in _llaveros:
+        if llavero is None:
+            if _llavero_defecto is None:
+                if not os.path.exists(ruta_llavero()):
+                    continue  # no crear el llavero por defecto solo para buscar
+                _llavero_defecto = Llavero()
+            llavero = _llavero_defecto
+        clave = _buscar_clave(llavero, id_clave)
+        if clave is not None:
+            return crear_codec(clave, f"emojicipher-{id_clave}")
+    return None
+
+
+def registrar(llavero: Llavero = None):
+    """
+    Registra el codec para las claves de un llavero.
+
+    Se puede llamar varias veces con llaveros distintos; las claves se buscan
+    en el orden en que se registraron. Importar el paquete no registra nada:
+    hay que llamarla (o `emojicipher.registrar_codec()`) antes de usar el codec.
+
+    Parámetros:
+        llavero (Llavero): Llavero donde buscar las claves (por defecto, el
+            de `ruta_llavero()`, que se abre la primera vez que se usa).
+    """
+    if any(registrado is llavero for registrado in _llaveros):
+        return
+    if not _llaveros:
+        codecs.register(buscar_codec)
+    _llaveros.append(llavero)
@@ -0,0 +1,209 @@
+"""
+Núcleo de EmojiCipher sin interfaz gráfica.
+
+Reúne la lógica que antes vivía dentro de S12/Codigo.py y de
+S13 (Práctica final)/EmojiCipherActualizado.py: generación de claves,
+codificación/decodificación, traducción emoji ↔ palabra e historial.
+
+Este módulo no importa tkinter ni muestra ventanas: los errores se devuelven
+(mensajes de error) o se lanzan como excepciones, y es la interfaz gráfica la
+que decide cómo mostrarlos. La librería `emoji` solo se importa cuando hace
+falta, para que importar el núcleo sea rápido.
+"""
+
+import unicodedata
+
+from . import generador
+from .clave import CompiledKey, compilar_clave
+from .generador import CARACTERES
+from .traduccion import traducir, traducir_documento
+
+
+# ==================================================================
+# ---------------------- Funciones auxiliares ----------------------
+# ==================================================================
+
+def normalize_text(s: str) -> str:
+    """
+    Limpia un texto eliminando acentos y convirtiéndolo a minúsculas.
+
+    Parámetros:
+        s (str): Texto de entrada que se desea normalizar.
+
+    Retorna:
+        str: Texto normalizado sin acentos, en minúsculas y sin espacios externos.
+    """
+    s = s.strip().lower()
+    nfkd = unicodedata.normalize('NFD', s)
+    return "".join(ch for ch in nfkd if not unicodedata.combining(ch))
+
+
+def formato_clave_legible(clave) -> str:
+    """
+    Convierte una clave de codificación en un texto legible para mostrar.
+
+    Parámetros:
+        clave (dict o CompiledKey): Caracteres y sus emojis correspondientes.
+
+    Retorna:
+        str: Texto formateado mostrando cada par de carácter → emoji.
+    """
+    lineas = [f"{k} → {v}" for k, v in clave.items()]
+    return "Clave actual:\n\n" + "\n".join(lineas) + ("\n" if lineas else "")
+
+
+# ==================================================================
+# ---------------------- Traducción emoji --------------------------
+# ==================================================================
+
+def emoji_translate(text: str) -> str:
+    """
+    Traduce palabra → emoji o emoji → palabra.
+    Maneja errores en caso de textos no reconocidos.
+
+    Usa el índice precalculado de `emojicipher.traduccion`, así que cada
+    consulta es un acceso a diccionario en lugar de recorrer la base de datos
+    de emojis.
+
+    Parámetros:
+        text (str): Texto o emoji a traducir.
+
+    Retorna:
+        str: Emoji correspondiente o palabra; si no se reconoce, devuelve un mensaje de error.
+    """
+    try:
+        return traducir(text)
+    except Exception:
+        return "Error al traducir"
+
+
+def traducir_texto(texto: str) -> str:
+    """
+    Traduce una sola palabra/emoji o un texto completo.
+
+    Si el texto es un único token se comporta como `emoji_translate`. Si
+    tiene varias palabras, se traduce el documento entero en una pasada
+    (palabras → emoji, emojis → nombre, el resto se deja igual).
+
+    Parámetros:
+        texto (str): Texto a traducir.
+
+    Retorna:
+        str: Texto traducido; si ocurre un error, devuelve un mensaje de error.
+    """
+    if len(texto.split()) <= 1:
+        return emoji_translate(texto)
+    try:
+        return "".join(traducir_documento(texto))
+    except Exception:
+        return "Error al traducir"
+
+
+# ==================================================================
+# ---------------------- Generar clave -----------------------------
+# ==================================================================
+
+def generar_clave() -> dict:
+    """Genera una clave aleatoria asignando un emoji a cada carácter.
+
+    Los emojis se eligen con `secrets` de un alfabeto filtrado que se calcula
+    una sola vez (ver `emojicipher.generador`).
+
+    Retorna:
+        dict: Diccionario con caracteres como claves y emojis como valores.
+
+    Lanza:
+        Exception: Si no se puede generar la clave (por ejemplo, si falta la
+            librería `emoji`). La interfaz gráfica se encarga de avisar.
+    """
+    return generador.generar_clave(CARACTERES)
+
+
+# ================================================================
+# ----------------------------- Código ---------------------------
+# ================================================================
+
+def codificar(texto: str, clave, motor: str = "tabla") -> str:
+    """Codifica un texto usando la clave actual.
+
+    Por defecto usa la tabla de `str.maketrans` de la clave compilada, de modo
+    que la sustitución se hace en C con `str.translate`. El motor "generador"
+    conserva la versión anterior (un `clave.get` por carácter) para poder
+    compararlas.
+
+    Parámetros:
+        texto (str): Texto a codificar.
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+        motor (str): "tabla" (por defecto) o "generador".
+
+    Retorna:
+        str: Texto codificado; si ocurre un error, devuelve un mensaje de error.
+    """
+    try:
+        if motor == "generador":
+            return "".join(clave.get(c, c) for c in texto)
+        return compilar_clave(clave).codificar(texto)
+    except Exception:
+        return "Error al codificar"
+
+
+def decodificar(texto: str, clave) -> str:
+    """Decodifica texto en emojis usando el trie de la clave compilada.
+
+    Recorre el texto una sola vez y en cada posición se queda con el emoji más
+    largo que encaja (búsqueda voraz). Si se pasa un diccionario, la clave se
+    compila una única vez y se reutiliza en las siguientes llamadas.
+
+    Parámetros:
+        texto (str): Texto codificado con emojis.
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+
+    Retorna:
+        str: Texto decodificado; si ocurre un error, devuelve un mensaje de error.
+    """
+    try:
+        return compilar_clave(clave).decodificar(texto)
+    except Exception:
+        return "Error al decodificar"
+
+
+# =========================================================
+# ---------------------- Historial ------------------------
+# =========================================================
+
+def formatear_registro(registro: dict, numero: int = None) -> str:
+    """
+    Convierte un registro del historial en un bloque de texto legible.
+
+    Parámetros:
+        registro (dict): Registro con 'fecha', 'tipo', 'original' y 'resultado'.
+        numero (int): Posición del registro; si se indica, se añade "#n" delante.
+
+    Retorna:
+        str: Bloque de texto terminado en una línea separadora.
+    """
+    cabecera = f"#{numero}\n" if numero is not None else ""
+    return (
+        f"{cabecera}"
+        f"Fecha: {registro['fecha']}\n"
+        f"Tipo: {registro['tipo']}\n"
+        f"Original: {_texto_registro(registro, 'original')}\n"
+        f"Resultado: {_texto_registro(registro, 'resultado')}\n"
+        f"{'-'*50}\n"
+    )
+
+
+def _texto_registro(registro: dict, campo: str) -> str:
+    """Texto de un campo del registro, indicando si está recortado."""
+    texto = registro[campo]
+    if f"{campo}_longitud" in registro:
+        texto += (f" [recortado: {registro[f'{campo}_longitud']} caracteres, "
+                  f"sha256 {registro[f'{campo}_sha256'][:16]}]")
+    return texto
+
+
+__all__ = [
+    "CARACTERES", "CompiledKey", "codificar", "compilar_clave",
+    "decodificar", "emoji_translate", "formatear_registro", "formato_clave_legible",
+    "generar_clave", "normalize_text", "traducir_texto",
+]
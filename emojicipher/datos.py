@@ -0,0 +1,17 @@
+"""
+Carpeta de datos del usuario, común al llavero y al historial.
+
+Está en un módulo aparte para que el historial (JSON Lines) no tenga que
+importar el llavero, y con él sqlite3, solo para saber dónde guardarse.
+"""
+
+import os
+
+
+def carpeta_datos() -> str:
+    """Devuelve la carpeta donde se guardan el llavero y el historial por defecto.
+
+    Se puede cambiar con la variable de entorno EMOJICIPHER_DATOS.
+    """
+    por_defecto = os.path.join(os.path.expanduser("~"), ".local", "share", "emojicipher")
+    return os.environ.get("EMOJICIPHER_DATOS", por_defecto)
@@ -0,0 +1,213 @@
+"""
+Codificación y decodificación de archivos por bloques.
+
+Permite cifrar o descifrar archivos de cualquier tamaño (por ejemplo, logs de
+varios GB) sin cargarlos enteros en memoria: se leen bloques de tamaño fijo,
+se procesan y se escriben al momento.
+
+Al decodificar, un emoji de varios puntos de código (secuencias ZWJ,
+selectores de variación, tonos de piel...) puede quedar partido entre dos
+bloques. `DecodificadorIncremental` guarda ese trozo pendiente y lo completa
+con el bloque siguiente.
+"""
+
+import os
+import sys
+
+from .clave import compilar_clave
+
+
+# Tamaño de bloque por defecto, en caracteres
+TAMANO_BLOQUE = 1024 * 1024
+
+
+class CodificadorIncremental:
+    """Codifica un texto que llega por fragmentos.
+
+    Atributos:
+        clave (CompiledKey): Clave compilada usada para codificar.
+    """
+
+    def __init__(self, clave):
+        self.clave = compilar_clave(clave)
+
+    def codificar(self, texto: str, final: bool = False) -> str:
+        """Codifica un fragmento (cada carácter es independiente del resto)."""
+        return self.clave.codificar(texto)
+
+    def reiniciar(self):
+        """No guarda estado, así que no hay nada que reiniciar."""
+
+
+class DecodificadorIncremental:
+    """Decodifica un texto que llega por fragmentos.
+
+    Atributos:
+        clave (CompiledKey): Clave compilada usada para decodificar.
+        pendiente (str): Final del último fragmento que aún no se ha podido
+            decodificar porque el emoji podría continuar en el siguiente.
+    """
+
+    def __init__(self, clave):
+        self.clave = compilar_clave(clave)
+        self.pendiente = ""
+
+    def decodificar(self, texto: str, final: bool = False) -> str:
+        """Decodifica un fragmento teniendo en cuenta lo que quedó pendiente.
+
+        Parámetros:
+            texto (str): Nuevo fragmento de texto codificado.
+            final (bool): Indica si es el último fragmento.
+
+        Retorna:
+            str: Parte del texto que ya se ha podido decodificar.
+        """
+        texto = self.pendiente + texto
+        resultado, consumido = self.clave.decodificar_bloque(texto, final)
+        self.pendiente = texto[consumido:]
+        return resultado
+
+    def reiniciar(self):
+        """Descarta el fragmento pendiente."""
+        self.pendiente = ""
+
+
+def abrir_texto(ruta: str, modo: str):
+    """Abre un archivo de texto UTF-8 (o la entrada/salida estándar si es '-')."""
+    if ruta == "-":
+        flujo = sys.stdin if "r" in modo else sys.stdout
+        return open(flujo.fileno(), modo, encoding="utf-8", newline="", closefd=False)
+    return open(ruta, modo, encoding="utf-8", newline="")
+
+
+def comprobar_destino(origen: str, destino: str):
+    """Comprueba que el archivo de salida no es el mismo que el de entrada.
+
+    Abrir la salida para escribir vacía el archivo antes de leerlo, así que
+    procesar un archivo sobre sí mismo lo dejaría vacío.
+
+    Lanza:
+        ValueError: Si las dos rutas son el mismo archivo.
+    """
+    if origen == "-" or destino == "-" or not os.path.exists(destino):
+        return
+    if os.path.samefile(origen, destino):
+        raise ValueError(f"La salida no puede ser el propio archivo de entrada ({destino})")
+
+
+def procesar_archivo(origen: str, destino: str, procesador, tamano_bloque: int = TAMANO_BLOQUE) -> int:
+    """Aplica un codificador o decodificador incremental a un archivo completo.
+
+    Si falla a mitad, se borra el archivo de salida.
+
+    Parámetros:
+        origen (str): Ruta del archivo de entrada ('-' para la entrada estándar).
+        destino (str): Ruta del archivo de salida ('-' para la salida estándar).
+        procesador (callable): Función (texto, final) → texto.
+        tamano_bloque (int): Número de caracteres leídos en cada bloque.
+
+    Retorna:
+        int: Número de caracteres leídos.
+
+    Lanza:
+        ValueError: Si la salida es el propio archivo de entrada.
+    """
+    comprobar_destino(origen, destino)
+    leidos = 0
+    with abrir_texto(origen, "r") as entrada:
+        try:
+            with abrir_texto(destino, "w") as salida:
+                while True:
+                    bloque = entrada.read(tamano_bloque)
+                    if not bloque:
+                        break
+                    leidos += len(bloque)
+                    salida.write(procesador(bloque, False))
+                salida.write(procesador("", True))
+        except BaseException:
+            # No dejar un archivo a medias (por ejemplo, si la entrada no es UTF-8)
+            if destino != "-" and os.path.exists(destino):
+                os.remove(destino)
+            raise
+    return leidos
+
+
+def procesar_texto(texto: str, procesador, tamano_bloque: int = TAMANO_BLOQUE, progreso=None) -> str:
+    """Aplica un codificador o decodificador incremental a un texto en memoria.
+
+    Se procesa por bloques para poder informar del avance (y cancelar desde
+    `progreso`) cuando el texto es muy largo.
+
+    Parámetros:
+        texto (str): Texto completo.
+        procesador (callable): Función (texto, final) → texto.
+        tamano_bloque (int): Número de caracteres de cada bloque.
+        progreso (callable): Se llama con (caracteres procesados, total) tras cada bloque.
+
+    Retorna:
+        str: Texto procesado.
+    """
+    partes = []
+    for inicio in range(0, len(texto), tamano_bloque):
+        partes.append(procesador(texto[inicio:inicio + tamano_bloque], False))
+        if progreso:
+            progreso(min(len(texto), inicio + tamano_bloque), len(texto))
+    partes.append(procesador("", True))
+    return "".join(partes)
+
+
+def guardar_texto(texto: str, ruta: str, tamano_bloque: int = TAMANO_BLOQUE, progreso=None) -> int:
+    """Escribe un texto en un archivo UTF-8 por bloques.
+
+    Parámetros:
+        texto (str): Texto que se guarda.
+        ruta (str): Ruta del archivo ('-' para la salida estándar).
+        tamano_bloque (int): Número de caracteres de cada bloque.
+        progreso (callable): Se llama con (caracteres escritos, total) tras cada
+            bloque. Si lanza una excepción, se borra el archivo a medias.
+
+    Retorna:
+        int: Número de caracteres escritos.
+    """
+    try:
+        with abrir_texto(ruta, "w") as salida:
+            for inicio in range(0, len(texto), tamano_bloque):
+                salida.write(texto[inicio:inicio + tamano_bloque])
+                if progreso:
+                    progreso(min(len(texto), inicio + tamano_bloque), len(texto))
+    except BaseException:
+        # No dejar un archivo a medias (por ejemplo, si se cancela)
+        if ruta != "-" and os.path.exists(ruta):
+            os.remove(ruta)
+        raise
+    return len(texto)
+
+
+def codificar_archivo(origen: str, destino: str, clave, tamano_bloque: int = TAMANO_BLOQUE) -> int:
+    """Codifica un archivo por bloques, con memoria constante.
+
+    Parámetros:
+        origen (str): Ruta del archivo de texto original.
+        destino (str): Ruta del archivo codificado que se va a crear.
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+        tamano_bloque (int): Número de caracteres leídos en cada bloque.
+
+    Retorna:
+        int: Número de caracteres leídos.
+    """
+    return procesar_archivo(origen, destino, CodificadorIncremental(clave).codificar, tamano_bloque)
+
+
+def decodificar_archivo(origen: str, destino: str, clave, tamano_bloque: int = TAMANO_BLOQUE) -> int:
+    """Decodifica un archivo por bloques, con memoria constante.
+
+    Parámetros:
+        origen (str): Ruta del archivo codificado con emojis.
+        destino (str): Ruta del archivo decodificado que se va a crear.
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+        tamano_bloque (int): Número de caracteres leídos en cada bloque.
+
+    Retorna:
+        int: Número de caracteres leídos.
+    """
+    return procesar_archivo(origen, destino, DecodificadorIncremental(clave).decodificar, tamano_bloque)
@@ -0,0 +1,158 @@
+"""
+Formato binario compacto para guardar claves.
+
+Las claves se guardaban solo en JSON con `indent=4`: ocupan bastante y para
+cargarlas hay que analizar el JSON. El formato binario (extensión ".emk") se
+lee con una sola lectura y se convierte con `struct` y un `decode`:
+
+    cabecera    MAGIA, versión, nº de pares, ancho de los caracteres,
+                ancho de los emojis, CRC-32 del resto del archivo
+    longitudes  dos bytes por par: puntos de código del carácter y del emoji
+    caracteres  tabla de ancho fijo con los puntos de código de cada carácter
+    emojis      tabla de ancho fijo con los puntos de código de cada emoji
+
+Las tablas guardan cada punto de código en 4 bytes (UTF-32 little-endian),
+rellenando con ceros hasta el ancho de la tabla, así que cada tabla se
+convierte en texto con una única llamada a `bytes.decode`.
+
+El JSON se sigue pudiendo importar y exportar: `cargar_clave` reconoce el
+formato por su contenido y `guardar_clave` por la extensión del archivo.
+"""
+
+import struct
+import zlib
+
+from .clave import CompiledKey, aplicar_politica, cargar_clave_json, guardar_clave_json
+
+
+# Identificación y versión del formato
+MAGIA = b"EMJK"
+VERSION_CLAVE = 1
+EXTENSION_BINARIA = ".emk"
+
+_CABECERA = struct.Struct("<4sHHBBHI")
+
+
+def clave_a_bytes(clave) -> bytes:
+    """Convierte una clave (dict o CompiledKey) al formato binario.
+
+    Lanza:
+        ValueError: Si la clave tiene más de 65.535 pares o un carácter o un
+            emoji tiene más de 255 puntos de código.
+    """
+    pares = list(clave.items())
+    if len(pares) > 0xFFFF:
+        raise ValueError("La clave tiene demasiados pares para el formato binario (máximo 65535)")
+    ancho_caracter = max((len(c) for c, _ in pares), default=0)
+    ancho_emoji = max((len(em) for _, em in pares), default=0)
+    if ancho_caracter > 255 or ancho_emoji > 255:
+        raise ValueError("La clave tiene entradas demasiado largas para el formato binario")
+
+    longitudes = bytes(n for c, em in pares for n in (len(c), len(em)))
+    caracteres = "".join(c.ljust(ancho_caracter, "\0") for c, _ in pares)
+    emojis = "".join(em.ljust(ancho_emoji, "\0") for _, em in pares)
+    cuerpo = longitudes + caracteres.encode("utf-32-le") + emojis.encode("utf-32-le")
+
+    cabecera = _CABECERA.pack(MAGIA, VERSION_CLAVE, len(pares), ancho_caracter, ancho_emoji,
+                              0, zlib.crc32(cuerpo))
+    return cabecera + cuerpo
+
+
+def clave_de_bytes(datos: bytes) -> dict:
+    """Lee una clave en formato binario.
+
+    Retorna:
+        dict: Diccionario carácter → emoji, en el orden en que se guardó.
+
+    Lanza:
+        ValueError: Si los datos no son una clave válida o están dañados.
+    """
+    if len(datos) < _CABECERA.size:
+        raise ValueError("Archivo de clave demasiado corto")
+    magia, version, n, ancho_caracter, ancho_emoji, _, crc = _CABECERA.unpack_from(datos)
+    if magia != MAGIA:
+        raise ValueError("No es un archivo de clave de EmojiCipher")
+    if version != VERSION_CLAVE:
+        raise ValueError(f"Versión de clave no compatible: {version}")
+
+    cuerpo = memoryview(datos)[_CABECERA.size:]
+    if len(cuerpo) != n * (2 + 4 * (ancho_caracter + ancho_emoji)):
+        raise ValueError("Archivo de clave incompleto")
+    if zlib.crc32(cuerpo) != crc:
+        raise ValueError("Archivo de clave dañado (la suma de control no coincide)")
+
+    longitudes = cuerpo[:2 * n]
+    inicio_emojis = 2 * n + 4 * n * ancho_caracter
+    caracteres = bytes(cuerpo[2 * n:inicio_emojis]).decode("utf-32-le")
+    emojis = bytes(cuerpo[inicio_emojis:]).decode("utf-32-le")
+
+    if longitudes == bytes((ancho_caracter, ancho_emoji)) * n:
+        # Todas las entradas ocupan el ancho completo (lo normal en claves generadas)
+        return dict(zip(_trocear(caracteres, ancho_caracter, n), _trocear(emojis, ancho_emoji, n)))
+
+    clave = {}
+    for i in range(n):
+        c = i * ancho_caracter
+        e = i * ancho_emoji
+        clave[caracteres[c:c + longitudes[2 * i]]] = emojis[e:e + longitudes[2 * i + 1]]
+    return clave
+
+
+def _trocear(texto: str, ancho: int, n: int):
+    """Divide `texto` en `n` trozos de `ancho` caracteres."""
+    if ancho == 0:
+        return [""] * n
+    if ancho == 1:
+        return texto
+    return [texto[i:i + ancho] for i in range(0, n * ancho, ancho)]
+
+
+def cargar_clave_binaria(ruta: str, ambigua: str = "aceptar") -> CompiledKey:
+    """Carga una clave guardada en formato binario y la compila.
+
+    Parámetros:
+        ruta (str): Ruta del archivo.
+        ambigua (str): Qué hacer si la clave es ambigua (ver `clave.aplicar_politica`).
+
+    Retorna:
+        CompiledKey: Clave compilada.
+    """
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    return aplicar_politica(CompiledKey(clave_de_bytes(datos)), ambigua)
+
+
+def guardar_clave_binaria(clave, ruta: str):
+    """Guarda una clave (dict o CompiledKey) en formato binario."""
+    datos = clave_a_bytes(clave)  # antes de abrir: si no cabe, no se vacía el archivo
+    with open(ruta, "wb") as f:
+        f.write(datos)
+
+
+def es_clave_binaria(ruta: str) -> bool:
+    """Indica si el archivo empieza como una clave en formato binario."""
+    with open(ruta, "rb") as f:
+        return f.read(len(MAGIA)) == MAGIA
+
+
+def cargar_clave(ruta: str, ambigua: str = "aceptar") -> CompiledKey:
+    """Carga una clave en formato binario o JSON (se reconoce por el contenido).
+
+    Parámetros:
+        ruta (str): Ruta del archivo.
+        ambigua (str): Qué hacer si la clave es ambigua (ver `clave.aplicar_politica`).
+
+    Retorna:
+        CompiledKey: Clave compilada.
+    """
+    if es_clave_binaria(ruta):
+        return cargar_clave_binaria(ruta, ambigua)
+    return cargar_clave_json(ruta, ambigua)
+
+
+def guardar_clave(clave, ruta: str):
+    """Guarda una clave en JSON si la ruta acaba en ".json" y en binario si no."""
+    if ruta.lower().endswith(".json"):
+        guardar_clave_json(clave, ruta)
+    else:
+        guardar_clave_binaria(clave, ruta)
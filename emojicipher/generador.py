@@ -0,0 +1,168 @@
+"""
+Generación de claves aleatorias con un alfabeto de emojis precalculado.
+
+Antes, cada clave nueva convertía `emoji.EMOJI_DATA` en una lista (miles de
+emojis), la barajaba entera dos veces con `random` y se quedaba con 67. Ahora:
+
+- El alfabeto se filtra una sola vez y se guarda en memoria: solo emojis de
+  un único punto de código, "fully_qualified" (se dibujan como emoji sin
+  necesidad de selector de variación) y que no son componentes (tonos de
+  piel, pelo...). Al ser de un solo punto de código, ningún emoji de la clave
+  puede ser prefijo de otro.
+- Se eligen los emojis con `secrets` (generador criptográficamente seguro) y
+  sin repetición, tomando solo los k que hacen falta.
+- `generar_claves` crea muchas claves de golpe (rotación de claves por
+  sesión) leyendo los bytes aleatorios en bloque.
+- `reparar_clave` cambia los emojis que hacen ambigua una clave cargada
+  (prefijos de otro emoji o compartidos) por emojis nuevos del alfabeto.
+"""
+
+import secrets
+from functools import lru_cache
+
+from .clave import FIN_TRIE
+
+
+# Caracteres que se pueden codificar con una clave generada
+CARACTERES = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ,.!?-"
+
+# Claves generadas con cada lectura de bytes aleatorios en `generar_claves`
+CLAVES_POR_BLOQUE = 256
+
+_azar = secrets.SystemRandom()
+
+
+@lru_cache(maxsize=1)
+def alfabeto_emojis() -> tuple:
+    """Devuelve los emojis que se usan para generar claves.
+
+    Se calcula la primera vez que se llama (importando la librería `emoji`)
+    y después se reutiliza.
+
+    Retorna:
+        tuple: Emojis de un único punto de código, ordenados.
+    """
+    import emoji
+
+    cualificado = emoji.STATUS["fully_qualified"]
+    return tuple(sorted(em for em, datos in emoji.EMOJI_DATA.items()
+                        if len(em) == 1 and datos["status"] == cualificado))
+
+
+def _comprobar_tamano(caracteres: str, alfabeto: tuple):
+    if len(set(caracteres)) != len(caracteres):
+        raise ValueError("Los caracteres de la clave no pueden repetirse")
+    if len(caracteres) > len(alfabeto):
+        raise ValueError("No hay suficientes emojis para mapear todos los caracteres")
+
+
+def generar_clave(caracteres: str = CARACTERES) -> dict:
+    """Genera una clave aleatoria asignando un emoji distinto a cada carácter.
+
+    Parámetros:
+        caracteres (str): Caracteres que tendrá la clave.
+
+    Retorna:
+        dict: Diccionario con caracteres como claves y emojis como valores.
+
+    Lanza:
+        ValueError: Si hay más caracteres que emojis disponibles.
+    """
+    alfabeto = alfabeto_emojis()
+    _comprobar_tamano(caracteres, alfabeto)
+    # sample() elige k elementos sin repetición sin copiar ni barajar el alfabeto
+    return dict(zip(caracteres, _azar.sample(alfabeto, len(caracteres))))
+
+
+def generar_claves(cantidad: int, caracteres: str = CARACTERES):
+    """Genera muchas claves aleatorias seguidas.
+
+    Lee los bytes aleatorios de `secrets` en bloques grandes en lugar de
+    pedirlos emoji a emoji. Cada índice sale de 2 bytes; los valores que
+    producirían sesgo (los últimos del rango, que no llenan una vuelta
+    completa del alfabeto) se descartan.
+
+    Parámetros:
+        cantidad (int): Número de claves.
+        caracteres (str): Caracteres que tendrá cada clave.
+
+    Retorna:
+        generator: Diccionarios carácter → emoji.
+    """
+    alfabeto = alfabeto_emojis()
+    _comprobar_tamano(caracteres, alfabeto)
+    n = len(alfabeto)
+    k = len(caracteres)
+    limite = 65536 - 65536 % n
+
+    # Se piden bytes de sobra para los valores descartados (sesgo y repetidos)
+    bytes_por_bloque = 2 * k * CLAVES_POR_BLOQUE * 2
+    datos = memoryview(b"")
+    posicion = 0
+
+    for _ in range(cantidad):
+        elegidos = {}
+        while len(elegidos) < k:
+            if posicion >= len(datos):
+                datos = memoryview(secrets.token_bytes(bytes_por_bloque)).cast("H")
+                posicion = 0
+            valor = datos[posicion]
+            posicion += 1
+            if valor < limite:
+                # dict conserva el orden en que salen, que es el de los caracteres
+                elegidos.setdefault(alfabeto[valor % n], None)
+        yield dict(zip(caracteres, elegidos))
+
+
+def reparar_clave(clave) -> dict:
+    """Quita las ambigüedades de una clave cambiando los emojis problemáticos.
+
+    Se recorren los caracteres en orden: cada uno conserva su emoji salvo
+    que choque con uno ya conservado (igual, prefijo de él o con él como
+    prefijo), o que esté vacío. Esos caracteres reciben un emoji nuevo del
+    alfabeto que no choque con ninguno. El resultado es libre de prefijos.
+
+    Parámetros:
+        clave (dict o CompiledKey): Clave a reparar.
+
+    Retorna:
+        dict: Clave reparada, con los caracteres en el mismo orden.
+
+    Lanza:
+        ValueError: Si no quedan suficientes emojis libres en el alfabeto.
+    """
+    trie = {}
+
+    def choca(em: str) -> bool:
+        nodo = trie
+        for punto in em:
+            if FIN_TRIE in nodo:
+                return True  # Un emoji conservado es prefijo de este
+            nodo = nodo.get(punto)
+            if nodo is None:
+                return False
+        return True  # Este emoji es igual a uno conservado o prefijo de él
+
+    def conservar(caracter: str, em: str):
+        nodo = trie
+        for punto in em:
+            nodo = nodo.setdefault(punto, {})
+        nodo[FIN_TRIE] = caracter
+
+    reparada = {}
+    pendientes = []
+    for caracter, em in clave.items():
+        if em and not choca(em):
+            conservar(caracter, em)
+            reparada[caracter] = em
+        else:
+            pendientes.append(caracter)
+
+    if pendientes:
+        libres = [em for em in alfabeto_emojis() if not choca(em)]
+        if len(libres) < len(pendientes):
+            raise ValueError("No hay suficientes emojis libres para reparar la clave")
+        # Los emojis del alfabeto son de un solo punto de código: no chocan entre sí
+        reparada.update(zip(pendientes, _azar.sample(libres, len(pendientes))))
+
+    return {caracter: reparada[caracter] for caracter in clave}
@@ -0,0 +1,169 @@
+"""
+Decodificación por grafemas para claves ambiguas.
+
+Con una clave libre de prefijos `CompiledKey` ya decodifica en C
+(`str.translate` o una expresión regular). Con una clave ambigua (por ejemplo
+"👍" y "👍🏻" a la vez, algo habitual en las claves de S10 y S11, que usaban
+todos los emojis de la librería) había que recorrer el trie carácter a
+carácter en Python.
+
+`DecodificadorGrafemas` parte el texto en grafemas (lo que se ve como un
+solo símbolo: un emoji con su tono de piel, una secuencia ZWJ, una
+bandera...) con una sola llamada a una expresión regular precompilada y
+traduce cada grafema con una consulta a un diccionario. El resultado es
+siempre el mismo que el de la búsqueda voraz del trie (la de S12):
+
+- La búsqueda voraz solo puede pasar de un grafema al siguiente si los dos
+  caracteres que rodean la frontera aparecen seguidos dentro de algún emoji
+  de la clave (un "👍" seguido de "🏻" ya forma un solo grafema, así que "👍"
+  y "👍🏻" nunca se cruzan). Si no ocurre en ninguna frontera, cada grafema
+  se traduce por separado con `decodificar_bloque` y la traducción se guarda
+  en una caché.
+- Si ocurre, desde ese grafema se avanza con la búsqueda voraz hasta volver
+  a caer justo en el límite de un grafema.
+
+La segmentación es una aproximación de los grafemas extendidos de Unicode
+pensada para emojis; como los casos dudosos se resuelven con la búsqueda
+voraz, una segmentación imperfecta solo afecta a la velocidad, nunca al
+resultado.
+"""
+
+import re
+from itertools import islice
+from operator import itemgetter
+
+from .clave import FIN_TRIE, compilar_clave
+
+
+# Caracteres que se pegan al anterior: marcas combinantes, selectores de
+# variación, tonos de piel y etiquetas (banderas de subdivisiones)
+_EXTENSORES = ("\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe00-\ufe0f"
+               "\ufe20-\ufe2f\U0001f3fb-\U0001f3ff\U000e0020-\U000e007f")
+_REGIONALES = "\U0001f1e6-\U0001f1ff"
+_ZWJ = "\u200d"
+
+# Un grafema: CR+LF, una pareja de indicadores regionales (bandera), o un
+# carácter con sus extensores y las uniones ZWJ que le sigan. Un ZWJ solo
+# termina un grafema antes de un salto de línea o al final del texto.
+_GRAFEMA = re.compile(
+    rf"\r\n|[{_REGIONALES}]{{2}}|(?:{_ZWJ}+[^\r\n]|.)[{_EXTENSORES}]*(?:{_ZWJ}+(?:[^\r\n][{_EXTENSORES}]*)?)*",
+    re.DOTALL,
+)
+
+# Grafemas distintos que se recuerdan como máximo (además de los de la clave)
+MAX_CACHE_GRAFEMAS = 50_000
+
+
+def segmentar(texto: str) -> list:
+    """Parte un texto en grafemas (lista de cadenas que, unidas, dan el texto)."""
+    return _GRAFEMA.findall(texto)
+
+
+class DecodificadorGrafemas:
+    """Decodificador por grafemas, equivalente a la búsqueda voraz del trie.
+
+    Atributos:
+        clave (CompiledKey): Clave compilada.
+    """
+
+    def __init__(self, clave):
+        self.clave = compilar_clave(clave)
+        self._semilla = dict(self.clave.inversa)
+        self._traducciones = dict(self._semilla)
+        # Parejas de caracteres seguidos dentro de un emoji que pueden quedar a
+        # los dos lados de una frontera entre grafemas. Un ZWJ se une siempre
+        # al carácter siguiente, salvo a un salto de línea
+        self._parejas = frozenset(
+            pareja for em in self._semilla for pareja in zip(em, em[1:])
+            if pareja[0] != _ZWJ or pareja[1] in "\r\n"
+        )
+        self._continuaciones = frozenset(segundo for _, segundo in self._parejas)
+
+    def _aprender(self, grafemas: set):
+        """Traduce una vez cada grafema nuevo y lo guarda en la caché."""
+        nuevos = grafemas.difference(self._traducciones)
+        if len(self._traducciones) + len(nuevos) > MAX_CACHE_GRAFEMAS + len(self._semilla):
+            self._traducciones = dict(self._semilla)
+            nuevos = grafemas.difference(self._traducciones)
+        for grafema in nuevos:
+            self._traducciones[grafema] = self.clave.decodificar_bloque(grafema)[0]
+
+    def _paso(self, texto: str, i: int) -> tuple:
+        """Un paso de la búsqueda voraz: (texto decodificado, nueva posición)."""
+        nodo = self.clave.trie.get(texto[i])
+        if nodo is None:
+            return texto[i], i + 1
+        coincidencia = None
+        fin = i + 1
+        j = i + 1
+        while True:
+            if FIN_TRIE in nodo:
+                coincidencia = nodo[FIN_TRIE]
+                fin = j
+            if j >= len(texto):
+                break
+            nodo = nodo.get(texto[j])
+            if nodo is None:
+                break
+            j += 1
+        if coincidencia is None:
+            return texto[i], i + 1
+        return coincidencia, fin
+
+    def decodificar(self, texto: str) -> str:
+        """
+        Decodifica un texto completo.
+
+        Parámetros:
+            texto (str): Texto codificado con emojis.
+
+        Retorna:
+            str: Texto decodificado (igual que `CompiledKey.decodificar_bloque`).
+        """
+        grafemas = _GRAFEMA.findall(texto)
+        traducidos = list(map(self._traducciones.get, grafemas))
+        if None in traducidos:
+            # Grafemas nuevos: se traducen una vez y se vuelve a intentar de golpe
+            self._aprender(set(grafemas))
+            traducidos = list(map(self._traducciones.get, grafemas))
+        if self._continuaciones.isdisjoint(map(itemgetter(0), islice(grafemas, 1, None))):
+            return "".join(traducidos)
+        fronteras = zip(map(itemgetter(-1), grafemas), map(itemgetter(0), islice(grafemas, 1, None)))
+        if self._parejas.isdisjoint(fronteras):
+            return "".join(traducidos)
+
+        # Algún emoji de la clave podría empezar en un grafema y seguir en el siguiente
+        partes = []
+        posicion = 0
+        i = 0
+        n = len(grafemas)
+        while i < n:
+            limite = posicion + len(grafemas[i])
+            i += 1
+            if i == n or (grafemas[i - 1][-1], grafemas[i][0]) not in self._parejas:
+                partes.append(traducidos[i - 1])
+                posicion = limite
+                continue
+            # Búsqueda voraz hasta volver a coincidir con el límite de un grafema
+            while True:
+                traduccion, posicion = self._paso(texto, posicion)
+                partes.append(traduccion)
+                while posicion > limite:
+                    limite += len(grafemas[i])
+                    i += 1
+                if posicion == limite:
+                    break
+        return "".join(partes)
+
+
+def decodificar_grafemas(texto: str, clave) -> str:
+    """Decodifica un texto por grafemas (ver `DecodificadorGrafemas`).
+
+    Parámetros:
+        texto (str): Texto codificado con emojis.
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+
+    Retorna:
+        str: Texto decodificado.
+    """
+    return compilar_clave(clave).grafemas.decodificar(texto)
@@ -0,0 +1,512 @@
+"""
+Historial en disco, de solo añadir y con tamaño acotado.
+
+Las aplicaciones guardaban en una lista todos los registros con el texto
+original y el resultado completos, así que la memoria crecía sin límite.
+`AlmacenHistorial` escribe cada registro como una línea JSON (JSON Lines) al
+final de un archivo de registro y:
+
+- Rota el archivo cuando pasa de `max_bytes` y conserva como mucho
+  `max_archivos` archivos antiguos, así que el disco también está acotado.
+- Guarda en memoria solo los últimos registros (un `deque` de tamaño fijo).
+- De los textos largos guarda un trozo inicial (vista previa) junto con su
+  longitud y su SHA-256, en lugar del texto entero.
+- Lee los registros antiguos por páginas, bajo demanda: la primera vez que
+  hace falta se calcula la posición de cada línea y después cada página es
+  un `seek` y una lectura.
+
+Cada registro tiene un número que no cambia al rotar: los registros que se
+pierden al borrar el archivo más antiguo se suman a `base` (que se guarda en
+"historial.base"), así que los registros guardados son `base .. fin - 1`.
+
+Solo un `AlmacenHistorial` puede tener abierta cada carpeta: al crearlo se
+bloquea "historial.lock" y se libera en `cerrar()`. Cada aplicación usa su
+propia carpeta (`carpeta_historial("S12")`); si se abre la misma dos veces,
+la segunda falla con `HistorialEnUso` en lugar de mezclar los registros o
+seguir escribiendo en un archivo que la otra ya ha rotado.
+
+Para buscar en el historial sin recorrerlo, ver `indice_historial`.
+
+Se usa como aquella lista: `registrar`, `limpiar`, `exportar_txt`, `len()`
+y recorrerlo con `for`.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .core import formatear_registro
+from .datos import carpeta_datos
+
+
+# Caracteres que se guardan de cada texto antes de recortarlo
+LIMITE_VISTA = 1000
+
+# Tamaño máximo de cada archivo de registro antes de rotarlo
+MAX_BYTES = 8 * 1024 * 1024
+
+# Archivos antiguos que se conservan tras rotar
+MAX_ARCHIVOS = 5
+
+# Registros recientes que se guardan en memoria
+REGISTROS_EN_MEMORIA = 200
+
+NOMBRE_ARCHIVO = "historial.jsonl"
+NOMBRE_BASE = "historial.base"
+NOMBRE_BLOQUEO = "historial.lock"
+
+# Formatos de exportación y columnas del CSV
+FORMATOS_EXPORTACION = ("txt", "csv", "jsonl")
+COLUMNAS_CSV = ("numero", "fecha", "tipo", "original", "resultado", "original_longitud",
+                "original_sha256", "resultado_longitud", "resultado_sha256")
+
+# Registros que se leen de disco de una vez al exportar
+BLOQUE_EXPORTACION = 1000
+
+# Tamaño del búfer de escritura al exportar
+TAMANO_BUFFER = 1024 * 1024
+
+
+def carpeta_historial(aplicacion: str = None) -> str:
+    """Carpeta donde se guarda el historial por defecto.
+
+    Parámetros:
+        aplicacion (str): Nombre de la aplicación ("S12", "S13"); cada una
+            tiene su subcarpeta para no compartir archivos con las demás.
+    """
+    carpeta = os.path.join(carpeta_datos(), "historial")
+    return os.path.join(carpeta, aplicacion) if aplicacion else carpeta
+
+
+class HistorialEnUso(OSError):
+    """La carpeta del historial ya está abierta por otro `AlmacenHistorial`."""
+
+
+def _bloquear(archivo):
+    """Bloquea `archivo` en exclusiva sin esperar (OSError si ya lo está)."""
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def recortar(registro: dict, campo: str, texto: str, limite: int = LIMITE_VISTA):
+    """Guarda `texto` en `registro[campo]`, recortado si es muy largo.
+
+    Si se recorta, se añaden `<campo>_longitud` y `<campo>_sha256` para
+    poder identificar el texto completo.
+    """
+    if len(texto) <= limite:
+        registro[campo] = texto
+        return
+    registro[campo] = texto[:limite] + "…"
+    registro[f"{campo}_longitud"] = len(texto)
+    registro[f"{campo}_sha256"] = hashlib.sha256(texto.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class AlmacenHistorial:
+    """Historial guardado en archivos JSON Lines con rotación.
+
+    Atributos:
+        carpeta (str): Carpeta de los archivos de registro.
+        max_bytes (int): Tamaño a partir del cual se rota el archivo actual.
+        max_archivos (int): Archivos antiguos que se conservan.
+        recientes (deque): Últimos registros, en memoria.
+        base (int): Número del registro más antiguo que se conserva.
+        generacion (int): Aumenta cada vez que se limpia el historial.
+
+    Lanza:
+        HistorialEnUso: Si otro programa tiene abierta la misma carpeta.
+    """
+
+    def __init__(self, carpeta: str = None, max_bytes: int = MAX_BYTES, max_archivos: int = MAX_ARCHIVOS,
+                 en_memoria: int = REGISTROS_EN_MEMORIA, limite_vista: int = LIMITE_VISTA):
+        self.carpeta = carpeta or carpeta_historial()
+        self.max_bytes = max_bytes
+        self.max_archivos = max_archivos
+        self.limite_vista = limite_vista
+        self.recientes = deque(maxlen=en_memoria)
+        self._cerrojo = threading.RLock()
+        self._oyentes = []
+        self.generacion = 0
+        # Posiciones de cada línea en cada archivo (del más antiguo al actual);
+        # se calculan la primera vez que se necesitan
+        self._posiciones = None
+        self._acumulados = None
+
+        os.makedirs(self.carpeta, exist_ok=True)
+        self._bloqueo = open(os.path.join(self.carpeta, NOMBRE_BLOQUEO), "ab")
+        try:
+            _bloquear(self._bloqueo)
+        except OSError:
+            self._bloqueo.close()
+            raise HistorialEnUso(f"El historial de {self.carpeta} ya está abierto en otro programa") from None
+        self.base = self._leer_base()
+        self._archivo = open(self._ruta(0), "ab")
+        self._reparar_final()
+        self._cargar_recientes()
+
+    # --- Archivos ---
+    def _ruta(self, antiguedad: int) -> str:
+        """Ruta del archivo actual (0) o de uno rotado (1 = el más reciente)."""
+        if antiguedad == 0:
+            return os.path.join(self.carpeta, NOMBRE_ARCHIVO)
+        base, extension = os.path.splitext(NOMBRE_ARCHIVO)
+        return os.path.join(self.carpeta, f"{base}.{antiguedad}{extension}")
+
+    def _rutas(self) -> list:
+        """Archivos existentes, del más antiguo al actual."""
+        rutas = [self._ruta(i) for i in range(self.max_archivos, 0, -1) if os.path.exists(self._ruta(i))]
+        return rutas + [self._ruta(0)]
+
+    def _leer_base(self) -> int:
+        try:
+            with open(os.path.join(self.carpeta, NOMBRE_BASE), encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _guardar_base(self):
+        ruta = os.path.join(self.carpeta, NOMBRE_BASE)
+        with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(self.base))
+        os.replace(ruta + ".tmp", ruta)
+
+    def _reparar_final(self):
+        """Descarta una última línea a medias (por ejemplo, tras un corte de luz)."""
+        tamano = self._archivo.seek(0, os.SEEK_END)
+        if tamano == 0:
+            return
+        with open(self._ruta(0), "rb") as f:
+            f.seek(max(0, tamano - 65536))
+            cola = f.read()
+        if not cola.endswith(b"\n"):
+            corte = cola.rfind(b"\n")
+            self._archivo.truncate(tamano - len(cola) + corte + 1 if corte >= 0 else 0)
+
+    def _cargar_recientes(self):
+        """Rellena la memoria con los últimos registros guardados."""
+        if self.recientes.maxlen:
+            self.recientes.extend(self.leer(self.fin - self.recientes.maxlen, self.fin))
+
+    def _rotar(self):
+        """Cierra el archivo actual, desplaza los antiguos y empieza uno nuevo."""
+        self._archivo.close()
+        if os.path.exists(self._ruta(self.max_archivos)):
+            # Los registros del archivo que se borra dejan de estar disponibles
+            if self._posiciones is None:
+                self._indexar()
+            self.base += len(self._posiciones[0])
+            self._guardar_base()
+            os.remove(self._ruta(self.max_archivos))
+        for i in range(self.max_archivos - 1, -1, -1):
+            if os.path.exists(self._ruta(i)):
+                os.replace(self._ruta(i), self._ruta(i + 1))
+        self._archivo = open(self._ruta(0), "ab")
+
+        if self._posiciones is not None:
+            self._posiciones.append(array("Q"))
+            if len(self._posiciones) > self.max_archivos + 1:
+                del self._posiciones[0]
+            self._recalcular_acumulados()
+
+    # --- Índice de posiciones ---
+    def _indexar(self):
+        """Calcula dónde empieza cada línea de cada archivo."""
+        posiciones = []
+        for ruta in self._rutas():
+            inicios = array("Q")
+            try:
+                with open(ruta, "rb") as f:
+                    posicion = 0
+                    for linea in f:
+                        inicios.append(posicion)
+                        posicion += len(linea)
+            except FileNotFoundError:
+                pass
+            posiciones.append(inicios)
+        self._posiciones = posiciones
+        self._recalcular_acumulados()
+
+    def _recalcular_acumulados(self):
+        total = 0
+        self._acumulados = []
+        for inicios in self._posiciones:
+            total += len(inicios)
+            self._acumulados.append(total)
+
+    # --- Escritura ---
+    def registrar(self, tipo: str, original: str, resultado: str) -> dict:
+        """
+        Añade un registro al final del historial.
+
+        Parámetros:
+            tipo (str): Tipo de acción ('Codificado' o 'Decodificado').
+            original (str): Texto original antes de la acción.
+            resultado (str): Texto resultante después de la acción.
+
+        Retorna:
+            dict: Registro añadido (con los textos recortados si eran largos).
+        """
+        registro = {"fecha": datetime.now().strftime("%d/%m/%Y %H:%M:%S"), "tipo": tipo}
+        recortar(registro, "original", original, self.limite_vista)
+        recortar(registro, "resultado", resultado, self.limite_vista)
+        linea = (json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8", "surrogatepass")
+
+        with self._cerrojo:
+            if self._archivo.tell() and self._archivo.tell() + len(linea) > self.max_bytes:
+                self._rotar()
+            numero = self.fin
+            posicion = self._archivo.tell()
+            self._archivo.write(linea)
+            self._archivo.flush()
+            self._posiciones[-1].append(posicion)
+            self._acumulados[-1] += 1
+            self.recientes.append(registro)
+            oyentes = [al_registrar for al_registrar, _ in self._oyentes]
+
+        for oyente in oyentes:
+            oyente(numero, registro)
+        return registro
+
+    def suscribir(self, al_registrar, al_limpiar=None):
+        """
+        Avisa de los cambios del historial.
+
+        Parámetros:
+            al_registrar (callable): Se llama con (número, registro) por cada
+                registro nuevo, desde el hilo que lo registra.
+            al_limpiar (callable): Se llama sin argumentos al limpiar.
+        """
+        self._oyentes.append((al_registrar, al_limpiar))
+
+    def limpiar(self):
+        """Elimina todos los registros (también los archivos)."""
+        with self._cerrojo:
+            self._archivo.close()
+            for ruta in self._rutas():
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+            self._archivo = open(self._ruta(0), "ab")
+            self.recientes.clear()
+            self.base = 0
+            self._guardar_base()
+            self.generacion += 1
+            self._indexar()
+            oyentes = [al_limpiar for _, al_limpiar in self._oyentes if al_limpiar]
+
+        for oyente in oyentes:
+            oyente()
+
+    def cerrar(self):
+        """Cierra el archivo actual y libera la carpeta."""
+        with self._cerrojo:
+            self._archivo.close()
+            self._bloqueo.close()
+
+    # --- Lectura ---
+    def __len__(self):
+        with self._cerrojo:
+            if self._posiciones is None:
+                self._indexar()
+            return self._acumulados[-1]
+
+    @property
+    def fin(self) -> int:
+        """Número que tendrá el próximo registro."""
+        return self.base + len(self)
+
+    def leer(self, inicio: int, fin: int) -> list:
+        """
+        Lee los registros con número entre `inicio` y `fin - 1`.
+
+        Los números que ya no se conservan se ignoran.
+
+        Parámetros:
+            inicio (int): Número del primer registro.
+            fin (int): Número siguiente al último registro.
+
+        Retorna:
+            list: Registros (dict) leídos de disco, del más antiguo al más nuevo.
+        """
+        return [json.loads(linea.decode("utf-8", "surrogatepass")) for linea in self.leer_lineas(inicio, fin)]
+
+    def leer_lineas(self, inicio: int, fin: int) -> list:
+        """Como `leer`, pero devuelve las líneas JSON sin convertir (bytes, sin el salto de línea)."""
+        with self._cerrojo:
+            total = len(self)
+            inicio, fin = max(0, inicio - self.base), min(fin - self.base, total)
+            registros = []
+            rutas = self._rutas()
+            while inicio < fin:
+                # Archivo donde está `inicio` y posición dentro de él
+                archivo = bisect_right(self._acumulados, inicio)
+                primero = self._acumulados[archivo - 1] if archivo else 0
+                inicios = self._posiciones[archivo]
+                desde = inicio - primero
+                hasta = min(fin - primero, len(inicios))
+                with open(rutas[archivo], "rb") as f:
+                    f.seek(inicios[desde])
+                    if hasta < len(inicios):
+                        datos = f.read(inicios[hasta] - inicios[desde])
+                    else:
+                        datos = f.read()
+                registros += datos.splitlines()[:hasta - desde]
+                inicio = primero + hasta
+            return registros
+
+    def pagina(self, numero: int, tamano: int = 50) -> list:
+        """
+        Devuelve una página del historial, empezando por los más recientes.
+
+        Parámetros:
+            numero (int): Número de página (0 = la más reciente).
+            tamano (int): Registros por página.
+
+        Retorna:
+            list: Pares (número, registro), del más reciente al más antiguo.
+        """
+        with self._cerrojo:
+            fin = self.fin - numero * tamano
+            inicio = max(self.base, fin - tamano)
+            registros = self.leer(inicio, fin)
+        return list(reversed(list(enumerate(registros, start=inicio))))
+
+    def numerados(self, desde: int = 0):
+        """Recorre los pares (número, registro) de disco, por bloques."""
+        numero = max(desde, self.base)
+        while True:
+            bloque = self.leer(numero, numero + 1000)
+            if not bloque:
+                return
+            yield from enumerate(bloque, start=numero)
+            numero += len(bloque)
+
+    def __iter__(self):
+        """Recorre todos los registros de disco, por bloques."""
+        for _, registro in self.numerados():
+            yield registro
+
+    def exportar_txt(self, ruta: str):
+        """
+        Exporta el historial a un archivo TXT.
+
+        Parámetros:
+            ruta (str): Ruta del archivo que se va a crear.
+        """
+        self.exportar(ruta, "txt", comprimir=False)
+
+    def exportar(self, ruta: str, formato: str = None, comprimir: bool = None, progreso=None) -> int:
+        """
+        Exporta el historial a TXT, CSV o JSON Lines, opcionalmente con gzip.
+
+        Los registros se leen de disco por bloques y se escriben con un búfer
+        grande, así que la memoria no depende del tamaño del historial. Los
+        registros que se añadan mientras se exporta no se incluyen.
+
+        Parámetros:
+            ruta (str): Ruta del archivo que se va a crear.
+            formato (str): "txt", "csv" o "jsonl"; por defecto, según la
+                extensión de la ruta (ver `formato_de_ruta`).
+            comprimir (bool): Si se comprime con gzip; por defecto, si la
+                ruta acaba en ".gz".
+            progreso (callable): Se llama con (registros escritos, total)
+                tras cada bloque. Si lanza una excepción (por ejemplo, para
+                cancelar), se borra el archivo a medias.
+
+        Retorna:
+            int: Número de registros exportados.
+
+        Lanza:
+            ValueError: Si el formato no es válido.
+        """
+        formato_ruta, comprimir_ruta = formato_de_ruta(ruta)
+        formato = formato or formato_ruta
+        comprimir = comprimir_ruta if comprimir is None else comprimir
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato de exportación no válido: {formato}")
+
+        with self._cerrojo:
+            inicio, fin = self.base, self.fin
+        total = fin - inicio
+
+        if comprimir:
+            binario = io.BufferedWriter(gzip.open(ruta, "wb", compresslevel=6), TAMANO_BUFFER)
+        else:
+            binario = open(ruta, "wb", buffering=TAMANO_BUFFER)
+        salida, escribir = _escritor(binario, formato)
+        try:
+            with salida:
+                for bloque in range(inicio, fin, BLOQUE_EXPORTACION):
+                    for numero, linea in enumerate(self.leer_lineas(bloque, bloque + BLOQUE_EXPORTACION),
+                                                   start=bloque):
+                        escribir(numero, linea)
+                    if progreso:
+                        progreso(min(fin, bloque + BLOQUE_EXPORTACION) - inicio, total)
+        except BaseException:
+            os.remove(ruta)
+            raise
+        return total
+
+
+def formato_de_ruta(ruta: str) -> tuple:
+    """
+    Deduce el formato de exportación a partir de la extensión.
+
+    Por ejemplo, "historial.csv.gz" → ("csv", True). Si la extensión no es
+    conocida se usa "txt".
+
+    Retorna:
+        tuple: (formato, comprimir).
+    """
+    nombre = ruta.lower()
+    comprimir = nombre.endswith(".gz")
+    if comprimir:
+        nombre = nombre[:-3]
+    extension = os.path.splitext(nombre)[1].lstrip(".")
+    return (extension if extension in FORMATOS_EXPORTACION else "txt"), comprimir
+
+
+def _escritor(binario, formato: str) -> tuple:
+    """Prepara la escritura de las líneas JSON del historial en un formato.
+
+    Retorna:
+        tuple: (archivo que hay que cerrar al acabar, función escribir(número, línea)).
+    """
+    if formato == "jsonl":
+        # Las líneas del historial ya son JSON Lines: se copian sin convertir
+        def escribir(numero, linea):
+            binario.write(linea)
+            binario.write(b"\n")
+        return binario, escribir
+
+    salida = io.TextIOWrapper(binario, encoding="utf-8", errors="surrogatepass",
+                              newline="" if formato == "csv" else None)
+    if formato == "csv":
+        escritor = csv.DictWriter(salida, COLUMNAS_CSV, extrasaction="ignore")
+        escritor.writeheader()
+
+        def escribir(numero, linea):
+            registro = json.loads(linea.decode("utf-8", "surrogatepass"))
+            registro["numero"] = numero + 1
+            escritor.writerow(registro)
+    else:
+        def escribir(numero, linea):
+            registro = json.loads(linea.decode("utf-8", "surrogatepass"))
+            salida.write(formatear_registro(registro))
+    return salida, escribir
+
@@ -0,0 +1,409 @@
+"""
+Índice de búsqueda del historial: palabras, tipo de operación y fecha.
+
+`IndiceHistorial` es un índice invertido: para cada palabra del texto
+original y del resultado guarda los números de registro donde aparece, y lo
+mismo para cada tipo de operación ("codificado", "decodificado"). Además
+guarda el día de cada registro; como los registros se añaden en orden, un
+intervalo de fechas se convierte en un intervalo de números con `bisect`.
+
+Se actualiza con cada registro nuevo (se suscribe al `AlmacenHistorial`) y
+se guarda en disco junto al historial ("historial.indice"), así que al abrir
+la aplicación solo hay que indexar los registros añadidos desde la última
+vez que se guardó.
+
+Las consultas son palabras más filtros opcionales:
+
+    tipo:decodificado          (basta con el principio: tipo:dec)
+    desde:2026-10-01  hasta:18/10/2026
+    fecha:hoy | ayer | semana | mes | <una fecha>
+
+Por ejemplo, "tipo:dec pedido fecha:semana" son las decodificaciones de los
+últimos 7 días que contienen "pedido".
+
+Formato del archivo (todo en little-endian):
+
+    cabecera    MAGIA, versión, primer número con fecha, números indexados
+                (hasta, sin incluir), CRC-32 de la última línea indexada
+    fechas      un entero de 4 bytes por registro (día, `date.toordinal`)
+    palabras    sección de claves y listas de números
+    tipos       sección de claves y listas de números
+
+Cada sección: nº de bytes de las claves y nº de claves, las claves en UTF-8
+separadas por "\\n", cuántos números tiene cada lista y todas las listas
+seguidas (enteros de 4 bytes).
+"""
+
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+
+from .historial import AlmacenHistorial
+
+
+MAGIA = b"EMJH"
+VERSION_INDICE = 1
+NOMBRE_INDICE = "historial.indice"
+
+# Registros nuevos tras los que se vuelve a guardar el índice
+GUARDAR_CADA = 1000
+
+_CABECERA = struct.Struct("<4sHHQQI")
+_SECCION = struct.Struct("<II")
+
+# Palabras (o símbolos sueltos, como cada emoji) que se indexan para buscar
+_PALABRA = re.compile(r"\w+|[^\w\s]")
+
+# Filtros de las consultas ("campo:valor")
+_FILTRO = re.compile(r"(tipo|desde|hasta|fecha):(\S*)", re.IGNORECASE)
+
+
+def palabras(texto: str) -> list:
+    """Palabras de un texto tal y como se indexan (en minúsculas)."""
+    return _PALABRA.findall(texto.lower())
+
+
+def dia_de_registro(registro: dict) -> int:
+    """Día de un registro ('fecha' en formato dd/mm/aaaa) como `date.toordinal`."""
+    fecha = registro["fecha"]
+    try:
+        return date(int(fecha[6:10]), int(fecha[3:5]), int(fecha[:2])).toordinal()
+    except ValueError:
+        return 0
+
+
+def leer_fecha(texto: str) -> date:
+    """Convierte 'aaaa-mm-dd' o 'dd/mm/aaaa' en una fecha.
+
+    Lanza:
+        ValueError: Si el texto no es una fecha válida.
+    """
+    if "/" in texto:
+        dia, mes, anio = texto.split("/")
+    else:
+        anio, mes, dia = texto.split("-")
+    return date(int(anio), int(mes), int(dia))
+
+
+def interpretar_consulta(consulta: str, hoy: date = None) -> dict:
+    """
+    Separa una consulta en palabras y filtros.
+
+    Parámetros:
+        consulta (str): Texto escrito por el usuario (ver el docstring del módulo).
+        hoy (date): Fecha de referencia para "hoy", "ayer", "semana" y "mes".
+
+    Retorna:
+        dict: Con 'palabras' (list), 'tipo' (str o None), 'desde' y 'hasta'
+            (días como `date.toordinal`, incluidos, o None) y 'prefijo' (si
+            la última palabra puede ser solo el principio de una palabra).
+
+    Lanza:
+        ValueError: Si un filtro no es válido.
+    """
+    hoy = hoy or date.today()
+    filtros = {"tipo": None, "desde": None, "hasta": None}
+    for campo, valor in _FILTRO.findall(consulta):
+        campo, valor = campo.lower(), valor.lower()
+        if not valor:
+            continue
+        if campo == "tipo":
+            filtros["tipo"] = valor
+        elif campo in ("desde", "hasta"):
+            filtros[campo] = leer_fecha(valor).toordinal()
+        elif valor in ("hoy", "ayer"):
+            dia = hoy - timedelta(days=0 if valor == "hoy" else 1)
+            filtros["desde"] = filtros["hasta"] = dia.toordinal()
+        elif valor in ("semana", "mes"):
+            dias = 7 if valor == "semana" else 30
+            filtros["desde"] = (hoy - timedelta(days=dias - 1)).toordinal()
+            filtros["hasta"] = hoy.toordinal()
+        else:
+            filtros["desde"] = filtros["hasta"] = leer_fecha(valor).toordinal()
+
+    texto = _FILTRO.sub(" ", consulta)
+    ultima = consulta.split()[-1:] if not consulta[-1:].isspace() else []
+    filtros["palabras"] = palabras(texto)
+    # La última palabra se busca por prefijo mientras se está escribiendo
+    filtros["prefijo"] = bool(ultima) and not _FILTRO.fullmatch(ultima[0])
+    return filtros
+
+
+def _a_bytes(lista) -> bytes:
+    """Empaqueta una secuencia de enteros como uint32 little-endian."""
+    datos = array("I", lista)
+    if sys.byteorder != "little":
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def _de_bytes(datos) -> array:
+    """Lee enteros uint32 little-endian."""
+    lista = array("I")
+    lista.frombytes(datos)
+    if sys.byteorder != "little":
+        lista.byteswap()
+    return lista
+
+
+def _recortar(lista: array, desde: int) -> array:
+    """Quita de una lista ordenada los números menores que `desde`."""
+    i = bisect_left(lista, desde)
+    return lista[i:] if i else lista
+
+
+class IndiceHistorial:
+    """Índice invertido del historial por palabras, tipo y fecha.
+
+    Atributos:
+        almacen (AlmacenHistorial): Historial indexado.
+        ruta (str): Archivo donde se guarda el índice (None para no guardarlo).
+    """
+
+    def __init__(self, almacen: AlmacenHistorial, ruta: str = "", guardar_cada: int = GUARDAR_CADA):
+        self.almacen = almacen
+        self.ruta = os.path.join(almacen.carpeta, NOMBRE_INDICE) if ruta == "" else ruta
+        self.guardar_cada = guardar_cada
+        self._cerrojo = threading.RLock()
+        self._vaciar_memoria()
+        if self.ruta and os.path.exists(self.ruta):
+            try:
+                self._cargar()
+            except (OSError, ValueError, struct.error):
+                # Índice dañado o de otro historial: se reconstruye al buscar
+                self._vaciar_memoria()
+        almacen.suscribir(self.anadir, self.vaciar)
+
+    def _vaciar_memoria(self):
+        self._palabras = {}
+        self._tipos = {}
+        self._vocabulario = None  # palabras ordenadas, para buscar por prefijo
+        self._fechas = array("I")  # día de cada registro desde `_primero`
+        self._primero = 0
+        self._hasta = None  # registros indexados: hasta este número (sin incluir)
+        self._ordenadas = True  # si las fechas van en orden (el reloj no ha retrocedido)
+        self._sin_guardar = 0
+
+    # --- Indexar ---
+    def _indexar_registro(self, numero: int, registro: dict):
+        texto = f"{registro['original']} {registro['resultado']}"
+        for palabra in set(palabras(texto)):
+            lista = self._palabras.get(palabra)
+            if lista is None:
+                lista = self._palabras[palabra] = array("I")
+                self._vocabulario = None
+            lista.append(numero)
+        self._tipos.setdefault(registro["tipo"].lower(), array("I")).append(numero)
+
+        dia = dia_de_registro(registro)
+        if self._fechas and dia < self._fechas[-1]:
+            self._ordenadas = False
+        if not self._fechas:
+            self._primero = numero
+        self._fechas.append(dia)
+        self._sin_guardar += 1
+
+    def _ponerse_al_dia(self):
+        """Indexa los registros añadidos desde la última vez."""
+        fin = self.almacen.fin
+        if self._hasta is None:
+            self._hasta = self.almacen.base
+        if self._hasta < fin:
+            for numero, registro in self.almacen.numerados(self._hasta):
+                if numero >= fin:
+                    break
+                self._indexar_registro(numero, registro)
+            self._hasta = fin
+            self.guardar_si_hace_falta()
+
+    def anadir(self, numero: int, registro: dict):
+        """Indexa un registro nuevo (se llama al registrar)."""
+        with self._cerrojo:
+            if self._hasta is not None and numero == self._hasta:
+                self._indexar_registro(numero, registro)
+                self._hasta = numero + 1
+                self.guardar_si_hace_falta()
+
+    def vaciar(self):
+        """Olvida todo lo indexado (se llama al limpiar el historial)."""
+        with self._cerrojo:
+            self._vaciar_memoria()
+            if self.ruta and os.path.exists(self.ruta):
+                os.remove(self.ruta)
+
+    # --- Buscar ---
+    def _lista(self, lista, inicio: int, fin: int):
+        """Parte de una lista de números entre `inicio` y `fin` (sin incluir)."""
+        return lista[bisect_left(lista, inicio):bisect_left(lista, fin)]
+
+    def _con_prefijo(self, prefijo: str, inicio: int, fin: int) -> set:
+        if self._vocabulario is None:
+            self._vocabulario = sorted(self._palabras)
+        encontrados = set()
+        i = bisect_left(self._vocabulario, prefijo)
+        while i < len(self._vocabulario) and self._vocabulario[i].startswith(prefijo):
+            encontrados.update(self._lista(self._palabras[self._vocabulario[i]], inicio, fin))
+            i += 1
+        return encontrados
+
+    def _intervalo(self, desde: int, hasta: int) -> tuple:
+        """Números de registro (inicio, fin) que pueden estar entre dos días."""
+        inicio, fin = self.almacen.base, self._hasta
+        if self._ordenadas and self._fechas:
+            if desde is not None:
+                inicio = max(inicio, self._primero + bisect_left(self._fechas, desde))
+            if hasta is not None:
+                fin = min(fin, self._primero + bisect_left(self._fechas, hasta + 1))
+        return inicio, fin
+
+    def filtrar(self, palabras: list = (), tipo: str = None, desde: int = None, hasta: int = None,
+                prefijo: bool = False) -> list:
+        """
+        Busca los registros que cumplen todas las condiciones.
+
+        Parámetros:
+            palabras (list): Palabras (en minúsculas) que deben aparecer.
+            tipo (str): Principio del tipo de operación, en minúsculas.
+            desde (int): Primer día (`date.toordinal`), incluido.
+            hasta (int): Último día (`date.toordinal`), incluido.
+            prefijo (bool): Si la última palabra basta con que sea el principio
+                de una palabra.
+
+        Retorna:
+            list: Números de registro, de menor a mayor.
+        """
+        palabras = list(palabras)
+        with self._cerrojo:
+            self._ponerse_al_dia()
+            inicio, fin = self._intervalo(desde, hasta)
+            conjuntos = []
+            if prefijo and palabras:
+                conjuntos.append(self._con_prefijo(palabras.pop(), inicio, fin))
+            for palabra in palabras:
+                conjuntos.append(set(self._lista(self._palabras.get(palabra, ()), inicio, fin)))
+            if tipo:
+                conjuntos.append({numero for nombre, lista in self._tipos.items() if nombre.startswith(tipo)
+                                  for numero in self._lista(lista, inicio, fin)})
+            if not conjuntos:
+                conjuntos.append(range(inicio, fin))
+            conjuntos.sort(key=len)
+            resultado = set(conjuntos[0]).intersection(*conjuntos[1:])
+
+            if (desde is not None or hasta is not None) and not self._ordenadas:
+                # Las fechas no van en orden: se comprueban una a una
+                desde = desde if desde is not None else 0
+                hasta = hasta if hasta is not None else date.max.toordinal()
+                resultado = {numero for numero in resultado
+                             if desde <= self._fechas[numero - self._primero] <= hasta}
+        return sorted(resultado)
+
+    def buscar(self, consulta: str, prefijo: bool = True, hoy: date = None) -> list:
+        """
+        Busca con una consulta escrita (palabras y filtros, ver el módulo).
+
+        Parámetros:
+            consulta (str): Texto a buscar, por ejemplo "tipo:dec pedido fecha:semana".
+            prefijo (bool): Si es True, la última palabra basta con que sea
+                el principio de una palabra (para buscar mientras se escribe).
+            hoy (date): Fecha de referencia para los filtros relativos.
+
+        Retorna:
+            list: Números de registro, de menor a mayor (vacía si la consulta
+                no tiene palabras ni filtros).
+
+        Lanza:
+            ValueError: Si un filtro no es válido.
+        """
+        filtros = interpretar_consulta(consulta, hoy)
+        filtros["prefijo"] = filtros["prefijo"] and prefijo
+        if not filtros["palabras"] and all(filtros[campo] is None for campo in ("tipo", "desde", "hasta")):
+            return []
+        return self.filtrar(**filtros)
+
+    # --- Guardar y cargar ---
+    def guardar_si_hace_falta(self):
+        """Guarda el índice si se han indexado bastantes registros desde la última vez."""
+        if self.ruta and self._sin_guardar >= self.guardar_cada:
+            self.guardar()
+
+    def guardar(self):
+        """Guarda el índice en disco (descartando los registros ya rotados)."""
+        with self._cerrojo:
+            if not self.ruta or self._hasta is None:
+                return
+            self._descartar_rotados()
+            lineas = self.almacen.leer_lineas(self._hasta - 1, self._hasta)
+            crc = zlib.crc32(lineas[0]) if lineas else 0
+            partes = [_CABECERA.pack(MAGIA, VERSION_INDICE, 0, self._primero, self._hasta, crc),
+                      _a_bytes(self._fechas)]
+            for seccion in (self._palabras, self._tipos):
+                claves = "\n".join(seccion).encode("utf-8", "surrogatepass")
+                partes.append(_SECCION.pack(len(claves), len(seccion)))
+                partes.append(claves)
+                partes.append(_a_bytes(map(len, seccion.values())))
+                partes.extend(_a_bytes(lista) for lista in seccion.values())
+
+            temporal = self.ruta + ".tmp"
+            with open(temporal, "wb") as f:
+                f.writelines(partes)
+            os.replace(temporal, self.ruta)
+            self._sin_guardar = 0
+
+    def _descartar_rotados(self):
+        """Quita los números de registros que ya no están en el historial."""
+        base = self.almacen.base
+        if base <= self._primero:
+            return
+        for seccion in (self._palabras, self._tipos):
+            for clave in list(seccion):
+                lista = _recortar(seccion[clave], base)
+                if lista:
+                    seccion[clave] = lista
+                else:
+                    del seccion[clave]
+        self._vocabulario = None
+        self._fechas = self._fechas[min(len(self._fechas), base - self._primero):]
+        self._primero = base
+
+    def _cargar(self):
+        with open(self.ruta, "rb") as f:
+            datos = memoryview(f.read())
+        magia, version, _, primero, hasta, crc = _CABECERA.unpack_from(datos)
+        if magia != MAGIA or version != VERSION_INDICE:
+            raise ValueError("No es un índice del historial compatible")
+        # El historial tiene que seguir conteniendo la última línea indexada. Si
+        # ya se ha rotado no se puede comprobar, y al ponerse al día quedaría un
+        # hueco entre las fechas indexadas y los números de registro: se reconstruye
+        if not self.almacen.base < hasta <= self.almacen.fin:
+            raise ValueError("El índice no corresponde al historial")
+        lineas = self.almacen.leer_lineas(hasta - 1, hasta)
+        if not lineas or zlib.crc32(lineas[0]) != crc:
+            raise ValueError("El índice no corresponde al historial")
+
+        posicion = _CABECERA.size
+        self._fechas = _de_bytes(datos[posicion:posicion + 4 * (hasta - primero)])
+        posicion += 4 * (hasta - primero)
+        secciones = []
+        for _ in range(2):
+            largo, n = _SECCION.unpack_from(datos, posicion)
+            posicion += _SECCION.size
+            texto = bytes(datos[posicion:posicion + largo]).decode("utf-8", "surrogatepass")
+            claves = texto.split("\n") if n else []
+            posicion += largo
+            cantidades = _de_bytes(datos[posicion:posicion + 4 * n])
+            posicion += 4 * n
+            seccion = {}
+            for clave, cantidad in zip(claves, cantidades):
+                seccion[clave] = _de_bytes(datos[posicion:posicion + 4 * cantidad])
+                posicion += 4 * cantidad
+            secciones.append(seccion)
+
+        self._palabras, self._tipos = secciones
+        self._primero, self._hasta = primero, hasta
+        self._ordenadas = all(a <= b for a, b in zip(self._fechas, self._fechas[1:]))
@@ -0,0 +1,241 @@
+"""
+Llavero: almacén de muchas claves con búsqueda por identificador o huella.
+
+Las aplicaciones solo manejan una clave (`clave_actual`) guardada en un
+archivo elegido a mano. Para rotar claves por cliente hace falta guardar
+miles y recuperarlas rápido. `Llavero` las guarda en una base de datos SQLite
+(una tabla indexada por identificador y por huella, con la clave en formato
+binario, ver `formato`) y mantiene en memoria una caché LRU con las claves
+ya compiladas, de modo que pedir una clave usada hace poco es un acceso a un
+diccionario.
+
+Cada hilo usa su propia conexión y la base de datos está en modo WAL, así
+que varios lectores pueden consultarla a la vez mientras otro escribe.
+`Llavero(":memory:")` abre una base de datos en memoria con caché compartida
+(`file:...?mode=memory&cache=shared`), de modo que todos los hilos ven las
+mismas claves; dura hasta que se llama a `cerrar()`.
+"""
+
+import itertools
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from .clave import CompiledKey, compilar_clave
+from .datos import carpeta_datos
+from .formato import clave_a_bytes, clave_de_bytes
+
+
+# Claves compiladas que se guardan en memoria por defecto
+CAPACIDAD_CACHE = 256
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS claves (
+    id      TEXT PRIMARY KEY,
+    huella  TEXT NOT NULL,
+    datos   BLOB NOT NULL,
+    creada  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS claves_huella ON claves (huella);
+"""
+
+# Numera las bases de datos en memoria para que cada llavero tenga la suya
+_memorias = itertools.count()
+
+
+def ruta_llavero() -> str:
+    """Ruta del llavero por defecto."""
+    return os.path.join(carpeta_datos(), "llavero.sqlite3")
+
+
+class CacheLRU:
+    """Caché de tamaño fijo que descarta lo usado hace más tiempo.
+
+    Es segura entre hilos. Se usa para las claves ya compiladas.
+    """
+
+    def __init__(self, capacidad: int = CAPACIDAD_CACHE):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._cerrojo = threading.Lock()
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado (o None) y lo marca como usado."""
+        with self._cerrojo:
+            valor = self._datos.get(clave)
+            if valor is not None:
+                self._datos.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave, valor):
+        """Guarda un valor, descartando el más antiguo si no cabe."""
+        with self._cerrojo:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            if len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def descartar(self, clave):
+        """Quita un valor de la caché (si estaba)."""
+        with self._cerrojo:
+            self._datos.pop(clave, None)
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class Llavero:
+    """Almacén de claves en SQLite con caché de claves compiladas.
+
+    Atributos:
+        ruta (str): Archivo de la base de datos.
+        cache (CacheLRU): Claves compiladas por identificador.
+    """
+
+    def __init__(self, ruta: str = None, capacidad_cache: int = CAPACIDAD_CACHE):
+        self.ruta = ruta or ruta_llavero()
+        self.cache = CacheLRU(capacidad_cache)
+        self._local = threading.local()
+        # Conexiones abiertas de todos los hilos, para cerrarlas en `cerrar()`
+        self._conexiones = []
+        self._cerrojo = threading.Lock()
+        if self.ruta == ":memory:":
+            # Cada conexión a ":memory:" sería una base de datos distinta
+            self._uri = f"file:emojicipher-llavero-{os.getpid()}-{next(_memorias)}?mode=memory&cache=shared"
+        else:
+            self._uri = None
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        self._conexion()
+
+    def _conexion(self) -> sqlite3.Connection:
+        """Conexión del hilo actual (se crea la primera vez)."""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            # check_same_thread=False solo para que `cerrar()` pueda cerrarla
+            # desde otro hilo; cada hilo sigue usando únicamente la suya
+            if self._uri:
+                conexion = sqlite3.connect(self._uri, timeout=30, uri=True, check_same_thread=False)
+                # Con caché compartida los bloqueos son por tabla: leer sin esperar a quien escribe
+                conexion.execute("PRAGMA read_uncommitted=1")
+            else:
+                conexion = sqlite3.connect(self.ruta, timeout=30, check_same_thread=False)
+                # WAL: los lectores no se bloquean mientras otro hilo o proceso escribe
+                conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            with self._cerrojo:
+                if not self._conexiones:
+                    conexion.executescript(_ESQUEMA)  # también tras `cerrar()` en memoria
+                self._conexiones.append(conexion)
+            self._local.conexion = conexion
+        return conexion
+
+    def cerrar(self):
+        """Cierra las conexiones de todos los hilos.
+
+        Si después se vuelve a usar, cada hilo abre una conexión nueva (un
+        llavero en memoria empieza vacío).
+        """
+        with self._cerrojo:
+            conexiones, self._conexiones = self._conexiones, []
+            self._local = threading.local()
+        for conexion in conexiones:
+            conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    # --- Escritura ---
+    def anadir(self, clave, id_clave: str = None) -> str:
+        """Guarda una clave en el llavero.
+
+        Parámetros:
+            clave (dict o CompiledKey): Clave a guardar.
+            id_clave (str): Identificador; por defecto, los 16 primeros
+                caracteres de la huella.
+
+        Retorna:
+            str: Identificador con el que se ha guardado.
+
+        Lanza:
+            ValueError: Si ya existe otra clave con ese identificador.
+        """
+        return self.anadir_varias([(clave, id_clave)])[0]
+
+    def anadir_varias(self, claves) -> list:
+        """Guarda muchas claves en una sola transacción.
+
+        Parámetros:
+            claves (iterable): Pares (clave, identificador o None).
+
+        Retorna:
+            list: Identificadores, en el mismo orden.
+        """
+        filas = []
+        compiladas = []
+        creada = datetime.now().isoformat(timespec="seconds")
+        for clave, id_clave in claves:
+            compilada = compilar_clave(clave)
+            id_clave = id_clave or compilada.huella[:16]
+            filas.append((id_clave, compilada.huella, clave_a_bytes(compilada), creada))
+            compiladas.append((id_clave, compilada))
+
+        try:
+            with self._conexion() as conexion:
+                conexion.executemany("INSERT INTO claves VALUES (?, ?, ?, ?)", filas)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Ya existe una clave con ese identificador ({e})") from e
+
+        for id_clave, compilada in compiladas:
+            self.cache.guardar(id_clave, compilada)
+        return [id_clave for id_clave, _ in compiladas]
+
+    def eliminar(self, id_clave: str) -> bool:
+        """Elimina una clave. Devuelve True si existía."""
+        with self._conexion() as conexion:
+            borradas = conexion.execute("DELETE FROM claves WHERE id = ?", (id_clave,)).rowcount
+        self.cache.descartar(id_clave)
+        return borradas > 0
+
+    # --- Lectura ---
+    def obtener(self, id_clave: str) -> CompiledKey:
+        """Devuelve la clave compilada con ese identificador.
+
+        Si se ha usado hace poco sale de la caché, sin tocar la base de datos.
+
+        Lanza:
+            KeyError: Si no existe.
+        """
+        compilada = self.cache.obtener(id_clave)
+        if compilada is None:
+            fila = self._conexion().execute(
+                "SELECT datos FROM claves WHERE id = ?", (id_clave,)).fetchone()
+            if fila is None:
+                raise KeyError(id_clave)
+            compilada = CompiledKey(clave_de_bytes(fila[0]))
+            self.cache.guardar(id_clave, compilada)
+        return compilada
+
+    def buscar_huella(self, huella: str) -> list:
+        """Identificadores de las claves con esa huella (o que empiezan por ella)."""
+        filas = self._conexion().execute(
+            "SELECT id FROM claves WHERE huella >= ? AND huella < ? ORDER BY id",
+            (huella, huella + "\uffff")).fetchall()
+        return [fila[0] for fila in filas]
+
+    def listar(self) -> list:
+        """Lista de (identificador, huella, fecha de creación), por identificador."""
+        return self._conexion().execute("SELECT id, huella, creada FROM claves ORDER BY id").fetchall()
+
+    def __contains__(self, id_clave: str) -> bool:
+        if self.cache.obtener(id_clave) is not None:
+            return True
+        return self._conexion().execute(
+            "SELECT 1 FROM claves WHERE id = ?", (id_clave,)).fetchone() is not None
+
+    def __len__(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM claves").fetchone()[0]
@@ -0,0 +1,152 @@
+"""
+Codificación y decodificación de lotes de archivos en varios procesos.
+
+Reparte los archivos entre un `ProcessPoolExecutor`. La clave se envía a cada
+proceso trabajador una sola vez, a través de su inicializador, y allí se
+compila; a cada tarea solo se le pasan las rutas de los archivos. Cada archivo
+se procesa por bloques (ver `flujo`), así que la memoria no depende de su
+tamaño.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .clave import CompiledKey, compilar_clave
+from .flujo import TAMANO_BLOQUE, codificar_archivo, decodificar_archivo
+
+
+# Clave compilada de cada proceso trabajador (la crea `_inicializar_trabajador`)
+_clave_trabajador = None
+
+
+def _inicializar_trabajador(clave: dict):
+    """Compila la clave una vez al arrancar cada proceso trabajador."""
+    global _clave_trabajador
+    _clave_trabajador = CompiledKey(clave)
+
+
+def _procesar_tarea(tarea: tuple) -> dict:
+    """Procesa un único archivo dentro de un proceso trabajador.
+
+    Parámetros:
+        tarea (tuple): (operación, origen, destino, tamaño de bloque).
+
+    Retorna:
+        dict: Resultado con 'origen', 'destino', 'bytes', 'segundos' y 'error'.
+    """
+    operacion, origen, destino, tamano_bloque = tarea
+    procesar = codificar_archivo if operacion == "codificar" else decodificar_archivo
+    inicio = time.perf_counter()
+    resultado = {"origen": origen, "destino": destino, "bytes": 0, "segundos": 0.0, "error": None}
+    try:
+        os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+        procesar(origen, destino, _clave_trabajador, tamano_bloque)
+        resultado["bytes"] = os.path.getsize(origen)
+    except (OSError, ValueError) as e:
+        # ValueError: la entrada no es UTF-8 o la salida es el propio archivo de entrada
+        resultado["error"] = str(e)
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+def rutas_de_salida(archivos: list, carpeta_salida: str) -> list:
+    """Calcula la ruta de salida de cada archivo.
+
+    Se conserva la estructura de carpetas relativa a la carpeta común de
+    todos los archivos, para que dos archivos con el mismo nombre en carpetas
+    distintas no se pisen.
+
+    Parámetros:
+        archivos (list): Rutas de los archivos de entrada.
+        carpeta_salida (str): Carpeta donde se escribirán los resultados.
+
+    Retorna:
+        list: Rutas de salida, en el mismo orden que `archivos`.
+    """
+    absolutas = [os.path.abspath(a) for a in archivos]
+    if not absolutas:
+        return []
+    base = os.path.commonpath([os.path.dirname(a) for a in absolutas])
+    return [os.path.join(carpeta_salida, os.path.relpath(a, base)) for a in absolutas]
+
+
+def procesar_lote(archivos: list, clave, carpeta_salida: str, operacion: str = "codificar",
+                  procesos: int = None, ordenado: bool = True, tamano_bloque: int = TAMANO_BLOQUE):
+    """Codifica o decodifica muchos archivos en paralelo.
+
+    Es un generador: va devolviendo el resultado de cada archivo según se
+    termina (o en el orden de entrada si `ordenado` es True).
+
+    Parámetros:
+        archivos (list): Rutas de los archivos de entrada.
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+        carpeta_salida (str): Carpeta donde se escribirán los resultados.
+        operacion (str): "codificar" o "decodificar".
+        procesos (int): Número de procesos (por defecto, uno por núcleo).
+        ordenado (bool): Si es True, los resultados salen en el orden de entrada.
+        tamano_bloque (int): Número de caracteres leídos en cada bloque.
+
+    Retorna:
+        generator: Diccionarios con el resultado de cada archivo (ver `_procesar_tarea`).
+
+    Lanza:
+        ValueError: Si la operación no es válida o alguna ruta de salida es
+            uno de los archivos de entrada.
+    """
+    if operacion not in ("codificar", "decodificar"):
+        raise ValueError(f"Operación no válida: {operacion}")
+
+    destinos = rutas_de_salida(archivos, carpeta_salida)
+    # Escribir en un archivo de entrada lo vaciaría antes de leerlo
+    entradas = {os.path.realpath(origen) for origen in archivos}
+    for destino in destinos:
+        if os.path.realpath(destino) in entradas:
+            raise ValueError(f"La salida {destino} es uno de los archivos de entrada; "
+                             "elige otra carpeta de salida")
+
+    clave = compilar_clave(clave)
+    tareas = [(operacion, origen, destino, tamano_bloque)
+              for origen, destino in zip(archivos, destinos)]
+    procesos = procesos or os.cpu_count() or 1
+
+    # Solo el diccionario de la clave viaja a cada trabajador, una vez
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(dict(clave),)) as ejecutor:
+        if ordenado:
+            # Agrupamos tareas para no pagar un viaje entre procesos por cada archivo pequeño
+            trozo = max(1, len(tareas) // (procesos * 8))
+            yield from ejecutor.map(_procesar_tarea, tareas, chunksize=trozo)
+        else:
+            futuros = [ejecutor.submit(_procesar_tarea, tarea) for tarea in tareas]
+            for futuro in as_completed(futuros):
+                yield futuro.result()
+
+
+class ResumenLote:
+    """Acumula estadísticas de un lote para informar del rendimiento total."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.archivos = 0
+        self.errores = 0
+        self.bytes = 0
+
+    def anadir(self, resultado: dict):
+        """Suma el resultado de un archivo al resumen."""
+        self.archivos += 1
+        if resultado["error"]:
+            self.errores += 1
+        else:
+            self.bytes += resultado["bytes"]
+
+    def mostrar_info(self) -> str:
+        """Devuelve una cadena con el resumen y el rendimiento agregado."""
+        segundos = time.perf_counter() - self.inicio
+        megas = self.bytes / 1024 ** 2
+        return (
+            f"{self.archivos} archivos ({self.errores} con error) | "
+            f"{megas:.1f} MB en {segundos:.2f} s | "
+            f"{megas / segundos if segundos else 0:.1f} MB/s | "
+            f"{self.archivos / segundos if segundos else 0:.1f} archivos/s"
+        )
@@ -0,0 +1,166 @@
+"""
+Decodificación de archivos grandes mapeados en memoria.
+
+En UTF-8 cada emoji ocupa 4 bytes o más, así que un texto cifrado pesa
+varias veces lo que el original. `decodificar_archivo` lee el archivo como
+texto por bloques: cada bloque se convierte en un `str` de Python (hasta 4
+bytes por carácter en memoria) antes de decodificarlo.
+
+`decodificar_archivo_mmap` no crea ese texto: abre el archivo con `mmap` y
+recorre directamente sus bytes con una expresión regular de bytes generada a
+partir de un trie de bytes de la clave (`TrieBytes`). El trie se convierte en
+alternativas anidadas (un byte y después los hijos de ese nodo), así que en
+cada posición la expresión se queda con el emoji más largo, igual que la
+búsqueda voraz de `CompiledKey`. Como en UTF-8 ningún carácter empieza por un
+byte de continuación, una coincidencia nunca empieza a mitad de un carácter.
+
+Los bytes que no forman un emoji de la clave se copian tal cual y el
+resultado se escribe con un `io.BufferedWriter`, de modo que la memoria usada
+no depende del tamaño del archivo.
+"""
+
+import io
+import mmap
+import os
+import re
+import sys
+
+from .clave import FIN_TRIE, compilar_clave
+from .flujo import comprobar_destino
+
+
+# Tamaño del búfer de escritura
+TAMANO_BUFFER = 1024 * 1024
+
+# Trozos que se juntan antes de pasarlos al búfer de escritura
+TROZOS_POR_ESCRITURA = 4096
+
+
+class TrieBytes:
+    """Trie de los emojis de una clave, byte a byte en UTF-8.
+
+    Cada nodo es un diccionario que va de un byte (int) al siguiente nodo;
+    el nodo donde termina un emoji guarda en `FIN_TRIE` los bytes UTF-8 del
+    carácter original.
+
+    Atributos:
+        raiz (dict): Nodo raíz.
+        inversa (dict): Bytes del emoji → bytes del carácter original.
+    """
+
+    def __init__(self, clave):
+        clave = compilar_clave(clave)
+        self.inversa = {
+            em.encode("utf-8", "surrogatepass"): c.encode("utf-8", "surrogatepass")
+            for em, c in clave.inversa.items()
+        }
+        self.raiz = {}
+        for em, c in self.inversa.items():
+            nodo = self.raiz
+            for byte in em:
+                nodo = nodo.setdefault(byte, {})
+            nodo[FIN_TRIE] = c
+
+    def patron(self) -> re.Pattern:
+        """Expresión regular de bytes equivalente a la búsqueda voraz en el trie.
+
+        Retorna:
+            re.Pattern: Patrón que encaja con el emoji más largo en cada posición
+            (o None si la clave no tiene emojis).
+        """
+        if not self.raiz:
+            return None
+        return re.compile(_patron_nodo(self.raiz), re.DOTALL)
+
+
+def _patron_nodo(nodo: dict) -> bytes:
+    """Patrón de los hijos de un nodo: (?:byte hijo|byte hijo...)."""
+    ramas = []
+    for byte, hijo in sorted((b, h) for b, h in nodo.items() if b is not FIN_TRIE):
+        rama = re.escape(bytes([byte]))
+        if len(hijo) > (FIN_TRIE in hijo):
+            # Los hijos empiezan por bytes distintos: como mucho encaja uno, y el
+            # `?` solo se usa si no sigue ninguno (el emoji más largo gana)
+            rama += b"(?:" + _patron_nodo(hijo) + b")" + (b"?" if FIN_TRIE in hijo else b"")
+        ramas.append(rama)
+    return b"|".join(ramas)
+
+
+def decodificar_mmap(datos, trie: TrieBytes, escribir, tamano_buffer: int = TAMANO_BUFFER) -> int:
+    """
+    Decodifica unos bytes UTF-8 (por ejemplo un `mmap`) sin crear un `str`.
+
+    Los trozos sin emojis se pasan a `escribir` como vistas de memoria, sin
+    copiarlos.
+
+    Parámetros:
+        datos (bytes-like): Texto codificado en UTF-8.
+        trie (TrieBytes): Trie de bytes de la clave.
+        escribir (callable): Recibe los bytes decodificados, por trozos.
+        tamano_buffer (int): Bytes que se acumulan como mucho antes de escribir.
+
+    Retorna:
+        int: Número de bytes leídos.
+    """
+    patron = trie.patron()
+    inversa = trie.inversa
+    with memoryview(datos) as vista:
+        partes = []
+        acumulado = 0
+        ultimo = 0
+        coincidencias = patron.finditer(datos) if patron is not None else ()
+        for coincidencia in coincidencias:
+            inicio, fin = coincidencia.span()
+            if inicio > ultimo:
+                partes.append(vista[ultimo:inicio])
+                acumulado += inicio - ultimo
+            partes.append(inversa[coincidencia.group()])
+            ultimo = fin
+            if len(partes) >= TROZOS_POR_ESCRITURA or acumulado >= tamano_buffer:
+                escribir(b"".join(partes))
+                partes.clear()
+                acumulado = 0
+        partes.append(vista[ultimo:])
+        escribir(b"".join(partes) if len(partes) > 1 else partes[0])
+        partes.clear()
+    return len(datos)
+
+
+def decodificar_archivo_mmap(origen: str, destino: str, clave, tamano_buffer: int = TAMANO_BUFFER) -> int:
+    """
+    Decodifica un archivo abriéndolo con `mmap`, sin convertirlo en texto.
+
+    Da el mismo resultado que `flujo.decodificar_archivo`. La clave puede ser
+    la que devuelve `formato.cargar_clave` (JSON o binaria).
+
+    Parámetros:
+        origen (str): Ruta del archivo codificado con emojis (no admite '-').
+        destino (str): Ruta del archivo decodificado que se va a crear ('-'
+            para la salida estándar).
+        clave (dict o CompiledKey): Clave que mapea caracteres a emojis.
+        tamano_buffer (int): Tamaño del búfer de escritura en bytes.
+
+    Retorna:
+        int: Número de bytes leídos.
+
+    Lanza:
+        ValueError: Si la salida es el propio archivo de entrada.
+    """
+    comprobar_destino(origen, destino)
+    trie = TrieBytes(clave)
+    if destino == "-":
+        sys.stdout.flush()
+        salida = io.BufferedWriter(io.FileIO(sys.stdout.fileno(), "wb", closefd=False), tamano_buffer)
+    else:
+        salida = open(destino, "wb", buffering=tamano_buffer)
+    try:
+        with salida, open(origen, "rb") as entrada:
+            if os.fstat(entrada.fileno()).st_size == 0:
+                return 0  # mmap no admite archivos vacíos
+            with mmap.mmap(entrada.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                return decodificar_mmap(mapa, trie, salida.write, tamano_buffer)
+    except BaseException:
+        # No dejar un archivo a medias
+        if destino != "-" and os.path.exists(destino):
+            os.remove(destino)
+        raise
@@ -0,0 +1,417 @@
+"""
+Índice compacto de nombres de emoji, guardado en un archivo binario.
+
+S10 tenía sus propios diccionarios de palabras en español (S10/emojis.json y
+el `mapping` de `emoji_translate` en S10/prueba.py). Este módulo los junta con
+los nombres de `emoji.EMOJI_DATA` (en español y alias en inglés) en un único
+archivo que se puede abrir con `mmap`: al cargarlo no se analiza JSON ni se
+crean diccionarios, solo se leen la cabecera y unas vistas de memoria.
+
+Formato del archivo (enteros de 32 bits sin signo, little-endian):
+
+    cabecera        MAGIA, versión, nº de entradas, nº de emojis,
+                    bytes de nombres, bytes de emojis
+    off_nombres     (entradas + 1) posiciones de cada nombre en `nombres`
+    emoji_entrada   para cada entrada, el número de su emoji
+    por_emoji       números de entrada ordenados por emoji
+    off_emojis      (emojis + 1) posiciones de cada emoji en `emojis`
+    origen          un byte por entrada (ver ORIGENES)
+    nombres         nombres en UTF-8, ordenados, uno tras otro
+    emojis          emojis en UTF-8, ordenados, uno tras otro
+
+Como los nombres están ordenados, la búsqueda exacta y por prefijo es una
+búsqueda binaria, y la búsqueda aproximada reaprovecha los cálculos de los
+prefijos comunes entre nombres consecutivos.
+
+Construir el índice: `python -m emojicipher indice`.
+"""
+
+import ast
+import json
+import mmap
+import os
+import struct
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+from .traduccion import carpeta_cache, version_emoji
+
+
+# Identificación y versión del formato del archivo
+MAGIA = b"EMJN"
+VERSION_NOMBRES = 1
+_CABECERA = struct.Struct("<4sHHIIII")
+
+# Procedencia de cada nombre, de más a menos prioritaria
+ORIGENES = ("personal", "es", "alias")
+
+# Archivos de S10 con alias personalizados en español
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALIAS_S10_JSON = os.path.join(RAIZ_REPO, "S10", "emojis.json")
+ALIAS_S10_PRUEBA = os.path.join(RAIZ_REPO, "S10", "prueba.py")
+
+
+def normalizar_nombre(texto: str) -> str:
+    """Deja un nombre en la forma en que se guarda en el índice.
+
+    Quita espacios exteriores y los ':' de los extremos, pasa a minúsculas y
+    cambia los espacios interiores por '_' (":Cara Feliz:" → "cara_feliz").
+    """
+    texto = unicodedata.normalize("NFKC", texto.strip()).strip(":").lower()
+    return "_".join(texto.split())
+
+
+def quitar_acentos(texto: str) -> str:
+    """Elimina tildes y diéresis ("montaña" → "montana")."""
+    nfd = unicodedata.normalize("NFD", texto)
+    return "".join(c for c in nfd if not unicodedata.combining(c))
+
+
+# ==================================================================
+# ---------------------- Alias personalizados ----------------------
+# ==================================================================
+
+def alias_de_prueba(ruta: str = ALIAS_S10_PRUEBA) -> dict:
+    """Lee el diccionario `mapping`/`MAPPING` de S10/prueba.py sin ejecutarlo."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        arbol = ast.parse(f.read(), ruta)
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Assign) and any(
+                isinstance(d, ast.Name) and d.id in ("mapping", "MAPPING") for d in nodo.targets):
+            return ast.literal_eval(nodo.value)
+    return {}
+
+
+def alias_personales() -> dict:
+    """Junta los alias de S10/emojis.json y de S10/prueba.py (palabra → emoji).
+
+    Si alguno de los archivos no existe se ignora.
+    """
+    alias = {}
+    try:
+        alias.update(alias_de_prueba())
+    except (OSError, SyntaxError, ValueError):
+        pass
+    try:
+        with open(ALIAS_S10_JSON, "r", encoding="utf-8") as f:
+            alias.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return alias
+
+
+# ==================================================================
+# ---------------------- Construcción ------------------------------
+# ==================================================================
+
+def _entradas(alias: dict) -> list:
+    """Lista ordenada de (nombre, origen, emoji) sin repetidos."""
+    from .traduccion import obtener_indice
+
+    indice = obtener_indice()
+    fuentes = [(0, alias.items())]
+    for origen, idioma in ((1, "es"), (2, "alias")):
+        fuentes.append((origen, ((n[1:-1], em) for n, em in indice.por_nombre[idioma].items())))
+
+    vistos = {}
+    for origen, pares in fuentes:
+        for nombre, em in pares:
+            nombre = normalizar_nombre(nombre)
+            if not nombre or not em:
+                continue
+            # También sin tildes, para encontrar "informacion" o "raton"
+            for variante in {nombre, quitar_acentos(nombre)}:
+                vistos.setdefault((variante, em), origen)
+    return sorted((nombre, origen, em) for (nombre, em), origen in vistos.items())
+
+
+def _enteros(valores) -> bytes:
+    """Empaqueta una secuencia de enteros como uint32 little-endian."""
+    datos = array("I", valores)
+    if sys.byteorder != "little":
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def construir_indice_nombres(ruta: str, alias: dict = None) -> int:
+    """Construye el archivo del índice de nombres.
+
+    Parámetros:
+        ruta (str): Archivo que se va a crear (se sustituye de forma atómica).
+        alias (dict): Alias personalizados palabra → emoji. Por defecto, los
+            de S10 (ver `alias_personales`).
+
+    Retorna:
+        int: Número de entradas del índice.
+    """
+    if alias is None:
+        alias = alias_personales()
+    entradas = _entradas(alias)
+
+    emojis = sorted({em for _, _, em in entradas})
+    numero_emoji = {em: i for i, em in enumerate(emojis)}
+
+    nombres_utf8 = [nombre.encode("utf-8") for nombre, _, _ in entradas]
+    emojis_utf8 = [em.encode("utf-8") for em in emojis]
+
+    def posiciones(trozos):
+        total = 0
+        resultado = [0]
+        for trozo in trozos:
+            total += len(trozo)
+            resultado.append(total)
+        return resultado
+
+    emoji_entrada = [numero_emoji[em] for _, _, em in entradas]
+    por_emoji = sorted(range(len(entradas)), key=lambda i: (emoji_entrada[i], entradas[i][1], entradas[i][0]))
+    blob_nombres = b"".join(nombres_utf8)
+    blob_emojis = b"".join(emojis_utf8)
+
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION_NOMBRES, 0, len(entradas), len(emojis),
+                               len(blob_nombres), len(blob_emojis)))
+        f.write(_enteros(posiciones(nombres_utf8)))
+        f.write(_enteros(emoji_entrada))
+        f.write(_enteros(por_emoji))
+        f.write(_enteros(posiciones(emojis_utf8)))
+        f.write(bytes(origen for _, origen, _ in entradas))
+        f.write(blob_nombres)
+        f.write(blob_emojis)
+    os.replace(temporal, ruta)
+    return len(entradas)
+
+
+# ==================================================================
+# ---------------------- Consulta ----------------------------------
+# ==================================================================
+
+class IndiceNombres:
+    """Índice de nombres de emoji abierto con `mmap` (solo lectura).
+
+    Atributos:
+        ruta (str): Archivo del índice.
+        entradas (int): Número de pares nombre → emoji.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._abrir()
+        except (ValueError, struct.error):
+            self._mapa.close()
+            raise
+
+    def _abrir(self):
+        """Lee la cabecera y crea las vistas sobre cada sección del archivo."""
+        magia, version, _, entradas, emojis, bytes_nombres, bytes_emojis = _CABECERA.unpack_from(self._mapa)
+        if magia != MAGIA or version != VERSION_NOMBRES:
+            raise ValueError("Archivo de índice de nombres no compatible")
+        tamano = (_CABECERA.size + 4 * (3 * entradas + emojis + 2)
+                  + entradas + bytes_nombres + bytes_emojis)
+        if len(self._mapa) != tamano:
+            raise ValueError("Archivo de índice de nombres incompleto")
+
+        self.entradas = entradas
+        vista = memoryview(self._mapa)
+        posicion = _CABECERA.size
+
+        def seccion(longitud, enteros=True):
+            nonlocal posicion
+            tamano = 4 * longitud if enteros else longitud
+            trozo = vista[posicion:posicion + tamano]
+            posicion += tamano
+            if not enteros:
+                return trozo
+            if sys.byteorder == "little":
+                return trozo.cast("I")
+            datos = array("I", trozo)  # En big-endian hay que copiar y dar la vuelta
+            datos.byteswap()
+            return datos
+
+        self._off_nombres = seccion(entradas + 1)
+        self._emoji_entrada = seccion(entradas)
+        self._por_emoji = seccion(entradas)
+        self._off_emojis = seccion(emojis + 1)
+        self._origen = seccion(entradas, enteros=False)
+        self._nombres = seccion(bytes_nombres, enteros=False)
+        self._emojis = seccion(bytes_emojis, enteros=False)
+
+    def cerrar(self):
+        """Libera el archivo mapeado en memoria."""
+        for atributo in ("_off_nombres", "_emoji_entrada", "_por_emoji", "_off_emojis",
+                         "_origen", "_nombres", "_emojis"):
+            vista = getattr(self, atributo, None)
+            if isinstance(vista, memoryview):
+                vista.release()
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def __len__(self):
+        return self.entradas
+
+    # --- Acceso a una entrada ---
+    def _nombre_utf8(self, i: int) -> bytes:
+        return self._nombres[self._off_nombres[i]:self._off_nombres[i + 1]].tobytes()
+
+    def nombre(self, i: int) -> str:
+        """Nombre de la entrada `i`."""
+        return self._nombre_utf8(i).decode("utf-8")
+
+    def emoji(self, i: int) -> str:
+        """Emoji de la entrada `i`."""
+        numero = self._emoji_entrada[i]
+        return self._emojis[self._off_emojis[numero]:self._off_emojis[numero + 1]].tobytes().decode("utf-8")
+
+    def origen(self, i: int) -> str:
+        """Procedencia de la entrada `i` ("personal", "es" o "alias")."""
+        return ORIGENES[self._origen[i]]
+
+    def _primera_desde(self, clave: bytes) -> int:
+        """Primera entrada cuyo nombre (en UTF-8) es >= `clave`."""
+        return bisect_left(range(self.entradas), clave, key=self._nombre_utf8)
+
+    # --- Búsquedas ---
+    def emoji_de(self, nombre: str):
+        """Devuelve el emoji de un nombre, o None si no existe.
+
+        Si el nombre tiene varios emojis, gana el de origen más prioritario
+        (primero los alias personales, luego español y luego inglés).
+        """
+        nombre = normalizar_nombre(nombre)
+        for candidato in dict.fromkeys((nombre, quitar_acentos(nombre))):
+            clave = candidato.encode("utf-8")
+            i = self._primera_desde(clave)
+            mejor = None
+            while i < self.entradas and self._nombre_utf8(i) == clave:
+                if mejor is None or self._origen[i] < self._origen[mejor]:
+                    mejor = i
+                i += 1
+            if mejor is not None:
+                return self.emoji(mejor)
+        return None
+
+    def nombre_de(self, em: str):
+        """Devuelve el nombre más prioritario de un emoji, o None si no existe."""
+        objetivo = em.strip().encode("utf-8")
+
+        def emoji_utf8(posicion):
+            numero = self._emoji_entrada[self._por_emoji[posicion]]
+            return self._emojis[self._off_emojis[numero]:self._off_emojis[numero + 1]].tobytes()
+
+        posicion = bisect_left(range(self.entradas), objetivo, key=emoji_utf8)
+        if posicion < self.entradas and emoji_utf8(posicion) == objetivo:
+            return self.nombre(self._por_emoji[posicion])
+        return None
+
+    def buscar_prefijo(self, prefijo: str, limite: int = 20) -> list:
+        """Nombres que empiezan por `prefijo`, en orden alfabético.
+
+        Parámetros:
+            prefijo (str): Comienzo del nombre.
+            limite (int): Número máximo de resultados.
+
+        Retorna:
+            list: Pares (nombre, emoji).
+        """
+        clave = normalizar_nombre(prefijo).encode("utf-8")
+        resultado = []
+        i = self._primera_desde(clave)
+        while i < self.entradas and len(resultado) < limite:
+            nombre = self._nombre_utf8(i)
+            if not nombre.startswith(clave):
+                break
+            resultado.append((nombre.decode("utf-8"), self.emoji(i)))
+            i += 1
+        return resultado
+
+    def buscar_difuso(self, texto: str, distancia: int = 2, limite: int = 10) -> list:
+        """Nombres a una distancia de edición (Levenshtein) de `texto` o menos.
+
+        Recorre los nombres en orden: las filas de la tabla de distancias de
+        un prefijo se reutilizan para todos los nombres que lo comparten, y si
+        un prefijo ya está demasiado lejos se saltan (con una búsqueda
+        binaria) todos los nombres que empiezan por él.
+
+        Parámetros:
+            texto (str): Nombre aproximado.
+            distancia (int): Distancia de edición máxima.
+            limite (int): Número máximo de resultados.
+
+        Retorna:
+            list: Tuplas (nombre, emoji, distancia), de la más cercana a la más lejana.
+        """
+        objetivo = normalizar_nombre(texto)
+        m = len(objetivo)
+        tope = distancia + 1
+        filas = [[min(j, tope) for j in range(m + 1)]]
+        anterior = ""
+        encontrados = []
+
+        i = 0
+        while i < self.entradas:
+            nombre = self.nombre(i)
+            comun = 0
+            maximo = min(len(anterior), len(nombre))
+            while comun < maximo and anterior[comun] == nombre[comun]:
+                comun += 1
+            del filas[comun + 1:]
+
+            podado = False
+            for profundidad in range(comun, len(nombre)):
+                letra = nombre[profundidad]
+                previa = filas[-1]
+                # Solo importan las celdas a `distancia` o menos de la diagonal;
+                # el resto se deja en `tope` (ya demasiado lejos)
+                fila = [tope] * (m + 1)
+                fila[0] = min(profundidad + 1, tope)
+                for j in range(max(1, profundidad + 1 - distancia), min(m, profundidad + 1 + distancia) + 1):
+                    fila[j] = min(previa[j] + 1, fila[j - 1] + 1,
+                                  previa[j - 1] + (objetivo[j - 1] != letra), tope)
+                filas.append(fila)
+                if min(fila) == tope:
+                    # Ningún nombre que empiece así puede quedar cerca: se saltan todos
+                    anterior = nombre[:profundidad + 1]
+                    i = self._primera_desde(anterior.encode("utf-8") + b"\xff")
+                    podado = True
+                    break
+
+            if not podado:
+                if filas[-1][m] <= distancia:
+                    encontrados.append((filas[-1][m], self._origen[i], nombre, self.emoji(i)))
+                anterior = nombre
+                i += 1
+
+        encontrados.sort()
+        return [(nombre, em, d) for d, _, nombre, em in encontrados[:limite]]
+
+
+# ==================================================================
+# ---------------------- Índice en caché ---------------------------
+# ==================================================================
+
+def ruta_indice_nombres() -> str:
+    """Ruta del índice de nombres en caché para la versión instalada de `emoji`."""
+    return os.path.join(carpeta_cache(), f"nombres_emoji-{version_emoji()}-v{VERSION_NOMBRES}.idx")
+
+
+@lru_cache(maxsize=1)
+def obtener_indice_nombres() -> IndiceNombres:
+    """Abre el índice de nombres, construyéndolo la primera vez."""
+    ruta = ruta_indice_nombres()
+    try:
+        return IndiceNombres(ruta)
+    except (OSError, ValueError):
+        construir_indice_nombres(ruta)
+        return IndiceNombres(ruta)
@@ -0,0 +1,477 @@
+"""
+Servidor HTTP de EmojiCipher con asyncio (TCP o socket Unix).
+
+Los servicios que necesitan cifrar o descifrar por red no pueden usar las
+aplicaciones de tkinter. `Servidor` expone el núcleo sin interfaz gráfica con
+tres rutas, todas por POST y con JSON en UTF-8:
+
+    POST /encode     {"texto": "hola", "clave": "<id del llavero>"}
+    POST /decode     {"texto": "🐶🐱...", "clave": "<id del llavero>"}
+    POST /translate  {"texto": "hola perro"}
+
+La clave puede ser el identificador de una clave del llavero o la clave
+entera como objeto JSON; en ese caso se rechaza (400) si tiene algún
+problema de `validar_clave` (caracteres sin emoji o de varios caracteres,
+emojis repetidos o prefijos de otros). La respuesta es {"resultado": "..."} o, si algo
+falla, {"error": "..."} con el código HTTP correspondiente. `GET /salud`
+responde {"estado": "ok"}.
+
+Las claves compiladas se guardan en memoria: las del llavero en su caché LRU
+(`Llavero.obtener`) y las que llegan en la petición en la de
+`compilar_clave`. Los textos pequeños se procesan en el propio bucle de
+eventos, que es más rápido que mandarlos a otro proceso; a partir de
+`UMBRAL_PROCESOS` caracteres el trabajo se envía a un `ProcessPoolExecutor`
+para no bloquear al resto de conexiones. El índice de traducción se carga
+(o se construye) en un hilo al arrancar, antes de aceptar conexiones, para
+que no lo haga el primer /translate dentro del bucle de eventos.
+
+Las conexiones son persistentes (HTTP/1.1 keep-alive) y admiten pipelining:
+el cliente puede enviar varias peticiones seguidas sin esperar respuesta.
+Cada petición se empieza a procesar en cuanto se lee y las respuestas se
+escriben en el mismo orden en que llegaron las peticiones.
+
+`ClienteEmojiCipher` es un cliente asyncio mínimo que sirve para probar el
+servidor en local o como sustituto del cliente de los servicios.
+
+Ejecutar: `python -m emojicipher servir --puerto 8765`
+       `python -m emojicipher servir --unix /tmp/emojicipher.sock`
+"""
+
+import asyncio
+import json
+import os
+import signal
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from .clave import compilar_clave
+from .core import traducir_texto
+from .llavero import Llavero
+
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+
+# Caracteres a partir de los cuales el trabajo se envía al grupo de procesos
+UMBRAL_PROCESOS = 256 * 1024
+
+# Tamaño máximo del cuerpo de una petición, en bytes
+MAX_CUERPO = 64 * 1024 * 1024
+
+# Peticiones de una misma conexión que se procesan a la vez (pipelining)
+MAX_PIPELINE = 64
+
+# Segundos sin recibir nada antes de cerrar una conexión
+TIEMPO_INACTIVIDAD = 60
+
+_TIPO_JSON = "application/json; charset=utf-8"
+
+
+class ErrorHTTP(Exception):
+    """Petición que se responde con un código de error.
+
+    Atributos:
+        estado (HTTPStatus): Código de la respuesta.
+    """
+
+    def __init__(self, estado: HTTPStatus, mensaje: str = None):
+        super().__init__(mensaje or estado.phrase)
+        self.estado = estado
+
+
+# ================================================================
+# ---------------------------- HTTP ------------------------------
+# ================================================================
+
+async def leer_cabeceras(lector: asyncio.StreamReader) -> tuple:
+    """
+    Lee la primera línea y las cabeceras de un mensaje HTTP.
+
+    Retorna:
+        tuple: (palabras de la primera línea, diccionario de cabeceras en
+        minúsculas), o None si la conexión se ha cerrado antes de empezar.
+
+    Lanza:
+        ErrorHTTP: Si el mensaje está mal formado.
+    """
+    linea = await lector.readline()
+    while linea in (b"\r\n", b"\n"):
+        linea = await lector.readline()  # se permiten líneas vacías entre mensajes
+    if not linea:
+        return None
+    primera = linea.decode("latin-1").split(None, 2)
+    if len(primera) < 2:
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Primera línea HTTP mal formada")
+
+    cabeceras = {}
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b"\n"):
+            return primera, cabeceras
+        nombre, separador, valor = linea.decode("latin-1").partition(":")
+        if not separador:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Cabecera HTTP mal formada")
+        cabeceras[nombre.strip().lower()] = valor.strip()
+
+
+async def leer_cuerpo(lector: asyncio.StreamReader, cabeceras: dict) -> bytes:
+    """Lee el cuerpo indicado por Content-Length (no se admite chunked)."""
+    if "chunked" in cabeceras.get("transfer-encoding", "").lower():
+        raise ErrorHTTP(HTTPStatus.LENGTH_REQUIRED, "Se necesita Content-Length")
+    try:
+        longitud = int(cabeceras.get("content-length", "0"))
+    except ValueError:
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Content-Length no válido") from None
+    if longitud < 0:
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Content-Length no válido")
+    if longitud > MAX_CUERPO:
+        raise ErrorHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return await lector.readexactly(longitud)
+
+
+def conexion_persistente(version: str, cabeceras: dict) -> bool:
+    """Indica si la conexión sigue abierta después de este mensaje."""
+    conexion = cabeceras.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return conexion == "keep-alive"
+    return conexion != "close"
+
+
+def respuesta_http(estado: HTTPStatus, datos: dict, cerrar: bool = False) -> bytes:
+    """Construye una respuesta HTTP/1.1 con un cuerpo JSON."""
+    cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    cabecera = (
+        f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+        f"Content-Type: {_TIPO_JSON}\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n"
+        f"{'Connection: close' if cerrar else 'Connection: keep-alive'}\r\n\r\n"
+    )
+    return cabecera.encode("latin-1") + cuerpo
+
+
+# ================================================================
+# ------------------------ Operaciones ---------------------------
+# ================================================================
+
+def ejecutar_operacion(operacion: str, texto: str, clave: dict = None) -> str:
+    """
+    Ejecuta una operación sobre un texto (también en los procesos trabajadores).
+
+    Parámetros:
+        operacion (str): 'encode', 'decode' o 'translate'.
+        texto (str): Texto de entrada.
+        clave (dict o CompiledKey): Clave (no se usa al traducir).
+
+    Retorna:
+        str: Resultado de la operación.
+    """
+    if operacion == "translate":
+        return traducir_texto(texto)
+    # En un proceso trabajador la clave llega como diccionario: compilar_clave
+    # la guarda compilada para las peticiones siguientes con la misma clave
+    clave = compilar_clave(clave)
+    return clave.codificar(texto) if operacion == "encode" else clave.decodificar(texto)
+
+
+class Servidor:
+    """Servidor HTTP asyncio para codificar, decodificar y traducir.
+
+    Atributos:
+        llavero (Llavero): Llavero del que salen las claves por identificador.
+        procesos (int): Procesos trabajadores para los trabajos grandes.
+        umbral (int): Caracteres a partir de los cuales se usan los procesos.
+    """
+
+    OPERACIONES = ("encode", "decode", "translate")
+
+    def __init__(self, llavero: Llavero = None, procesos: int = None, umbral: int = UMBRAL_PROCESOS):
+        self.llavero = llavero if llavero is not None else Llavero()
+        self.procesos = procesos or os.cpu_count() or 1
+        self.umbral = umbral
+        self._grupo = None
+        self._servidor = None
+
+    # --- Arranque y parada ---
+    async def iniciar(self, host: str = HOST, puerto: int = PUERTO, unix: str = None):
+        """
+        Empieza a aceptar conexiones por TCP o, si se indica `unix`, por un socket Unix.
+
+        Retorna:
+            asyncio.Server: Servidor de asyncio (sus `sockets` dan la dirección real).
+        """
+        self._grupo = ProcessPoolExecutor(max_workers=self.procesos)
+        # Índice de traducción y traducción de documentos listos antes del
+        # primer /translate, que se procesaría dentro del bucle de eventos
+        await asyncio.get_running_loop().run_in_executor(None, traducir_texto, "hola 🐶")
+        if unix:
+            if os.path.exists(unix) and stat.S_ISSOCK(os.stat(unix).st_mode):
+                os.remove(unix)  # socket de una ejecución anterior
+            self._servidor = await asyncio.start_unix_server(self._atender, unix)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor
+
+    async def servir(self, host: str = HOST, puerto: int = PUERTO, unix: str = None, al_iniciar=None):
+        """Arranca el servidor y atiende peticiones hasta que se cancele o
+        llegue SIGINT o SIGTERM.
+
+        Parámetros:
+            al_iniciar (callable): Se llama con el `asyncio.Server` ya escuchando.
+        """
+        servidor = await self.iniciar(host, puerto, unix)
+        bucle = asyncio.get_running_loop()
+        tarea = asyncio.current_task()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                bucle.add_signal_handler(senal, tarea.cancel)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows o un hilo que no es el principal
+        if al_iniciar is not None:
+            al_iniciar(servidor)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for senal in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    bucle.remove_signal_handler(senal)
+                except (NotImplementedError, RuntimeError):
+                    pass
+            await self.cerrar()
+            if unix and os.path.exists(unix):
+                os.remove(unix)
+
+    async def cerrar(self):
+        """Deja de aceptar conexiones y apaga los procesos trabajadores."""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        if self._grupo is not None:
+            self._grupo.shutdown(cancel_futures=True)
+            self._grupo = None
+
+    # --- Conexiones ---
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atiende una conexión: lee peticiones y escribe las respuestas en orden."""
+        cola = asyncio.Queue()
+        en_curso = asyncio.Semaphore(MAX_PIPELINE)
+        lectura = asyncio.create_task(self._leer_peticiones(lector, cola, en_curso))
+        # Cuando se acaba la lectura (por el motivo que sea) se avisa al bucle de escritura
+        lectura.add_done_callback(lambda _: cola.put_nowait(None))
+        try:
+            while True:
+                elemento = await cola.get()
+                if elemento is None:
+                    break
+                respuesta, cerrar = elemento
+                escritor.write(await respuesta)
+                await escritor.drain()
+                en_curso.release()
+                if cerrar:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            lectura.cancel()
+            escritor.close()
+
+    async def _leer_peticiones(self, lector: asyncio.StreamReader, cola: asyncio.Queue,
+                               en_curso: asyncio.Semaphore):
+        """Lee peticiones de una conexión y las pone a procesar en orden de llegada."""
+        try:
+            while True:
+                cabecera = await asyncio.wait_for(leer_cabeceras(lector), TIEMPO_INACTIVIDAD)
+                if cabecera is None:
+                    return
+                (metodo, ruta, *version), cabeceras = cabecera
+                cuerpo = await leer_cuerpo(lector, cabeceras)
+                cerrar = not conexion_persistente(version[0] if version else "HTTP/1.0", cabeceras)
+                # Con MAX_PIPELINE peticiones sin responder se deja de leer
+                await en_curso.acquire()
+                cola.put_nowait((asyncio.ensure_future(self._responder(metodo, ruta, cuerpo, cerrar)), cerrar))
+                if cerrar:
+                    return
+        except ErrorHTTP as e:
+            cola.put_nowait((_terminada(respuesta_http(e.estado, {"error": str(e)}, cerrar=True)), True))
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, ConnectionError):
+            pass  # conexión inactiva, cortada o con líneas demasiado largas
+
+    async def _responder(self, metodo: str, ruta: str, cuerpo: bytes, cerrar: bool) -> bytes:
+        """Procesa una petición y devuelve la respuesta HTTP completa."""
+        try:
+            resultado = await self.procesar(metodo, ruta, cuerpo)
+            return respuesta_http(HTTPStatus.OK, resultado, cerrar)
+        except ErrorHTTP as e:
+            return respuesta_http(e.estado, {"error": str(e)}, cerrar)
+        except Exception as e:
+            return respuesta_http(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}, cerrar)
+
+    # --- Peticiones ---
+    async def procesar(self, metodo: str, ruta: str, cuerpo: bytes) -> dict:
+        """
+        Procesa una petición ya leída.
+
+        Parámetros:
+            metodo (str): Método HTTP.
+            ruta (str): Ruta pedida (se ignora la consulta tras '?').
+            cuerpo (bytes): Cuerpo JSON de la petición.
+
+        Retorna:
+            dict: Datos de la respuesta.
+
+        Lanza:
+            ErrorHTTP: Si la petición no es válida.
+        """
+        operacion = ruta.split("?", 1)[0].strip("/")
+        if operacion == "salud" and metodo in ("GET", "HEAD"):
+            return {"estado": "ok"}
+        if operacion not in self.OPERACIONES:
+            raise ErrorHTTP(HTTPStatus.NOT_FOUND, f"No existe la ruta {ruta}")
+        if metodo != "POST":
+            raise ErrorHTTP(HTTPStatus.METHOD_NOT_ALLOWED, f"{ruta} solo admite POST")
+
+        try:
+            datos = json.loads(cuerpo)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, f"JSON no válido: {e}") from None
+        texto = datos.get("texto") if isinstance(datos, dict) else None
+        if not isinstance(texto, str):
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Falta el campo 'texto'")
+
+        clave = None
+        if operacion != "translate":
+            clave = self.obtener_clave(datos.get("clave"))
+
+        if len(texto) < self.umbral or self._grupo is None:
+            return {"resultado": ejecutar_operacion(operacion, texto, clave)}
+        # Al proceso trabajador se le manda el diccionario, que se copia más rápido
+        clave = clave.clave if clave is not None else None
+        resultado = await asyncio.get_running_loop().run_in_executor(
+            self._grupo, ejecutar_operacion, operacion, texto, clave)
+        return {"resultado": resultado}
+
+    def obtener_clave(self, clave):
+        """
+        Devuelve la clave compilada de una petición.
+
+        Parámetros:
+            clave (str o dict): Identificador en el llavero o clave completa.
+
+        Retorna:
+            CompiledKey: Clave compilada (sale de caché si se ha usado hace poco).
+
+        Las claves que llegan en la petición tienen que estar libres de
+        problemas (ver `CompiledKey.problemas`): un carácter sin emoji, por
+        ejemplo, desaparecería del texto sin avisar.
+
+        Lanza:
+            ErrorHTTP: Si falta la clave, no existe o no es válida.
+        """
+        if isinstance(clave, str):
+            try:
+                return self.llavero.obtener(clave)
+            except KeyError:
+                raise ErrorHTTP(HTTPStatus.NOT_FOUND, f"No existe la clave {clave}") from None
+        if isinstance(clave, dict) and clave and all(
+                isinstance(c, str) and isinstance(em, str) for c, em in clave.items()):
+            compilada = compilar_clave(clave)
+            if compilada.problemas:
+                raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "\n".join(compilada.problemas))
+            return compilada
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Falta el campo 'clave' (identificador o diccionario)")
+
+
+def _terminada(valor) -> asyncio.Future:
+    """Futuro ya resuelto con `valor`."""
+    futuro = asyncio.get_running_loop().create_future()
+    futuro.set_result(valor)
+    return futuro
+
+
+# ================================================================
+# --------------------------- Cliente ----------------------------
+# ================================================================
+
+class ClienteEmojiCipher:
+    """Cliente asyncio del servidor, con conexión persistente y pipelining.
+
+    `enviar` escribe una petición sin esperar la respuesta y `recibir` lee la
+    respuesta siguiente, así que se pueden tener varias peticiones en vuelo:
+
+        cliente = await ClienteEmojiCipher.conectar(puerto=8765)
+        for texto in textos:
+            cliente.enviar("/encode", {"texto": texto, "clave": "cliente42"})
+        resultados = [await cliente.recibir() for _ in textos]
+    """
+
+    def __init__(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.lector = lector
+        self.escritor = escritor
+
+    @classmethod
+    async def conectar(cls, host: str = HOST, puerto: int = PUERTO, unix: str = None):
+        """Abre una conexión por TCP o por un socket Unix."""
+        if unix:
+            lector, escritor = await asyncio.open_unix_connection(unix)
+        else:
+            lector, escritor = await asyncio.open_connection(host, puerto)
+        return cls(lector, escritor)
+
+    def enviar(self, ruta: str, datos: dict):
+        """Escribe una petición POST sin esperar la respuesta."""
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        cabecera = (f"POST {ruta} HTTP/1.1\r\nHost: emojicipher\r\n"
+                    f"Content-Type: {_TIPO_JSON}\r\nContent-Length: {len(cuerpo)}\r\n\r\n")
+        self.escritor.write(cabecera.encode("latin-1") + cuerpo)
+
+    async def recibir(self) -> tuple:
+        """
+        Lee la siguiente respuesta.
+
+        Retorna:
+            tuple: (código HTTP, datos JSON de la respuesta).
+
+        Lanza:
+            ConnectionError: Si el servidor ha cerrado la conexión.
+        """
+        await self.escritor.drain()
+        cabecera = await leer_cabeceras(self.lector)
+        if cabecera is None:
+            raise ConnectionError("El servidor ha cerrado la conexión")
+        (_, estado, *_), cabeceras = cabecera
+        cuerpo = await leer_cuerpo(self.lector, cabeceras)
+        return int(estado), json.loads(cuerpo)
+
+    async def pedir(self, ruta: str, datos: dict) -> str:
+        """
+        Envía una petición, espera la respuesta y devuelve el resultado.
+
+        Lanza:
+            ValueError: Si el servidor responde con un error.
+        """
+        self.enviar(ruta, datos)
+        estado, respuesta = await self.recibir()
+        if estado != HTTPStatus.OK:
+            raise ValueError(f"{estado}: {respuesta.get('error')}")
+        return respuesta["resultado"]
+
+    async def codificar(self, texto: str, clave) -> str:
+        return await self.pedir("/encode", {"texto": texto, "clave": clave})
+
+    async def decodificar(self, texto: str, clave) -> str:
+        return await self.pedir("/decode", {"texto": texto, "clave": clave})
+
+    async def traducir(self, texto: str) -> str:
+        return await self.pedir("/translate", {"texto": texto})
+
+    async def cerrar(self):
+        """Cierra la conexión."""
+        self.escritor.close()
+        try:
+            await self.escritor.wait_closed()
+        except ConnectionError:
+            pass
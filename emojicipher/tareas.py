@@ -0,0 +1,186 @@
+"""
+Tareas largas en segundo plano para las interfaces de tkinter.
+
+tkinter no se puede usar desde otros hilos, y una tarea larga en el hilo de
+la interfaz congela la ventana. `Tarea` ejecuta una función en un hilo aparte
+y el hilo de tkinter consulta su estado cada poco con `after()`: así el
+avance, el resultado y los errores siempre se atienden en el hilo de la
+interfaz.
+
+La función recibe un callable `progreso(hechos, total)` que debe llamar de
+vez en cuando; si se ha pedido cancelar la tarea, `progreso` lanza
+`TareaCancelada` y la función termina en ese punto.
+
+`DialogoProgreso` es una ventana con una barra de progreso y un botón para
+cancelar que se puede conectar a una `Tarea`.
+
+Leer o escribir un texto enorme en un widget `Text` también bloquea la
+ventana, así que `leer_por_partes` y `escribir_por_partes` lo hacen a trozos,
+dejando que tkinter atienda sus eventos entre uno y otro.
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+
+# Milisegundos entre dos consultas del estado de la tarea
+INTERVALO_CONSULTA = 100
+
+# Caracteres que se leen o escriben en un widget en cada paso
+CARACTERES_POR_PASO = 64 * 1024
+
+
+class TareaCancelada(Exception):
+    """Se lanza dentro de la tarea cuando se ha pedido cancelarla."""
+
+
+class Tarea:
+    """Función ejecutada en un hilo aparte y vigilada desde tkinter.
+
+    Atributos:
+        cancelada (threading.Event): Se activa al llamar a `cancelar`.
+        resultado: Lo que devolvió la función (cuando ha terminado).
+        error (Exception): Excepción que lanzó la función, o None.
+    """
+
+    def __init__(self, widget, funcion, al_progresar=None, al_terminar=None, al_fallar=None,
+                 intervalo: int = INTERVALO_CONSULTA):
+        """
+        Parámetros:
+            widget (tk.Misc): Cualquier widget; se usa para programar `after()`.
+            funcion (callable): Recibe `progreso(hechos, total)` y hace el trabajo.
+            al_progresar (callable): Se llama con (hechos, total) en el hilo de tkinter.
+            al_terminar (callable): Se llama con el resultado al acabar bien.
+            al_fallar (callable): Se llama con la excepción si falla o se cancela.
+        """
+        self.widget = widget
+        self.funcion = funcion
+        self.al_progresar = al_progresar
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.intervalo = intervalo
+        self.cancelada = threading.Event()
+        self.resultado = None
+        self.error = None
+        self._avance = None
+        self._hilo = threading.Thread(target=self._ejecutar, daemon=True)
+
+    def iniciar(self) -> "Tarea":
+        """Arranca el hilo y empieza a vigilarlo."""
+        self._hilo.start()
+        self.widget.after(self.intervalo, self._consultar)
+        return self
+
+    def cancelar(self):
+        """Pide que la tarea se detenga en su próxima llamada a `progreso`."""
+        self.cancelada.set()
+
+    def _progreso(self, hechos: int, total: int = None):
+        # Se llama desde el hilo de la tarea: solo se guarda el dato
+        self._avance = (hechos, total)
+        if self.cancelada.is_set():
+            raise TareaCancelada()
+
+    def _ejecutar(self):
+        try:
+            self.resultado = self.funcion(self._progreso)
+        except Exception as e:
+            self.error = e
+
+    def _consultar(self):
+        # En el hilo de tkinter
+        if self._avance is not None and self.al_progresar:
+            self.al_progresar(*self._avance)
+        if self._hilo.is_alive():
+            self.widget.after(self.intervalo, self._consultar)
+        elif self.error is not None:
+            if self.al_fallar:
+                self.al_fallar(self.error)
+        elif self.al_terminar:
+            self.al_terminar(self.resultado)
+
+
+class DialogoProgreso(tk.Toplevel):
+    """Ventana con una barra de progreso y un botón "Cancelar".
+
+    Uso típico: `Tarea(..., al_progresar=dialogo.actualizar)` y cerrar el
+    diálogo en `al_terminar` / `al_fallar`. El botón llama a `cancelar`.
+    """
+
+    def __init__(self, padre, titulo: str, mensaje: str, cancelar=None, colores: dict = None):
+        colores = colores or {}
+        super().__init__(padre, bg=colores.get("fondo"))
+        self.title(titulo)
+        self.resizable(False, False)
+        self.transient(padre)
+        tk.Label(self, text=mensaje, bg=colores.get("fondo"), fg=colores.get("texto")).pack(padx=20, pady=(15, 5))
+        self.barra = ttk.Progressbar(self, length=320, mode="indeterminate")
+        self.barra.pack(padx=20, pady=5)
+        self.barra.start()
+        self.detalle = tk.Label(self, bg=colores.get("fondo"), fg=colores.get("texto"))
+        self.detalle.pack(padx=20)
+        if cancelar:
+            tk.Button(self, text="Cancelar", command=cancelar).pack(pady=(5, 15))
+            self.protocol("WM_DELETE_WINDOW", cancelar)
+
+    def actualizar(self, hechos: int, total: int = None):
+        """Muestra el avance; sin total, la barra se queda en modo indeterminado."""
+        if total:
+            if str(self.barra.cget("mode")) != "determinate":
+                self.barra.stop()
+                self.barra.configure(mode="determinate", maximum=total)
+            self.barra.configure(value=hechos)
+            self.detalle.configure(text=f"{hechos} de {total}")
+        else:
+            self.detalle.configure(text=str(hechos))
+
+
+def leer_por_partes(widget, al_terminar, caracteres: int = CARACTERES_POR_PASO):
+    """
+    Lee todo el texto de un widget `Text` a trozos y se lo pasa a `al_terminar`.
+
+    Parámetros:
+        widget (tk.Text): Widget que se lee.
+        al_terminar (callable): Recibe el texto completo (sin el salto de
+            línea final que añade tkinter).
+        caracteres (int): Caracteres que se leen en cada paso.
+    """
+    partes = []
+
+    def paso(inicio):
+        fin = widget.index(f"{inicio} + {caracteres} chars")
+        parte = widget.get(inicio, fin)
+        if parte and "\ud800" <= parte[-1] <= "\udbff":
+            # No partir un emoji que tkinter guarda como par de sustitutos
+            fin = widget.index(f"{fin} + 1 chars")
+            parte = widget.get(inicio, fin)
+        partes.append(parte)
+        if widget.compare(fin, ">=", "end-1c"):
+            al_terminar("".join(partes))
+        else:
+            widget.after(1, paso, fin)
+
+    paso("1.0")
+
+
+def escribir_por_partes(widget, texto: str, al_terminar=None, caracteres: int = CARACTERES_POR_PASO):
+    """
+    Sustituye el contenido de un widget `Text` escribiéndolo a trozos.
+
+    Parámetros:
+        widget (tk.Text): Widget donde se escribe.
+        texto (str): Texto que se va a mostrar.
+        al_terminar (callable): Se llama sin argumentos al acabar.
+        caracteres (int): Caracteres que se escriben en cada paso.
+    """
+    widget.delete("1.0", tk.END)
+
+    def paso(inicio):
+        widget.insert(tk.END, texto[inicio:inicio + caracteres])
+        if inicio + caracteres < len(texto):
+            widget.after(1, paso, inicio + caracteres)
+        elif al_terminar:
+            al_terminar()
+
+    paso(0)
@@ -0,0 +1,378 @@
+"""
+Índice precalculado para traducir palabra ↔ emoji.
+
+`emoji_translate` llamaba dos veces a `emoji.emojize` y dos veces a
+`emoji.demojize` en cada consulta, y cada llamada recorre la base de datos de
+emojis completa. `IndiceEmoji` guarda el resultado de esas búsquedas en
+diccionarios (nombre → emoji por idioma y emoji → nombre), de modo que cada
+consulta es un acceso directo a un diccionario.
+
+El índice se construye una vez a partir de `emoji.EMOJI_DATA` y se guarda en
+disco (en la carpeta de caché del usuario), así que en los siguientes
+arranques ni siquiera hace falta importar la librería `emoji`.
+
+`traducir_documento` y `traducir_lineas` traducen textos completos en una
+sola pasada: una expresión regular separa palabras, rachas de emojis y el
+resto, y cada token distinto se busca una única vez.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+from .clave import FIN_TRIE, construir_trie
+
+
+# Idiomas que usa emoji_translate, en el orden en que se prueban
+IDIOMAS = ("es", "alias")
+
+# Versión del formato del archivo del índice
+VERSION_INDICE = 1
+
+# Mensajes de emoji_translate
+DESCONOCIDO = "Emoji desconocido"
+
+# Tokens distintos que se recuerdan al traducir documentos antes de vaciar la memoria
+MAX_MEMORIA_TOKENS = 100_000
+
+# Caracteres válidos en un nombre de emoji para `emoji.emojize`. Es una copia
+# de `emoji.core._EMOJI_NAME_PATTERN` (emoji 2.x), que es privado: se usa la
+# de la librería si existe y esta si no
+PATRON_NOMBRE = (
+    "\\w\\-&.\u2019\u201d\u201c()!#*+,/\xab\xbb"
+    "\u0300\u0301\u0302\u0303\u0306\u0308\u030a\u0327"
+    "\u064b\u064e\u064f\u0650\u0653\u0654\u3099\u30fb\u309a\u0655"
+)
+
+
+def carpeta_cache() -> str:
+    """Devuelve la carpeta donde se guardan los índices precalculados.
+
+    Se puede cambiar con la variable de entorno EMOJICIPHER_CACHE.
+    """
+    por_defecto = os.path.join(os.path.expanduser("~"), ".cache", "emojicipher")
+    return os.environ.get("EMOJICIPHER_CACHE", por_defecto)
+
+
+def version_emoji() -> str:
+    """Versión instalada de la librería `emoji`, sin llegar a importarla."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("emoji")
+    except PackageNotFoundError:
+        return "desconocida"
+
+
+class IndiceEmoji:
+    """Índice bidireccional palabra ↔ emoji.
+
+    Atributos:
+        por_nombre (dict): Para cada idioma, diccionario ":nombre:" → emoji.
+        nombres (dict): Para cada idioma, diccionario emoji → ":nombre:".
+        caracteres (set): Caracteres (no ASCII) que aparecen en algún emoji.
+        patron_nombre (str): Caracteres válidos en un nombre de emoji.
+    """
+
+    def __init__(self, por_nombre: dict, nombres: dict, caracteres: set, patron_nombre: str):
+        self.por_nombre = por_nombre
+        self.nombres = nombres
+        self.caracteres = caracteres
+        self.patron_nombre = patron_nombre
+        # Se preparan la primera vez que se traduce un documento
+        self._patron_tokens = None
+        self._trie_emojis = None
+        self._memorias = {}
+
+    @classmethod
+    def construir(cls) -> "IndiceEmoji":
+        """Construye el índice a partir de la librería `emoji`.
+
+        Reproduce las reglas de `emoji.emojize` (el primer emoji
+        "fully_qualified" con ese nombre; en 'alias' los alias tienen
+        prioridad sobre los nombres en inglés) y usa `emoji.demojize` sobre
+        cada emoji para obtener su nombre.
+        """
+        import emoji
+        try:
+            from emoji.core import _EMOJI_NAME_PATTERN as patron_nombre
+        except ImportError:
+            patron_nombre = PATRON_NOMBRE
+
+        for idioma in IDIOMAS:
+            if idioma != "alias":
+                emoji.config.load_language(idioma)
+
+        valido = re.compile(f"[{patron_nombre}]+")
+        cualificado = emoji.STATUS["fully_qualified"]
+
+        es, alias, ingles = {}, {}, {}
+        for em, datos in emoji.EMOJI_DATA.items():
+            if datos["status"] > cualificado:
+                continue
+            if "es" in datos:
+                es.setdefault(datos["es"], em)
+            for nombre in datos.get("alias", []):
+                alias.setdefault(nombre, em)
+            ingles.setdefault(datos["en"], em)
+        ingles.update(alias)
+
+        por_nombre = {}
+        for idioma, tabla in (("es", es), ("alias", ingles)):
+            # emojize solo reconoce nombres formados por caracteres válidos
+            por_nombre[idioma] = {n: em for n, em in tabla.items() if valido.fullmatch(n[1:-1])}
+
+        nombres = {idioma: {} for idioma in IDIOMAS}
+        caracteres = set()
+        for em in emoji.EMOJI_DATA:
+            caracteres.update(c for c in em if not c.isascii())
+            for idioma in IDIOMAS:
+                nombre = emoji.demojize(em, language=idioma)
+                if nombre != em:
+                    nombres[idioma][em] = nombre
+
+        return cls(por_nombre, nombres, caracteres, patron_nombre)
+
+    # --- Persistencia ---
+    def guardar(self, ruta: str):
+        """Guarda el índice en un archivo JSON."""
+        datos = {
+            "version": VERSION_INDICE,
+            "por_nombre": self.por_nombre,
+            "nombres": self.nombres,
+            "caracteres": "".join(sorted(self.caracteres)),
+            "patron_nombre": self.patron_nombre,
+        }
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "IndiceEmoji":
+        """Carga un índice guardado con `guardar`.
+
+        Lanza:
+            ValueError: Si el archivo no tiene el formato esperado.
+        """
+        with open(ruta, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        if datos.get("version") != VERSION_INDICE:
+            raise ValueError("Versión de índice no compatible")
+        return cls(datos["por_nombre"], datos["nombres"], set(datos["caracteres"]), datos["patron_nombre"])
+
+    # --- Consultas ---
+    def emoji_de(self, nombre: str, idioma: str):
+        """Devuelve el emoji de un nombre (sin los ':'), o None si no existe."""
+        return self.por_nombre[idioma].get(":" + unicodedata.normalize("NFKC", nombre) + ":")
+
+    def nombre_de(self, em: str, idioma: str):
+        """Devuelve el nombre (sin los ':') de un emoji, o None si no existe."""
+        nombre = self.nombres[idioma].get(em)
+        return nombre.strip(":") if nombre is not None else None
+
+    def contiene_emoji(self, texto: str) -> bool:
+        """Indica si el texto podría contener algún emoji."""
+        return not self.caracteres.isdisjoint(texto)
+
+    # --- Documentos completos ---
+    def _preparar_documentos(self):
+        """Compila la expresión regular de tokens y el trie de emojis."""
+        clase = "".join(re.escape(c) for c in sorted(self.caracteres))
+        # Un token es una racha de caracteres de emoji, una palabra o cualquier otra cosa
+        self._patron_tokens = re.compile(f"[{clase}]+|\\w+|[^\\w{clase}]+")
+        self._trie_emojis = construir_trie({em: em for em in self.nombres["alias"]})
+
+    def _separar_emojis(self, racha: str):
+        """Divide una racha de caracteres de emoji en emojis (el más largo primero).
+
+        Genera pares (fragmento, es_emoji).
+        """
+        raiz = self._trie_emojis
+        i = 0
+        n = len(racha)
+        while i < n:
+            nodo = raiz
+            fin = i
+            j = i
+            while j < n:
+                nodo = nodo.get(racha[j])
+                if nodo is None:
+                    break
+                j += 1
+                if FIN_TRIE in nodo:
+                    fin = j
+            if fin == i:
+                yield racha[i], False
+                i += 1
+            else:
+                yield racha[i:fin], True
+                i = fin
+
+    def _traducir_token(self, token: str, idiomas: tuple) -> str:
+        """Traduce un token suelto (palabra, racha de emojis u otra cosa)."""
+        if token[0] in self.caracteres:
+            partes = []
+            for fragmento, es_emoji in self._separar_emojis(token):
+                if es_emoji:
+                    for idioma in IDIOMAS:
+                        nombre = self.nombres[idioma].get(fragmento)
+                        if nombre is not None:
+                            fragmento = nombre
+                            break
+                partes.append(fragmento)
+            return "".join(partes)
+
+        if token[0].isalnum() or token[0] == "_":
+            clave = f":{token}:"
+            for idioma in idiomas:
+                tabla = self.por_nombre[idioma]
+                em = tabla.get(clave) or tabla.get(clave.lower())
+                if em is not None:
+                    return em
+        return token
+
+    def traducir_documento(self, texto: str, idiomas: tuple = ("es",)):
+        """Traduce un texto completo token a token, en una sola pasada.
+
+        Las palabras con emoji se cambian por su emoji y los emojis por su
+        nombre (":nombre:"); el resto (espacios, puntuación, palabras sin
+        emoji) se deja igual. Es un generador: devuelve los fragmentos según
+        los traduce. Los tokens repetidos se traducen una sola vez.
+
+        Parámetros:
+            texto (str): Texto a traducir.
+            idiomas (tuple): Idiomas en los que se buscan las palabras. Por
+                defecto solo español, porque los alias en inglés convierten
+                palabras como "de" o "es" en banderas.
+
+        Retorna:
+            generator: Fragmentos (str) del texto traducido.
+        """
+        if self._patron_tokens is None:
+            self._preparar_documentos()
+
+        memoria = self._memorias.get(idiomas)
+        if memoria is None or len(memoria) > MAX_MEMORIA_TOKENS:
+            memoria = self._memorias[idiomas] = _MemoriaTokens(self, idiomas)
+
+        return map(memoria.__getitem__, self._patron_tokens.findall(texto))
+
+
+class _MemoriaTokens(dict):
+    """Diccionario token → traducción que se rellena solo la primera vez."""
+
+    def __init__(self, indice: IndiceEmoji, idiomas: tuple):
+        super().__init__()
+        self.indice = indice
+        self.idiomas = idiomas
+
+    def __missing__(self, token: str) -> str:
+        traduccion = self.indice._traducir_token(token, self.idiomas)
+        self[token] = traduccion
+        return traduccion
+
+
+def ruta_indice() -> str:
+    """Ruta del índice en caché para la versión instalada de `emoji`."""
+    return os.path.join(carpeta_cache(), f"indice_emoji-{version_emoji()}-v{VERSION_INDICE}.json")
+
+
+@lru_cache(maxsize=1)
+def obtener_indice() -> IndiceEmoji:
+    """Devuelve el índice, cargándolo de disco o construyéndolo la primera vez."""
+    ruta = ruta_indice()
+    try:
+        return IndiceEmoji.cargar(ruta)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    indice = IndiceEmoji.construir()
+    try:
+        indice.guardar(ruta)
+    except OSError:
+        pass  # Sin caché en disco: se reconstruirá en el próximo arranque
+    return indice
+
+
+def _traducir_con_libreria(text: str) -> str:
+    """Traducción original con `emoji.emojize`/`emoji.demojize`.
+
+    Solo se usa para los textos que el índice no resuelve y que pueden
+    contener emojis mezclados con otro texto.
+    """
+    import emoji
+
+    for lang in IDIOMAS:
+        em = emoji.emojize(f":{text}:", language=lang)
+        if em != f":{text}:":
+            return em
+
+    for lang in IDIOMAS:
+        dem = emoji.demojize(text, language=lang)
+        if dem != text:
+            return dem.strip(":")
+
+    return DESCONOCIDO
+
+
+@lru_cache(maxsize=4096)
+def traducir(text: str) -> str:
+    """Traduce palabra → emoji o emoji → palabra usando el índice.
+
+    Devuelve lo mismo que la versión original de `emoji_translate`, pero
+    cada consulta es un acceso a diccionario (y las repetidas salen de la
+    caché LRU).
+
+    Parámetros:
+        text (str): Texto o emoji a traducir.
+
+    Retorna:
+        str: Emoji o palabra correspondiente; "Emoji desconocido" si no se reconoce.
+    """
+    text = text.strip()
+    indice = obtener_indice()
+
+    # Palabra → emoji (español o alias en inglés)
+    for lang in IDIOMAS:
+        em = indice.emoji_de(text, lang)
+        if em is not None:
+            return em
+
+    # Emoji → palabra (español o inglés)
+    for lang in IDIOMAS:
+        nombre = indice.nombre_de(text, lang)
+        if nombre is not None:
+            return nombre
+
+    # Texto con emojis mezclados o con ':': se usa la librería como antes
+    if ":" in text or indice.contiene_emoji(text):
+        return _traducir_con_libreria(text)
+
+    return DESCONOCIDO
+
+
+def traducir_documento(texto: str, idiomas: tuple = ("es",)):
+    """Traduce un texto completo (palabras y emojis) usando el índice.
+
+    Ver `IndiceEmoji.traducir_documento`.
+    """
+    return obtener_indice().traducir_documento(texto, idiomas)
+
+
+def traducir_lineas(lineas, idiomas: tuple = ("es",)):
+    """Traduce un documento que llega línea a línea (por ejemplo, un archivo).
+
+    Parámetros:
+        lineas (iterable): Líneas del documento (con su salto de línea).
+        idiomas (tuple): Idiomas en los que se buscan las palabras.
+
+    Retorna:
+        generator: Cada línea ya traducida.
+    """
+    indice = obtener_indice()
+    for linea in lineas:
+        yield "".join(indice.traducir_documento(linea, idiomas))
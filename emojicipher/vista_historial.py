@@ -0,0 +1,210 @@
+"""
+Visor del historial para tkinter que solo dibuja los registros visibles.
+
+`mostrar_historial` borraba el `ScrolledText` y volvía a insertar todos los
+registros cada vez, así que con miles de registros la ventana se quedaba
+congelada. `VisorHistorial` muestra un `Text` con solo los registros que
+caben en pantalla y una barra de desplazamiento propia que representa el
+historial completo: al desplazarse se leen de disco las páginas necesarias
+(con una caché de páginas recientes) y se vuelve a dibujar solo esa ventana.
+
+Los registros nuevos aparecen sin redibujarlo todo y el cuadro de búsqueda
+usa el índice del historial (`IndiceHistorial`) en lugar de recorrer los
+registros; admite filtros como "tipo:dec pedido fecha:semana".
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+
+from .core import formatear_registro
+from .historial import AlmacenHistorial
+from .indice_historial import IndiceHistorial
+from .llavero import CacheLRU
+
+
+# Registros por página que se leen de disco de una vez
+REGISTROS_POR_PAGINA = 50
+
+# Páginas que se guardan en memoria
+PAGINAS_EN_CACHE = 32
+
+# Líneas que ocupa como mínimo un registro formateado
+LINEAS_POR_REGISTRO = 5
+
+# Milisegundos que se espera tras teclear antes de buscar
+ESPERA_BUSQUEDA = 200
+
+
+class VisorHistorial(tk.Frame):
+    """Vista del historial con desplazamiento virtual y búsqueda.
+
+    Los registros se muestran del más reciente al más antiguo. Cuando hay
+    una búsqueda activa solo se recorren los registros encontrados.
+
+    Atributos:
+        almacen (AlmacenHistorial): Historial que se muestra.
+        indice (IndiceHistorial): Índice para la búsqueda.
+        texto (tk.Text): Widget donde se dibujan los registros visibles.
+    """
+
+    def __init__(self, padre, almacen: AlmacenHistorial, indice: IndiceHistorial = None,
+                 colores: dict = None, **opciones_texto):
+        colores = colores or {}
+        super().__init__(padre, bg=colores.get("fondo"))
+        self.almacen = almacen
+        self.indice = indice or IndiceHistorial(almacen)
+        self._paginas = CacheLRU(PAGINAS_EN_CACHE)
+        self._primero = 0  # posición en la vista del primer registro dibujado
+        self._resultados = None  # números encontrados (más recientes primero) o None
+        self._pendientes = {}  # dibujo o búsqueda ya programados
+
+        # Cuadro de búsqueda y resumen
+        barra = tk.Frame(self, bg=colores.get("fondo"))
+        barra.pack(fill="x", padx=10)
+        tk.Label(barra, text="Buscar:", bg=colores.get("fondo"), fg=colores.get("texto")).pack(side="left")
+        self.consulta = tk.StringVar()
+        entrada = tk.Entry(barra, textvariable=self.consulta, width=40, bg=colores.get("entrada"),
+                           fg=colores.get("texto"), insertbackground=colores.get("texto"))
+        entrada.pack(side="left", padx=5)
+        self.consulta.trace_add("write", lambda *_: self._programar(self._buscar, ESPERA_BUSQUEDA))
+        self.resumen = tk.Label(barra, bg=colores.get("fondo"), fg=colores.get("texto"))
+        self.resumen.pack(side="left", padx=10)
+
+        # Texto con los registros visibles y barra de desplazamiento virtual
+        cuerpo = tk.Frame(self, bg=colores.get("fondo"))
+        cuerpo.pack(fill="both", expand=True, padx=10, pady=10)
+        self.barra = tk.Scrollbar(cuerpo, orient="vertical", command=self._desplazar)
+        self.barra.pack(side="right", fill="y")
+        self.texto = tk.Text(cuerpo, wrap="word", state="disabled", bg=colores.get("entrada"),
+                             fg=colores.get("texto"), **opciones_texto)
+        self.texto.pack(side="left", fill="both", expand=True)
+        self._alto_linea = tkfont.Font(font=self.texto.cget("font")).metrics("linespace")
+        self.texto.bind("<MouseWheel>", lambda e: self._rueda(-1 if e.delta > 0 else 1))
+        self.texto.bind("<Button-4>", lambda e: self._rueda(-1))
+        self.texto.bind("<Button-5>", lambda e: self._rueda(1))
+        self.texto.bind("<Configure>", lambda e: self._programar(self._dibujar))
+
+        almacen.suscribir(self._al_registrar, self._al_limpiar)
+        self._dibujar()
+
+    # --- Registros de la vista ---
+    def _total(self) -> int:
+        if self._resultados is not None:
+            return len(self._resultados)
+        return len(self.almacen)
+
+    def _numero(self, posicion: int) -> int:
+        """Número de registro que ocupa una posición de la vista."""
+        if self._resultados is not None:
+            return self._resultados[posicion]
+        return self.almacen.fin - 1 - posicion
+
+    def _registro(self, numero: int) -> dict:
+        """Lee un registro a través de la caché de páginas."""
+        pagina = numero // REGISTROS_POR_PAGINA
+        clave = (self.almacen.generacion, pagina)
+        registros = self._paginas.obtener(clave)
+        if registros is None:
+            inicio = pagina * REGISTROS_POR_PAGINA
+            registros = dict(enumerate(self.almacen.leer(inicio, inicio + REGISTROS_POR_PAGINA), start=inicio))
+            self._paginas.guardar(clave, registros)
+        return registros.get(numero)
+
+    def _ventana(self) -> int:
+        """Registros que caben en el widget."""
+        lineas = self.texto.winfo_height() // max(1, self._alto_linea)
+        return max(1, lineas // LINEAS_POR_REGISTRO + 1)
+
+    # --- Dibujo ---
+    def _programar(self, funcion, espera: int = 0):
+        """Agrupa varios eventos seguidos en una sola llamada."""
+        nombre = funcion.__name__
+        if nombre in self._pendientes:
+            self.after_cancel(self._pendientes[nombre])
+        self._pendientes[nombre] = self.after(espera, self._ejecutar, funcion)
+
+    def _ejecutar(self, funcion):
+        del self._pendientes[funcion.__name__]
+        funcion()
+
+    def _dibujar(self):
+        total = self._total()
+        ventana = self._ventana()
+        self._primero = max(0, min(self._primero, total - ventana))
+
+        self.texto.configure(state="normal")
+        self.texto.delete("1.0", tk.END)
+        if total == 0:
+            self.texto.insert(tk.END, "No hay registros aún." if self._resultados is None else "Sin resultados.")
+        for posicion in range(self._primero, min(total, self._primero + ventana)):
+            numero = self._numero(posicion)
+            registro = self._registro(numero)
+            if registro is not None:
+                self.texto.insert(tk.END, formatear_registro(registro, numero + 1))
+        self.texto.configure(state="disabled")
+
+        if total:
+            self.barra.set(self._primero / total, min(1.0, (self._primero + ventana) / total))
+        else:
+            self.barra.set(0.0, 1.0)
+        if self._resultados is None:
+            self.resumen.configure(text=f"{total} registros")
+        else:
+            self.resumen.configure(text=f"{total} resultados")
+
+    def _mover(self, primero: int):
+        self._primero = max(0, primero)
+        self._programar(self._dibujar)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Atiende a la barra de desplazamiento ('moveto' o 'scroll')."""
+        if accion == "moveto":
+            self._mover(int(float(cantidad) * self._total()))
+        elif unidad == "pages":
+            self._mover(self._primero + int(cantidad) * self._ventana())
+        else:
+            self._mover(self._primero + int(cantidad))
+
+    def _rueda(self, pasos: int):
+        self._mover(self._primero + pasos)
+        return "break"
+
+    # --- Búsqueda ---
+    def _buscar(self):
+        consulta = self.consulta.get()
+        self._resultados = self._consultar(consulta)[::-1] if consulta.strip() else None
+        self._primero = 0
+        self._dibujar()
+
+    def _consultar(self, consulta: str) -> list:
+        """Números que cumplen la consulta (ninguno si no es válida)."""
+        try:
+            return self.indice.buscar(consulta)
+        except ValueError:
+            return []
+
+    # --- Cambios del historial ---
+    def _al_registrar(self, numero: int, registro: dict):
+        # Puede llamarse desde otro hilo: el trabajo se hace en el de tkinter
+        self.after(0, self._nuevo_registro, numero)
+
+    def _nuevo_registro(self, numero: int):
+        # La última página ha cambiado
+        self._paginas.descartar((self.almacen.generacion, numero // REGISTROS_POR_PAGINA))
+        if self._resultados is not None:
+            if numero not in self._consultar(self.consulta.get())[-1:]:
+                return
+            self._resultados.insert(0, numero)
+        if self._primero > 0:
+            # Mantener a la vista los mismos registros
+            self._primero += 1
+        self._programar(self._dibujar)
+
+    def _al_limpiar(self):
+        self.after(0, self.refrescar)
+
+    def refrescar(self):
+        """Vuelve a leer el historial y muestra los registros más recientes."""
+        self._paginas = CacheLRU(PAGINAS_EN_CACHE)
+        self._primero = 0
+        self._buscar()
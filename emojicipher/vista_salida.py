@@ -0,0 +1,82 @@
+"""
+Panel de salida para resultados muy grandes en tkinter.
+
+Dibujar millones de emojis en un `Text` es muy lento (cada glifo se
+compone por separado), aunque se inserten a trozos. `PanelSalida` escribe el
+resultado a trozos con `after()` y, si pasa de `LIMITE_VISTA_PREVIA`
+caracteres, solo muestra el principio junto con un aviso; el texto completo
+se guarda en memoria para decodificarlo o guardarlo en un archivo.
+"""
+
+import tkinter as tk
+
+from .tareas import escribir_por_partes, leer_por_partes
+
+
+# Caracteres que se muestran como máximo en el widget
+LIMITE_VISTA_PREVIA = 50_000
+
+_paneles = {}
+
+
+class PanelSalida:
+    """Widget `Text` que puede mostrar solo una vista previa de su contenido.
+
+    Atributos:
+        widget (tk.Text): Widget donde se escribe.
+        limite (int): Caracteres que se muestran como máximo.
+        completo (str): Texto completo cuando solo se muestra la vista previa
+            (None si se muestra entero).
+    """
+
+    def __init__(self, widget, limite: int = LIMITE_VISTA_PREVIA):
+        self.widget = widget
+        self.limite = limite
+        self.completo = None
+
+    def mostrar(self, texto: str, al_terminar=None):
+        """
+        Escribe un texto a trozos; si es muy largo, solo su principio.
+
+        Parámetros:
+            texto (str): Texto completo.
+            al_terminar (callable): Se llama sin argumentos al acabar de escribir.
+        """
+        self.completo = texto if len(texto) > self.limite else None
+
+        def terminar():
+            if self.completo is not None:
+                self.widget.insert(tk.END, f"\n\n[… vista previa: {self.limite} de {len(texto)} caracteres. "
+                                           "Usa «Guardar resultado» para obtener el texto completo]")
+            # Para saber después si el usuario ha editado el texto
+            self.widget.edit_modified(False)
+            if al_terminar:
+                al_terminar()
+
+        escribir_por_partes(self.widget, texto[:self.limite], terminar)
+
+    def leer(self, al_terminar):
+        """
+        Pasa a `al_terminar` el texto completo del panel.
+
+        Si se está mostrando una vista previa que no se ha editado, es el
+        texto completo guardado en memoria; si no, lo que hay en el widget.
+        """
+        if self.completo is not None and not self.widget.edit_modified():
+            al_terminar(self.completo)
+        else:
+            self.completo = None
+            leer_por_partes(self.widget, al_terminar)
+
+    @property
+    def recortado(self) -> bool:
+        """Indica si el widget muestra solo una vista previa."""
+        return self.completo is not None
+
+
+def panel_de(widget, limite: int = LIMITE_VISTA_PREVIA) -> PanelSalida:
+    """Devuelve el `PanelSalida` de un widget (lo crea la primera vez)."""
+    nombre = str(widget)
+    if nombre not in _paneles:
+        _paneles[nombre] = PanelSalida(widget, limite)
+    return _paneles[nombre]
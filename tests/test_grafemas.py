@@ -0,0 +1,157 @@
+"""
+Pruebas de equivalencia del decodificador por grafemas.
+
+`DecodificadorGrafemas` (y `CompiledKey.decodificar`, que lo usa con las
+claves ambiguas) tiene que dar exactamente lo mismo que el decodificador
+original de S12/Codigo.py: emojis ordenados de más largo a más corto y
+`startswith` en cada posición.
+
+Ejecutar desde la raíz del repositorio: `python -m pytest -q tests`
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# Asegurarnos de que la raíz del repositorio está en sys.path para poder
+# importar el paquete compartido `emojicipher`.
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_REPO not in sys.path:
+    sys.path.insert(0, RAIZ_REPO)
+
+from emojicipher.clave import CompiledKey
+from emojicipher.generador import alfabeto_emojis
+from emojicipher.grafemas import DecodificadorGrafemas, segmentar
+
+CARACTERES = "abcdefghijklmnopqrstuvwxyz0123456789 ,.!?"
+
+# Trozos sueltos de secuencias de emojis y saltos de línea
+FRAGMENTOS = (
+    "\u200d",  # ZWJ
+    "\ufe0f",  # selector de variación 16
+    "\u20e3",  # tecla (keycap)
+    "\u0301",  # tilde combinante
+    "\U0001f3fb", "\U0001f3ff",
+    "\U0001f1ea", "\U0001f1f8",
+    "\U000e0067", "\U000e007f",
+    "\r", "\n", "\r\n",
+)
+
+
+def decodificar_s12(texto: str, clave: dict) -> str:
+    """Decodificador original de S12/Codigo.py (búsqueda voraz con `startswith`)."""
+    inversa = {v: k for k, v in clave.items()}
+    claves_ordenadas = sorted(inversa.keys(), key=len, reverse=True)
+
+    resultado = ""
+    i = 0
+    while i < len(texto):
+        match = None
+        for em in claves_ordenadas:
+            if texto.startswith(em, i):
+                match = em
+                break
+        if match:
+            resultado += inversa[match]
+            i += len(match)
+        else:
+            resultado += texto[i]
+            i += 1
+    return resultado
+
+
+def comprobar(clave: dict, texto: str):
+    """Comprueba los dos caminos de decodificación contra S12."""
+    esperado = decodificar_s12(texto, clave)
+    compilada = CompiledKey(clave)
+    assert DecodificadorGrafemas(compilada).decodificar(texto) == esperado
+    assert compilada.decodificar(texto) == esperado
+
+
+# ================================================================
+# ------------------------ Casos concretos -----------------------
+# ================================================================
+
+CASOS = [
+    # Un emoji prefijo de otro (tono de piel)
+    ({"a": "👍", "b": "👍🏻", "c": "🏻"}, "👍👍🏻🏻👍🏻🏻 x👍"),
+    # Selector de variación y keycap
+    ({"a": "5", "b": "5\ufe0f", "c": "5\ufe0f\u20e3", "d": "\u20e3"}, "55\ufe0f5\ufe0f\u20e3\u20e3x"),
+    # Secuencia ZWJ cuyo primer emoji también está en la clave
+    ({"a": "👨", "b": "👨\u200d👩\u200d👧", "c": "👩"}, "👨\u200d👩👨\u200d👩\u200d👧👨\u200d"),
+    # Banderas: pares de indicadores regionales
+    ({"a": "🇪", "b": "🇪🇸", "c": "🇸"}, "🇪🇸🇸🇪🇪🇸🇪"),
+    # ZWJ seguido de salto de línea dentro de un emoji de la clave
+    ({"a": "\u200d\n", "b": "👍", "c": "👍🏻"}, "X\u200d\nY"),
+    ({"a": "\u200d\r\n", "b": "👍", "c": "👍🏻"}, "q\u200d\r\nw\u200d\r"),
+    ({"c": "5\ufe0f\u20e3\u200d\r", "a": "5\ufe0f\u20e3", "b": "👍", "d": "👍🏻"}, "z5\ufe0f\u20e3\u200d\r\ufe0f"),
+    ({"a": "👍\u200d\n", "b": "👍", "c": "\n"}, "👍\u200d\n👍\u200d\r\n\n"),
+    # Emojis que empiezan por un fragmento suelto
+    ({"a": "\ufe0f👍", "b": "👍", "c": "\u200d👍🏻"}, "x\ufe0f👍\u200d👍🏻👍\ufe0f"),
+]
+
+
+@pytest.mark.parametrize("clave, texto", CASOS)
+def test_casos_concretos(clave, texto):
+    comprobar(clave, texto)
+
+
+@pytest.mark.parametrize("clave, texto", CASOS)
+def test_segmentar_no_pierde_caracteres(clave, texto):
+    assert "".join(segmentar(texto)) == texto
+
+
+# ================================================================
+# ----------------------- Casos aleatorios -----------------------
+# ================================================================
+
+def clave_aleatoria(azar: random.Random, alfabeto: tuple) -> dict:
+    """Clave con emojis del alfabeto y variantes ambiguas."""
+    caracteres = azar.sample(CARACTERES, azar.randint(2, len(CARACTERES)))
+    clave = dict(zip(caracteres, azar.sample(alfabeto, len(caracteres))))
+    for _ in range(azar.randint(1, 5)):
+        c, otro = azar.choice(caracteres), azar.choice(caracteres)
+        em = clave[otro]
+        opcion = azar.random()
+        if opcion < 0.2:
+            clave[c] = em + azar.choice(FRAGMENTOS[:6])  # otro emoji que empieza igual
+        elif opcion < 0.4:
+            clave[c] = em + "\u200d" + azar.choice(alfabeto)  # secuencia ZWJ
+        elif opcion < 0.6:
+            clave[c] = em + "\u200d" + azar.choice(("\r", "\n", "\r\n"))  # ZWJ y salto de línea
+        elif opcion < 0.8:
+            clave[c] = azar.choice(FRAGMENTOS) + em  # empieza por un fragmento suelto
+        else:
+            clave[c] = em  # emoji compartido
+    return clave
+
+
+def texto_aleatorio(azar: random.Random, clave: dict, alfabeto: tuple) -> str:
+    """Texto que mezcla emojis de la clave, fragmentos y secuencias cortadas."""
+    emojis = list(clave.values())
+    partes = []
+    for _ in range(azar.randint(0, 40)):
+        r = azar.random()
+        if r < 0.45:
+            partes.append(azar.choice(emojis))
+        elif r < 0.6:
+            partes.append(azar.choice(CARACTERES))
+        elif r < 0.7:
+            partes.append(azar.choice(alfabeto))
+        elif r < 0.85:
+            partes.append(azar.choice(FRAGMENTOS))
+        else:
+            em = azar.choice(emojis)
+            partes.append(em[:azar.randint(1, len(em))])  # secuencia cortada
+    return "".join(partes)
+
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_equivalente_a_s12(semilla):
+    azar = random.Random(semilla)
+    alfabeto = alfabeto_emojis()
+    for _ in range(50):
+        clave = clave_aleatoria(azar, alfabeto)
+        comprobar(clave, texto_aleatorio(azar, clave, alfabeto))